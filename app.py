@@ -1,17 +1,107 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, has_request_context, request, jsonify, make_response
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import is_resource_modified
 import mysql.connector
 from mysql.connector import Error
+import base64
+import click
+import csv
+import functools
+import gzip
+import hashlib
+import io
 import json
 import logging
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
 import os
+import re
+import threading
+import time
+import zlib
 from typing import List, Dict, Any
+from urllib.parse import urlencode
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from idempotency import IdempotencyStore, idempotency_key
+from ingest_queue import IngestQueue, IngestWorkerPool
+from json_codec import JSONCodec, json_value, orjson, time_string
+from log_pipeline import PayloadLogger, configure_logging
+from migrations import SCHEMA_VERSION, MigrationError, current_version, migrate, migration_status
+from payload_schema import CRM_SCHEMA, DIET_SCHEMA, TASKS_SCHEMA, PayloadError
+from query_cache import create_query_cache
+from request_metrics import RequestMetrics
+from static_assets import IMMUTABLE_CACHE_CONTROL, AssetManifest
+from transcript_search import TranscriptSearchIndex
+from write_coalescer import WriteCoalescer
+
+try:
+    import zstandard  # Optional - enables TRANSCRIPT_CODEC=zstd
+except ImportError:
+    zstandard = None
+
+# Logging - records are formatted and written by a background thread; received payloads
+# are logged as size-capped summaries (LOG_PAYLOADS=full also dumps a sample of them)
+LOG_CONFIG = {
+    'level': os.environ.get('LOG_LEVEL', 'INFO').upper(),
+    'format': os.environ.get('LOG_FORMAT', 'text'),
+    'background': os.environ.get('LOG_BACKGROUND', 'True').lower() == 'true',
+    'file': os.environ.get('LOG_FILE'),
+    'payloads': os.environ.get('LOG_PAYLOADS', 'summary'),
+    'payload_max_chars': int(os.environ.get('LOG_PAYLOAD_MAX_CHARS', 500)),
+    'payload_sample_rate': float(os.environ.get('LOG_PAYLOAD_SAMPLE_RATE', 0.01))
+}
+
+log_handler = configure_logging(LOG_CONFIG['level'], LOG_CONFIG['format'],
+                                LOG_CONFIG['background'], LOG_CONFIG['file'])
 logger = logging.getLogger(__name__)
+payload_log = PayloadLogger(LOG_CONFIG['payloads'], LOG_CONFIG['payload_max_chars'],
+                            LOG_CONFIG['payload_sample_rate'])
+
+# /static is served by static_asset() below, from the fingerprinted manifest
+app = Flask(__name__, static_folder=None)
+
+# JSON responses - orjson when installed (JSON_BACKEND=json forces the standard library)
+JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+if JSON_BACKEND == 'orjson' and orjson is None:
+    logger.warning("JSON_BACKEND=orjson but the orjson package is missing - using json")
+    JSON_BACKEND = 'json'
+json_codec = JSONCodec(JSON_BACKEND)
+
+class CodecJSONProvider(DefaultJSONProvider):
+    """jsonify() through json_codec - one encoder for dates, TIME and DECIMAL columns"""
+    
+    # Same key order and escaping as json_codec, also for the indented debug output
+    sort_keys = False
+    ensure_ascii = False
+    
+    def response(self, *args, **kwargs):
+        if self._app.debug:
+            # Indented output for debugging
+            return super().response(*args, **kwargs)
+        body = json_codec.dumps(self._prepare_response_obj(args, kwargs))
+        return self._app.response_class(body, mimetype=self.mimetype)
+    
+    @staticmethod
+    def default(value):
+        converted = json_value(value)
+        return DefaultJSONProvider.default(value) if converted is value else converted
+
+app.json = CodecJSONProvider(app)
+
+# Static assets - fingerprinted URLs, cached for a year, precompressed at startup
+STATIC_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+static_assets = AssetManifest(STATIC_ROOT)
+app.jinja_env.globals['asset_url'] = static_assets.url
 
-app = Flask(__name__)
+# Response compression - HTML/JSON bodies are gzipped for clients that accept it
+COMPRESSION_CONFIG = {
+    'enabled': os.environ.get('COMPRESS_RESPONSES', 'True').lower() == 'true',
+    'min_size': int(os.environ.get('COMPRESS_MIN_SIZE', 500)),
+    'level': int(os.environ.get('COMPRESS_LEVEL', 6))
+}
+COMPRESSIBLE_MIMETYPES = {'text/html', 'application/json', 'text/plain', 'text/csv',
+                          'application/x-ndjson'}
+# Appended to the ETag of a gzipped body - a strong ETag must differ per encoding
+GZIP_ETAG_SUFFIX = '-gzip'
 
 # MySQL Database Configuration
 DB_CONFIG = {
@@ -24,140 +114,538 @@ DB_CONFIG = {
     'collation': 'utf8mb4_unicode_ci'
 }
 
+# Connection pool configuration (per process - each gunicorn worker gets its own
+# pool, so the server sees at most workers * (DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW))
+DB_POOL_CONFIG = {
+    'size': int(os.environ.get('DB_POOL_SIZE', 5)),
+    'max_overflow': int(os.environ.get('DB_POOL_MAX_OVERFLOW', 5)),
+    'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+    'idle_timeout': float(os.environ.get('DB_POOL_IDLE_TIMEOUT', 300)),
+    'pre_ping': os.environ.get('DB_POOL_PRE_PING', 'True').lower() == 'true'
+}
+
+# Schema migrations (see migrations.py) - startup only reads the schema version row;
+# pending migrations are applied automatically unless DB_AUTO_MIGRATE=false
+DB_AUTO_MIGRATE = os.environ.get('DB_AUTO_MIGRATE', 'True').lower() == 'true'
+
+# Query cache configuration - CACHE_BACKEND=redis shares entries across workers/hosts;
+# the default in-process cache still invalidates across workers on the same host
+CACHE_CONFIG = {
+    'backend': os.environ.get('CACHE_BACKEND', 'memory'),
+    'max_entries': int(os.environ.get('CACHE_MAX_ENTRIES', 1000)),
+    'redis_url': os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0'),
+    'enabled': os.environ.get('CACHE_ENABLED', 'True').lower() == 'true'
+}
+
+# Seconds a cached read may be served (writes invalidate sooner)
+CACHE_TTLS = {
+    'diet': int(os.environ.get('CACHE_TTL_DIET', 60)),
+    'tasks': int(os.environ.get('CACHE_TTL_TASKS', 30)),
+    'crm': int(os.environ.get('CACHE_TTL_CRM', 120)),
+    'transcripts': int(os.environ.get('CACHE_TTL_TRANSCRIPTS', 120)),
+    'stats': int(os.environ.get('CACHE_TTL_STATS', 30))
+}
+
+query_cache = create_query_cache(**CACHE_CONFIG)
+
+# Request instrumentation - per-request DB/helper timings on /metrics (Prometheus format)
+# and in a Server-Timing header
+METRICS_CONFIG = {
+    'enabled': os.environ.get('METRICS_ENABLED', 'True').lower() == 'true',
+    'server_timing': os.environ.get('SERVER_TIMING_ENABLED', 'True').lower() == 'true'
+}
+
+metrics = RequestMetrics(enabled=METRICS_CONFIG['enabled'])
+
+# Write coalescing - concurrent webhook calls for the same table within the window are
+# flushed as one multi-row INSERT (0 disables batching)
+WRITE_BATCH_CONFIG = {
+    'window': float(os.environ.get('WRITE_BATCH_WINDOW_MS', 0)) / 1000,
+    'max_rows': int(os.environ.get('WRITE_BATCH_MAX_ROWS', 100))
+}
+
+# Local FTS5 index backing /api/transcripts/search (rebuild with
+# `flask --app app rebuild-transcript-index`)
+TRANSCRIPT_SEARCH_PATH = os.environ.get(
+    'TRANSCRIPT_SEARCH_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'transcript_search.db'))
+
+transcript_index = TranscriptSearchIndex(TRANSCRIPT_SEARCH_PATH)
+
+# Ingest mode - 'async' answers webhooks with 202 after queueing the payload on disk
+INGEST_CONFIG = {
+    'mode': os.environ.get('INGEST_MODE', 'sync'),
+    'queue_path': os.environ.get('INGEST_QUEUE_PATH',
+                                 os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                              'ingest_queue.db')),
+    'workers': int(os.environ.get('INGEST_WORKERS', 2)),
+    'max_attempts': int(os.environ.get('INGEST_MAX_ATTEMPTS', 8)),
+    'retry_base': float(os.environ.get('INGEST_RETRY_BASE', 2)),
+    'retry_cap': float(os.environ.get('INGEST_RETRY_CAP', 300))
+}
+
+# Idempotency - a retried webhook delivery (same Idempotency-Key header, or the same
+# body to the same endpoint) gets the first response back instead of writing again
+IDEMPOTENCY_CONFIG = {
+    'enabled': os.environ.get('IDEMPOTENCY_ENABLED', 'True').lower() == 'true',
+    'ttl': int(os.environ.get('IDEMPOTENCY_TTL', 86400)),
+    'body_ttl': int(os.environ.get('IDEMPOTENCY_BODY_TTL', 900)),
+    'cache_size': int(os.environ.get('IDEMPOTENCY_CACHE_SIZE', 10000))
+}
+
+# Conditional GET - read APIs and pages send ETag/Last-Modified built from the query
+# cache's table generations, and answer a matching If-None-Match with 304
+CONDITIONAL_GET_ENABLED = os.environ.get('CONDITIONAL_GET_ENABLED', 'True').lower() == 'true'
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection frees up within the pool timeout"""
+
+class PooledConnection:
+    """Checked-out pool connection; close() hands it back to the pool"""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def cursor(self, *args, **kwargs):
+        return metrics.wrap_cursor(self._raw.cursor(*args, **kwargs))
+
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            return self._raw.commit()
+        finally:
+            metrics.record_query(time.perf_counter() - start)
+
+    def is_connected(self):
+        """Report whether this lease is still open (validated on checkout, no ping)"""
+        return self._raw is not None
+
+    def close(self):
+        """Return the underlying connection to the pool"""
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool.release(raw)
+    
+    def discard(self):
+        """Close the underlying connection instead of returning it (e.g. mid-stream)"""
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool.discard(raw)
+
+class ConnectionPool:
+    """Thread-safe MySQL connection pool with overflow, idle timeout and pre-ping"""
+
+    def __init__(self, db_config, size=5, max_overflow=5, timeout=10.0,
+                 idle_timeout=300.0, pre_ping=True):
+        self.db_config = db_config
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.pre_ping = pre_ping
+        self._lock = threading.Condition()
+        self._reset_state()
+
+    def _reset_state(self):
+        """Forget all connections (used at init and after a fork)"""
+        self._pid = os.getpid()
+        self._idle = []  # (connection, returned_at) - most recently used last
+        self._open = 0
+        self._checked_out = 0
+        self._counters = {
+            'created': 0,
+            'reused': 0,
+            'discarded': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'errors': 0
+        }
+
+    def _check_pid(self):
+        """Drop connections inherited from a parent process (gunicorn preload/fork)"""
+        if self._pid != os.getpid():
+            # Never close inherited sockets - the parent still owns them
+            self._reset_state()
+
+    def _discard(self, raw):
+        """Close a connection and free its slot (caller holds the lock)"""
+        self._open -= 1
+        self._counters['discarded'] += 1
+        self._lock.notify()
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def _validate(self, raw):
+        """Ping a reused connection before handing it out"""
+        if not self.pre_ping:
+            return True
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Error:
+            return False
+
+    def acquire(self):
+        """Check out a connection, opening a new one if the pool has room"""
+        deadline = time.monotonic() + self.timeout
+        with self._lock:
+            self._check_pid()
+            while True:
+                while self._idle:
+                    raw, returned_at = self._idle.pop()
+                    if time.monotonic() - returned_at > self.idle_timeout:
+                        self._discard(raw)
+                        continue
+                    self._checked_out += 1
+                    self._counters['reused'] += 1
+                    break
+                else:
+                    raw = None
+
+                if raw is not None:
+                    break
+
+                if self._open < self.size + self.max_overflow:
+                    self._open += 1
+                    self._checked_out += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"No connection available within {self.timeout}s "
+                        f"({self._open} open)")
+                self._counters['waits'] += 1
+                self._lock.wait(remaining)
+
+        if raw is not None:
+            if self._validate(raw):
+                return PooledConnection(self, raw)
+            # Stale connection - close it and reuse its slot for a fresh one
+            with self._lock:
+                self._counters['discarded'] += 1
+            try:
+                raw.close()
+            except Exception:
+                pass
+
+        # Open a fresh connection outside the lock
+        try:
+            raw = mysql.connector.connect(**self.db_config)
+        except Exception:
+            with self._lock:
+                self._open -= 1
+                self._checked_out -= 1
+                self._counters['errors'] += 1
+                self._lock.notify()
+            raise
+        with self._lock:
+            self._counters['created'] += 1
+        logger.info("Opened new MySQL connection for pool")
+        return PooledConnection(self, raw)
+
+    def release(self, raw):
+        """Return a connection, rolling back anything left uncommitted"""
+        healthy = True
+        try:
+            if raw.unread_result:
+                raw.consume_results()
+            # End the implicit read transaction so the next user gets a fresh snapshot
+            if raw.in_transaction:
+                raw.rollback()
+        except Exception:
+            healthy = False
+
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            self._checked_out -= 1
+            # Overflow connections are closed once the pool is back to its core size
+            if not healthy or len(self._idle) >= self.size:
+                self._discard(raw)
+            else:
+                self._idle.append((raw, time.monotonic()))
+                self._lock.notify()
+
+    def discard(self, raw):
+        """Close a checked-out connection that cannot be safely reused"""
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            self._checked_out -= 1
+            self._discard(raw)
+    
+    def stats(self):
+        """Snapshot of pool usage for sizing"""
+        with self._lock:
+            self._check_pid()
+            return {
+                'pid': self._pid,
+                'size': self.size,
+                'max_overflow': self.max_overflow,
+                'open': self._open,
+                'checked_out': self._checked_out,
+                'idle': len(self._idle),
+                'overflow': max(0, self._open - self.size),
+                **self._counters
+            }
+
+db_pool = ConnectionPool(DB_CONFIG, **DB_POOL_CONFIG)
+
+def mark_database_unavailable():
+    """Note that MySQL failed and a helper is falling back to empty results
+    
+    The query cache won't store the helper's result, conditional_get won't tag the
+    response and idempotent won't save it.
+    """
+    query_cache.mark_degraded()
+    if has_request_context():
+        g.database_unavailable = True
+
 def get_db_connection():
-    """Create and return MySQL database connection"""
+    """Check out a MySQL connection from the shared pool (close() returns it)"""
+    start = time.perf_counter()
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        if connection.is_connected():
-            logger.info("Successfully connected to MySQL database")
-            return connection
-    except Error as e:
+        return db_pool.acquire()
+    except (Error, PoolTimeoutError) as e:
         logger.error(f"Error connecting to MySQL: {e}")
+        mark_database_unavailable()
+        return None
+    finally:
+        metrics.record_acquire(time.perf_counter() - start)
+
+def get_pool_stats():
+    """Get connection pool statistics"""
+    return db_pool.stats()
+
+idempotency = IdempotencyStore(lambda: get_db_connection(), ttl=IDEMPOTENCY_CONFIG['ttl'],
+                               body_ttl=IDEMPOTENCY_CONFIG['body_ttl'],
+                               max_entries=IDEMPOTENCY_CONFIG['cache_size'])
+
+def idempotent(endpoint):
+    """Replay the saved response when a POST to this route is delivered again"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            data = request.get_json(silent=True) if request.method == 'POST' else None
+            if not IDEMPOTENCY_CONFIG['enabled'] or not data:
+                return func(*args, **kwargs)
+            
+            key, source = idempotency_key(endpoint, request.headers.get('Idempotency-Key'), data)
+            ttl = idempotency.ttl_for(source)
+            with idempotency.claim(key, ttl) as stored:
+                if stored is not None:
+                    status_code, body = stored
+                    logger.info("Replaying saved %s response for a repeated delivery", endpoint)
+                    response = Response(body, status=status_code, mimetype='application/json')
+                    response.headers['Idempotent-Replayed'] = 'true'
+                    return response
+                
+                response = make_response(func(*args, **kwargs))
+                # Only successes are saved - a failed delivery must be retried for real, and
+                # so must one the insert helpers only logged because MySQL was unreachable
+                if response.status_code in (200, 202) and not g.get('database_unavailable'):
+                    idempotency.save(key, endpoint, response.status_code,
+                                     response.get_data(as_text=True), ttl)
+                return response
+        return wrapper
+    return decorator
+
+def templates_fingerprint() -> str:
+    """Hash of the page templates and asset URLs, so a deploy that changes a page changes its ETags"""
+    digest = hashlib.sha256(static_assets.fingerprint().encode('ascii'))
+    template_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+    for name in sorted(os.listdir(template_dir)):
+        with open(os.path.join(template_dir, name), 'rb') as f:
+            digest.update(name.encode('utf-8') + b'\0' + f.read())
+    return digest.hexdigest()[:16]
+
+RESPONSE_FINGERPRINT = templates_fingerprint()
+
+def response_validators(tables):
+    """(ETag, Last-Modified) for the current request's response, or None
+    
+    The ETag covers the path and query string, each table's version and today's
+    date (stats and "today" views change at midnight without a write). Nothing
+    here touches MySQL.
+    """
+    versions = query_cache.versions(tables)
+    if versions is None:
         return None
+    today = date.today()
+    material = '\0'.join([RESPONSE_FINGERPRINT, request.full_path, today.isoformat(),
+                          *(token for token, _ in versions)])
+    etag = hashlib.sha256(material.encode('utf-8')).hexdigest()[:32]
+    modified = max([modified for _, modified in versions] +
+                   [datetime.combine(today, datetime.min.time()).timestamp()])
+    return etag, datetime.fromtimestamp(int(modified), timezone.utc)
+
+def conditional_get(*tables):
+    """Answer a GET with 304 if the client's copy is current, else tag the fresh body"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            validators = None
+            if CONDITIONAL_GET_ENABLED and request.method == 'GET':
+                validators = response_validators(tables)
+            if validators is None:
+                return func(*args, **kwargs)
+            
+            etag, last_modified = validators
+            if request.if_none_match.contains(etag + GZIP_ETAG_SUFFIX):
+                # The client holds the gzipped body compress_response() tagged
+                etag += GZIP_ETAG_SUFFIX
+                response = Response(status=304)
+            elif is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                response = make_response(func(*args, **kwargs))
+                # Errors, and empty fallbacks served while MySQL was unreachable, must
+                # not be revalidated later as if they were the real data
+                if response.status_code != 200 or g.get('database_unavailable'):
+                    return response
+            else:
+                response = Response(status=304)
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Accept-Encoding')
+            return response
+        return wrapper
+    return decorator
 
-def create_tables():
-    """Create necessary tables if they don't exist"""
+def check_schema() -> bool:
+    """Compare the schema version row with SCHEMA_VERSION (migrating if DB_AUTO_MIGRATE)
+    
+    An up-to-date database costs one primary-key read - no DDL is issued.
+    """
     connection = get_db_connection()
     if not connection:
         return False
     
     try:
         cursor = connection.cursor()
-        
-        # Create diet table
-        diet_table = """
-        CREATE TABLE IF NOT EXISTS diet_records (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            food VARCHAR(255) NOT NULL,
-            food_type ENUM('Meal', 'Snack', 'Drink') NOT NULL,
-            estimated_calories VARCHAR(50),
-            time_of_day TIME NOT NULL,
-            date DATE NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-            UNIQUE KEY unique_diet_entry (food, food_type, time_of_day, date)
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """
-        
-        # Create tasks table
-        tasks_table = """
-        CREATE TABLE IF NOT EXISTS tasks (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            task_description TEXT NOT NULL,
-            priority ENUM('Low', 'Medium', 'High') DEFAULT 'Medium',
-            status ENUM('Pending', 'In Progress', 'Completed', 'Cancelled') DEFAULT 'Pending',
-            due_date DATE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-            UNIQUE KEY unique_task (task_description(255), due_date)
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """
-        
-        # Create CRM table
-        crm_table = """
-        CREATE TABLE IF NOT EXISTS crm_records (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            contact_name VARCHAR(255),
-            company VARCHAR(255),
-            email VARCHAR(255),
-            phone VARCHAR(50),
-            notes TEXT,
-            status ENUM('Lead', 'Prospect', 'Customer', 'Lost') DEFAULT 'Lead',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-            UNIQUE KEY unique_contact (contact_name, email)
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """
-        
-        # Create plaud_transcripts table to store raw transcript data
-        transcripts_table = """
-        CREATE TABLE IF NOT EXISTS plaud_transcripts (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            transcript_id VARCHAR(255) UNIQUE,
-            title VARCHAR(500),
-            transcript_text LONGTEXT,
-            summary_text TEXT,
-            create_time DATETIME,
-            processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            INDEX idx_transcript_id (transcript_id),
-            INDEX idx_create_time (create_time)
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """
-        
-        cursor.execute(diet_table)
-        cursor.execute(tasks_table)
-        cursor.execute(crm_table)
-        cursor.execute(transcripts_table)
-        
-        connection.commit()
-        logger.info("Database tables created/verified successfully")
+        version = current_version(cursor)
+        if version == SCHEMA_VERSION:
+            return True
+        
+        if version > SCHEMA_VERSION:
+            logger.error(f"Database schema is at version {version}, newer than this code "
+                         f"({SCHEMA_VERSION}) - deploy the newer code")
+            return False
+        if not DB_AUTO_MIGRATE:
+            logger.error(f"Database schema is at version {version}, code expects {SCHEMA_VERSION} - "
+                         f"run `flask --app app migrate`")
+            return False
+        
+        applied = migrate(connection)
+        logger.info(f"Applied schema migrations {applied}")
         return True
         
-    except Error as e:
-        logger.error(f"Error creating tables: {e}")
+    except (Error, MigrationError) as e:
+        logger.error(f"Error checking database schema: {e}")
         return False
     finally:
         if connection.is_connected():
             cursor.close()
             connection.close()
 
-def insert_diet_data(diet_records: List[Dict[str, Any]]) -> bool:
-    """Insert diet records with ON DUPLICATE KEY UPDATE"""
+@app.cli.command('migrate')
+def migrate_command():
+    """Apply pending schema migrations"""
+    connection = get_db_connection()
+    if not connection:
+        logger.error("Database connection failed - nothing migrated")
+        return
+    
+    try:
+        applied = migrate(connection)
+        logger.info(f"Applied migrations {applied}" if applied else "Schema already up to date")
+    except (Error, MigrationError) as e:
+        logger.error(f"Migration failed: {e}")
+    finally:
+        connection.close()
+
+@app.cli.command('schema-status')
+def schema_status_command():
+    """List schema migrations and when each was applied"""
+    connection = get_db_connection()
+    if not connection:
+        logger.error("Database connection failed")
+        return
+    
+    try:
+        cursor = connection.cursor()
+        for migration in migration_status(cursor):
+            applied_at = migration['applied_at'] or 'pending'
+            click.echo(f"{migration['version']:>4}  {migration['name']:<45} {applied_at}")
+    except Error as e:
+        logger.error(f"Error reading schema status: {e}")
+    finally:
+        if connection.is_connected():
+            cursor.close()
+            connection.close()
+
+# Write statements and row builders are shared with the async server (asgi_app.py)
+DIET_UPSERT_QUERY = """
+INSERT INTO diet (food, food_type, estimated_calories, time_of_day, date)
+VALUES (%s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+estimated_calories = VALUES(estimated_calories)
+"""
+
+def diet_rows(diet_records):
+    """Parameter tuples for DIET_UPSERT_QUERY"""
+    data_to_insert = []
+    for record in diet_records:
+        data_to_insert.append((
+            record.get('food', ''),
+            record.get('food_type', 'Meal'),
+            record.get('estimated_calories', ''),
+            record.get('time_of_day', '00:00:00'),
+            record.get('date', datetime.now().strftime('%Y-%m-%d'))
+        ))
+    return data_to_insert
+
+def write_diet_records(cursor, diet_records):
+    """Upsert diet records and their counter changes in the caller's transaction"""
+    data_to_insert = diet_rows(diet_records)
+    existing = find_existing_rows(cursor, 'diet', DIET_KEY_COLUMNS, 'estimated_calories',
+                                  diet_counter_keys(data_to_insert))
+    counter_deltas = diet_counter_deltas(data_to_insert, existing)
+    cursor.executemany(DIET_UPSERT_QUERY, data_to_insert)
+    apply_counter_deltas(cursor, counter_deltas)
+
+# Returned by the insert helpers when MySQL was unreachable and the records were only
+# logged. It is truthy, so webhooks still answer 200 (testing without a DB), but the
+# ingest queue keeps the job for a retry.
+LOGGED_ONLY = object()
+
+@metrics.timed
+def insert_diet_data(diet_records: List[Dict[str, Any]]):
+    """Insert diet records with ON DUPLICATE KEY UPDATE (True, False or LOGGED_ONLY)"""
     if not diet_records:
         return True
         
     connection = get_db_connection()
     if not connection:
-        logger.warning("Database connection failed - logging data only (not saving to DB)")
         # Log the data even if DB connection fails
-        for record in diet_records:
-            logger.info(f"Would insert: {record}")
-        return True  # Return True to allow testing without DB
+        payload_log.not_saved(logger, 'diet', diet_records)
+        return LOGGED_ONLY
     
     try:
         cursor = connection.cursor()
         
-        insert_query = """
-        INSERT INTO diet (food, food_type, estimated_calories, time_of_day, date)
-        VALUES (%s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-        estimated_calories = VALUES(estimated_calories)
-        """
-        
-        data_to_insert = []
-        for record in diet_records:
-            data_to_insert.append((
-                record.get('food', ''),
-                record.get('food_type', 'Meal'),
-                record.get('estimated_calories', ''),
-                record.get('time_of_day', '00:00:00'),
-                record.get('date', datetime.now().strftime('%Y-%m-%d'))
-            ))
-        
-        cursor.executemany(insert_query, data_to_insert)
+        write_diet_records(cursor, diet_records)
         connection.commit()
+        query_cache.invalidate('diet')
         
-        logger.info(f"Successfully inserted/updated {len(diet_records)} diet records to MySQL")
+        logger.info("Successfully inserted/updated %d diet records to MySQL", len(diet_records))
         return True
         
     except Error as e:
@@ -168,45 +656,179 @@ def insert_diet_data(diet_records: List[Dict[str, Any]]) -> bool:
             cursor.close()
             connection.close()
 
-def insert_transcript_data(transcript_data: Dict[str, Any]) -> bool:
-    """Insert raw transcript data"""
+# Transcript bodies are stored compressed in transcript_body with a codec marker;
+# rows written before compression keep their text in transcript_text (codec NULL)
+TRANSCRIPT_CODEC = os.environ.get('TRANSCRIPT_CODEC', 'zlib')
+
+if TRANSCRIPT_CODEC == 'zstd' and zstandard is None:
+    logger.warning("TRANSCRIPT_CODEC=zstd but the zstandard package is missing - using zlib")
+    TRANSCRIPT_CODEC = 'zlib'
+
+def encode_transcript_body(text: str):
+    """Compress a transcript body, returning (codec, blob)"""
+    raw = (text or '').encode('utf-8')
+    if TRANSCRIPT_CODEC == 'zstd':
+        return 'zstd', zstandard.ZstdCompressor(level=10).compress(raw)
+    if TRANSCRIPT_CODEC == 'zlib':
+        return 'zlib', zlib.compress(raw, 6)
+    return 'none', raw
+
+def decode_transcript_body(codec, blob, legacy_text=None) -> str:
+    """Inverse of encode_transcript_body (falls back to the legacy text column)"""
+    if codec is None:
+        return legacy_text or ''
+    if codec == 'zlib':
+        raw = zlib.decompress(blob)
+    elif codec == 'zstd':
+        if zstandard is None:
+            raise ValueError('zstandard package is required to read zstd transcripts')
+        raw = zstandard.ZstdDecompressor().decompress(blob)
+    else:
+        raw = blob
+    return bytes(raw).decode('utf-8')
+
+def transcript_content_hash(transcript_data: Dict[str, Any]) -> str:
+    """SHA-256 over the fields a re-delivery could change"""
+    digest = hashlib.sha256()
+    for field in ('title', 'transcript', 'summary'):
+        digest.update(str(transcript_data.get(field) or '').encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+TRANSCRIPT_HASH_QUERY = "SELECT content_hash FROM plaud_transcripts WHERE transcript_id = %s"
+
+TRANSCRIPT_UPSERT_QUERY = """
+INSERT INTO plaud_transcripts (transcript_id, title, transcript_body, body_codec, body_bytes,
+                               summary_text, content_hash, create_time)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+transcript_body = VALUES(transcript_body),
+body_codec = VALUES(body_codec),
+body_bytes = VALUES(body_bytes),
+transcript_text = NULL,
+summary_text = VALUES(summary_text),
+content_hash = VALUES(content_hash),
+processed_at = CURRENT_TIMESTAMP
+"""
+
+def transcript_row(transcript_data, content_hash):
+    """Parameters for TRANSCRIPT_UPSERT_QUERY (compresses the body)"""
+    transcript_text = transcript_data.get('transcript', '')
+    codec, body = encode_transcript_body(transcript_text)
+    return (
+        transcript_data.get('id', ''),
+        transcript_data.get('title', ''),
+        body,
+        codec,
+        len((transcript_text or '').encode('utf-8')),
+        transcript_data.get('summary', ''),
+        content_hash,
+        transcript_data.get('create_time', datetime.now())
+    )
+
+def write_transcript_record(cursor, transcript_data) -> bool:
+    """Upsert the raw transcript in the caller's transaction
+    
+    Returns False without sending the body when an identical copy is already stored.
+    """
+    transcript_id = transcript_data.get('id', '')
+    content_hash = transcript_content_hash(transcript_data)
+    
+    cursor.execute(TRANSCRIPT_HASH_QUERY, (transcript_id,))
+    row = cursor.fetchone()
+    if row is not None and row[0] == content_hash:
+        logger.info("Transcript %s unchanged - skipping rewrite", transcript_id)
+        return False
+    
+    cursor.execute(TRANSCRIPT_UPSERT_QUERY, transcript_row(transcript_data, content_hash))
+    return True
+
+@metrics.timed
+def index_transcript(transcript_data: Dict[str, Any]):
+    """Add a stored transcript to the search index (MySQL stays the source of truth)"""
+    try:
+        transcript_index.upsert(
+            transcript_data.get('id', ''),
+            transcript_data.get('title', ''),
+            transcript_data.get('summary', ''),
+            transcript_data.get('transcript', ''),
+            transcript_data.get('create_time')
+        )
+    except Exception as e:
+        logger.error(f"Error indexing transcript {transcript_data.get('id')}: {e}")
+
+@metrics.timed
+def process_plaud_payload(data: Dict[str, Any]):
+    """Store the transcript and every extracted section in one transaction
+    
+    Returns the number of records written per section, or None if nothing was
+    saved (no connection, or an error rolled the whole payload back).
+    """
     connection = get_db_connection()
     if not connection:
-        return False
+        logger.error("Database connection failed - transcript not saved")
+        return None
     
     try:
         cursor = connection.cursor()
         
-        insert_query = """
-        INSERT INTO plaud_transcripts (transcript_id, title, transcript_text, summary_text, create_time)
-        VALUES (%s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-        transcript_text = VALUES(transcript_text),
-        summary_text = VALUES(summary_text),
-        processed_at = CURRENT_TIMESTAMP
-        """
+        # Store raw transcript data
+        transcript_changed = write_transcript_record(cursor, data)
+        processed = {'transcript': int(transcript_changed)}
+        
+        # Payload section -> (table invalidated in the cache, writer)
+        sections = {
+            'diet_data': ('diet', write_diet_records),
+            'tasks_data': ('tasks', write_tasks_records),
+            'crm_data': ('crm_records', write_crm_records)
+        }
         
-        cursor.execute(insert_query, (
-            transcript_data.get('id', ''),
-            transcript_data.get('title', ''),
-            transcript_data.get('transcript', ''),
-            transcript_data.get('summary', ''),
-            transcript_data.get('create_time', datetime.now())
-        ))
+        # Bulk insert each extracted section present in the payload
+        for section, (table, writer) in sections.items():
+            records = data.get(section) or []
+            if records:
+                writer(cursor, records)
+            processed[section.replace('_data', '')] = len(records)
         
         connection.commit()
-        logger.info("Successfully inserted/updated transcript data")
-        return True
+        if transcript_changed:
+            index_transcript(data)
+            query_cache.invalidate('plaud_transcripts')
+        for section, (table, writer) in sections.items():
+            if data.get(section):
+                query_cache.invalidate(table)
+        
+        logger.info("Successfully stored transcript payload: %s", processed)
+        return processed
         
     except Error as e:
-        logger.error(f"Error inserting transcript data: {e}")
-        return False
+        connection.rollback()
+        logger.error(f"Error storing transcript payload (rolled back): {e}")
+        return None
     finally:
         if connection.is_connected():
             cursor.close()
             connection.close()
 
+# Plaud payload section -> schema of its records
+PLAUD_SECTION_SCHEMAS = {
+    'diet_data': DIET_SCHEMA,
+    'tasks_data': TASKS_SCHEMA,
+    'crm_data': CRM_SCHEMA
+}
+
+def parse_plaud_payload(data) -> Dict[str, Any]:
+    """Copy of a Plaud payload with its diet/tasks/crm sections normalized"""
+    if not isinstance(data, dict):
+        raise PayloadError("Expected a Plaud transcript object")
+    parsed = dict(data)
+    for section, schema in PLAUD_SECTION_SCHEMAS.items():
+        if data.get(section):
+            parsed[section] = schema.normalize(data[section])
+    return parsed
+
 @app.route('/api/plaud', methods=['POST'])
+@idempotent('plaud')
 def handle_plaud_webhook():
     """Main webhook endpoint for receiving Plaud data from Zapier"""
     try:
@@ -217,56 +839,190 @@ def handle_plaud_webhook():
             logger.error("No JSON data received")
             return jsonify({'error': 'No JSON data received'}), 400
         
-        logger.info(f"Received webhook data: {json.dumps(data, indent=2)}")
-        
-        # Store raw transcript data
-        transcript_success = insert_transcript_data(data)
+        payload_log.received(logger, 'webhook', data)
         
-        # Process diet data if present
-        diet_success = True
-        if 'diet_data' in data and data['diet_data']:
-            diet_success = insert_diet_data(data['diet_data'])
+        data = parse_plaud_payload(data)
         
-        # Process tasks data if present
-        tasks_success = True
-        if 'tasks_data' in data and data['tasks_data']:
-            # TODO: Implement tasks insertion
-            pass
+        if ingest_queue:
+            return accept_for_ingest('plaud', data, 1)
         
-        # Process CRM data if present
-        crm_success = True
-        if 'crm_data' in data and data['crm_data']:
-            # TODO: Implement CRM insertion
-            pass
+        processed = process_plaud_payload(data)
         
-        if transcript_success and diet_success and tasks_success and crm_success:
+        if processed is not None:
             return jsonify({
                 'status': 'success',
                 'message': 'Data processed successfully',
-                'processed': {
-                    'transcript': transcript_success,
-                    'diet': diet_success,
-                    'tasks': tasks_success,
-                    'crm': crm_success
-                }
+                'processed': processed
             }), 200
         else:
             return jsonify({
-                'status': 'partial_success',
-                'message': 'Some data processing failed',
-                'processed': {
-                    'transcript': transcript_success,
-                    'diet': diet_success,
-                    'tasks': tasks_success,
-                    'crm': crm_success
-                }
-            }), 207
+                'error': 'Failed to process transcript data - no changes were saved'
+            }), 500
             
+    except PayloadError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error processing webhook: {e}")
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
+@app.route('/api/transcripts/search', methods=['GET'])
+def search_transcripts():
+    """Ranked full-text search over transcripts with highlighted snippets
+    
+    Example: /api/transcripts/search?q=budget meeting&limit=20&offset=0
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'q is required'}), 400
+    
+    try:
+        limit = min(int(request.args.get('limit', 20)), MAX_PAGE_SIZE)
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return jsonify({'error': 'limit and offset must be integers'}), 400
+    if limit < 1 or offset < 0:
+        return jsonify({'error': 'limit must be positive and offset non-negative'}), 400
+    
+    try:
+        total, hits = transcript_index.search(query, limit=limit, offset=offset)
+    except Exception as e:
+        logger.error(f"Error searching transcripts: {e}")
+        return jsonify({'error': 'Transcript search failed'}), 500
+    
+    return jsonify({
+        'status': 'success',
+        'query': query,
+        'total': total,
+        'count': len(hits),
+        'offset': offset,
+        'data': hits
+    }), 200
+
+@app.cli.command('rebuild-transcript-index')
+def rebuild_transcript_index():
+    """Re-index every transcript stored in MySQL"""
+    connection = get_db_connection()
+    if not connection:
+        logger.error("Database connection failed - index not rebuilt")
+        return
+    
+    try:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT transcript_id AS id, title, body_codec, transcript_body, transcript_text,
+                   summary_text AS summary, create_time
+            FROM plaud_transcripts
+        """)
+        transcript_index.clear()
+        indexed = 0
+        for record in cursor:
+            record['transcript'] = decode_transcript_body(
+                record['body_codec'], record['transcript_body'], record['transcript_text'])
+            index_transcript(record)
+            indexed += 1
+        logger.info(f"Rebuilt transcript search index with {indexed} transcripts")
+    except Error as e:
+        logger.error(f"Error rebuilding transcript index: {e}")
+    finally:
+        if connection.is_connected():
+            cursor.close()
+            connection.close()
+
+@app.cli.command('compress-transcripts')
+def compress_transcripts():
+    """Move transcripts stored before compression into transcript_body"""
+    connection = get_db_connection()
+    if not connection:
+        logger.error("Database connection failed - transcripts not compressed")
+        return
+    
+    try:
+        cursor = connection.cursor(dictionary=True)
+        compressed = 0
+        while True:
+            cursor.execute("""
+                SELECT id, title, transcript_text, summary_text
+                FROM plaud_transcripts
+                WHERE body_codec IS NULL
+                ORDER BY id
+                LIMIT 100
+            """)
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            
+            updates = []
+            for row in rows:
+                codec, body = encode_transcript_body(row['transcript_text'])
+                content_hash = transcript_content_hash({
+                    'title': row['title'],
+                    'transcript': row['transcript_text'],
+                    'summary': row['summary_text']
+                })
+                updates.append((body, codec, len((row['transcript_text'] or '').encode('utf-8')),
+                                content_hash, row['id']))
+            cursor.executemany("""
+                UPDATE plaud_transcripts
+                SET transcript_body = %s, body_codec = %s, body_bytes = %s,
+                    content_hash = %s, transcript_text = NULL
+                WHERE id = %s
+            """, updates)
+            connection.commit()
+            compressed += len(updates)
+        logger.info(f"Compressed {compressed} transcripts")
+    except Error as e:
+        connection.rollback()
+        logger.error(f"Error compressing transcripts: {e}")
+    finally:
+        if connection.is_connected():
+            cursor.close()
+            connection.close()
+
+@app.route('/api/transcripts', methods=['GET'])
+@conditional_get('plaud_transcripts')
+def list_transcripts():
+    """Transcript metadata only - fetch a body with /api/transcripts/<transcript_id>"""
+    try:
+        limit, offset, after = parse_page_args('plaud_transcripts', request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    records = get_transcript_records(limit=limit, offset=offset, after=after)
+    return jsonify(page_response('plaud_transcripts', records, limit)), 200
+
+@app.route('/api/transcripts/<transcript_id>', methods=['GET'])
+@conditional_get('plaud_transcripts')
+def get_transcript(transcript_id):
+    """One transcript including its decompressed body and summary"""
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    try:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(f"""
+            SELECT {TRANSCRIPT_META_COLUMNS}, summary_text, body_codec, transcript_body, transcript_text
+            FROM plaud_transcripts
+            WHERE transcript_id = %s
+        """, (transcript_id,))
+        record = cursor.fetchone()
+        if record is None:
+            return jsonify({'error': 'Transcript not found'}), 404
+        
+        record['transcript_text'] = decode_transcript_body(
+            record.pop('body_codec'), record.pop('transcript_body'), record['transcript_text'])
+        return jsonify({'status': 'success', 'data': record}), 200
+        
+    except Error as e:
+        logger.error(f"Error retrieving transcript {transcript_id}: {e}")
+        return jsonify({'error': 'Failed to retrieve transcript'}), 500
+    finally:
+        if connection.is_connected():
+            cursor.close()
+            connection.close()
+
 @app.route('/diet')
+@conditional_get('diet')
 def diet_page():
     """Diet tracking page"""
     from flask import render_template, request
@@ -274,15 +1030,30 @@ def diet_page():
     diet_records = get_diet_records(date_filter=date_filter, limit=50)
     return render_template('diet.html', records=diet_records, date_filter=date_filter)
 
+# Rows per page on /tasks (further pages are fetched from GET /api/tasks)
+TASKS_PAGE_SIZE = 50
+
 @app.route('/tasks')
+@conditional_get('tasks')
 def tasks_page():
     """Tasks management page"""
     from flask import render_template, request
-    status_filter = request.args.get('status')
-    tasks = get_tasks_records(status_filter=status_filter, limit=50)
-    return render_template('tasks.html', tasks=tasks, status_filter=status_filter)
+    try:
+        task_query = parse_task_list_args(request.args)
+    except ValueError:
+        task_query = parse_task_list_args({})
+    tasks = get_tasks_records(limit=TASKS_PAGE_SIZE, **task_query)
+    page_key = task_page_key(task_query['sort'], task_query['descending'])
+    # The filter inputs show, and "Load more" repeats, the query these rows came from
+    list_query = task_list_query(task_query)
+    return render_template('tasks.html', tasks=tasks, filters=list_query,
+                           list_query=urlencode(list_query), task_statuses=TASK_STATUSES,
+                           responsible_parties=get_task_responsible_parties(),
+                           page_size=TASKS_PAGE_SIZE,
+                           next_cursor=page_response(page_key, tasks, TASKS_PAGE_SIZE)['next_cursor'])
 
 @app.route('/crm')
+@conditional_get('crm_records')
 def crm_page():
     """CRM contacts page"""
     from flask import render_template, request
@@ -290,20 +1061,24 @@ def crm_page():
     contacts = get_crm_records(search_query=search_query, limit=50)
     return render_template('crm.html', contacts=contacts, search_query=search_query)
 
+def parse_diet_payload(data) -> List[Dict[str, Any]]:
+    """Diet records from a Zapier loop item, legacy comma-separated line items or a list"""
+    return DIET_SCHEMA.normalize(data)
+
 @app.route('/api/diet', methods=['GET', 'POST'])
+@idempotent('diet')
+@conditional_get('diet')
 def handle_diet_webhook():
     """Specific endpoint for diet data from AI by Zapier"""
     # Handle GET requests for retrieving data
     if request.method == 'GET':
         date_filter = request.args.get('date')
-        limit = int(request.args.get('limit', 100))
-        offset = int(request.args.get('offset', 0))
-        records = get_diet_records(date_filter=date_filter, limit=limit, offset=offset)
-        return jsonify({
-            'status': 'success',
-            'count': len(records),
-            'data': records
-        }), 200
+        try:
+            limit, offset, after = parse_page_args('diet', request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        records = get_diet_records(date_filter=date_filter, limit=limit, offset=offset, after=after)
+        return jsonify(page_response('diet', records, limit)), 200
     
     # Handle POST requests for inserting data
     try:
@@ -312,48 +1087,14 @@ def handle_diet_webhook():
         if not data:
             return jsonify({'error': 'No JSON data received'}), 400
         
-        logger.info(f"Received diet data: {json.dumps(data, indent=2)}")
+        payload_log.received(logger, 'diet', data)
         
-        # Extract the actual diet data from Zapier loop format
-        # Parse calories to extract just the number
-        calories_raw = data.get('Result Estimated Calories') or data.get('estimated_calories', '0')
-        # Remove "~", "cal", and whitespace, then convert to int
-        calories_clean = ''.join(filter(str.isdigit, str(calories_raw))) or '0'
+        diet_records = parse_diet_payload(data)
         
-        diet_record = {
-            'food': data.get('Result Food') or data.get('food', ''),
-            'food_type': data.get('Result Food Type') or data.get('food_type', 'Meal'),
-            'estimated_calories': int(calories_clean),
-            'time_of_day': data.get('Result Time Of Day') or data.get('time_of_day', '00:00:00'),
-            'date': data.get('Result Date') or data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        }
-        
-        # Handle Zapier line items format (comma-separated values) - legacy support
-        if 'food' in data and isinstance(data['food'], str) and ',' in data['food']:
-            # Split comma-separated values into individual records
-            foods = [f.strip() for f in data['food'].split(',')]
-            food_types = [f.strip() for f in data['food_type'].split(',')]
-            calories = [c.strip() for c in data['estimated_calories'].split(',')]
-            times = [t.strip() for t in data['time_of_day'].split(',')]
-            dates = [d.strip() for d in data['date'].split(',')]
-            
-            # Create individual records
-            diet_records = []
-            for i in range(len(foods)):
-                diet_records.append({
-                    'food': foods[i],
-                    'food_type': food_types[i] if i < len(food_types) else 'Meal',
-                    'estimated_calories': calories[i] if i < len(calories) else '',
-                    'time_of_day': times[i] if i < len(times) else '00:00:00',
-                    'date': dates[i] if i < len(dates) else datetime.now().strftime('%Y-%m-%d')
-                })
-        # Handle both single record and array of records
-        elif isinstance(data, list):
-            diet_records = data
-        else:
-            diet_records = [diet_record]
+        if ingest_queue:
+            return accept_for_ingest('diet', diet_records, len(diet_records))
         
-        success = insert_diet_data(diet_records)
+        success = diet_writer.submit(diet_records)
         
         if success:
             return jsonify({
@@ -365,49 +1106,60 @@ def handle_diet_webhook():
         else:
             return jsonify({'error': 'Failed to process diet data', 'data': diet_records}), 500
             
+    except PayloadError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error processing diet webhook: {e}")
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
-def insert_tasks_data(tasks_records: List[Dict[str, Any]]) -> bool:
-    """Insert tasks records with ON DUPLICATE KEY UPDATE"""
+TASKS_INSERT_QUERY = """
+INSERT INTO tasks (task_name, task_type, responsible_party, status, 
+                  best_start_date, best_due_date, time_interval, notes, dependency)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+def tasks_rows(tasks_records):
+    """Parameter tuples for TASKS_INSERT_QUERY"""
+    data_to_insert = []
+    for record in tasks_records:
+        data_to_insert.append((
+            record.get('task_name', ''),
+            record.get('task_type', 'Other'),
+            record.get('responsible_party', None),
+            record.get('status', 'Pending'),
+            record.get('best_start_date', None),
+            record.get('best_due_date', None),
+            record.get('time_interval', None),
+            record.get('notes', ''),
+            record.get('dependency', None)
+        ))
+    return data_to_insert
+
+def write_tasks_records(cursor, tasks_records):
+    """Insert task records and their counter changes in the caller's transaction"""
+    data_to_insert = tasks_rows(tasks_records)
+    cursor.executemany(TASKS_INSERT_QUERY, data_to_insert)
+    apply_counter_deltas(cursor, tasks_counter_deltas(data_to_insert))
+
+@metrics.timed
+def insert_tasks_data(tasks_records: List[Dict[str, Any]]):
+    """Insert tasks records with ON DUPLICATE KEY UPDATE (True, False or LOGGED_ONLY)"""
     if not tasks_records:
         return True
         
     connection = get_db_connection()
     if not connection:
-        logger.warning("Database connection failed - logging tasks only")
-        for record in tasks_records:
-            logger.info(f"Would insert task: {record}")
-        return True
+        payload_log.not_saved(logger, 'task', tasks_records)
+        return LOGGED_ONLY
     
     try:
         cursor = connection.cursor()
         
-        insert_query = """
-        INSERT INTO tasks (task_name, task_type, responsible_party, status, 
-                          best_start_date, best_due_date, time_interval, notes, dependency)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        data_to_insert = []
-        for record in tasks_records:
-            data_to_insert.append((
-                record.get('task_name', ''),
-                record.get('task_type', 'Other'),
-                record.get('responsible_party', None),
-                record.get('status', 'Pending'),
-                record.get('best_start_date', None),
-                record.get('best_due_date', None),
-                record.get('time_interval', None),
-                record.get('notes', ''),
-                record.get('dependency', None)
-            ))
-        
-        cursor.executemany(insert_query, data_to_insert)
+        write_tasks_records(cursor, tasks_records)
         connection.commit()
+        query_cache.invalidate('tasks')
         
-        logger.info(f"Successfully inserted {len(tasks_records)} task records to MySQL")
+        logger.info("Successfully inserted %d task records to MySQL", len(tasks_records))
         return True
         
     except Error as e:
@@ -418,46 +1170,58 @@ def insert_tasks_data(tasks_records: List[Dict[str, Any]]) -> bool:
             cursor.close()
             connection.close()
 
-def insert_crm_data(crm_records: List[Dict[str, Any]]) -> bool:
-    """Insert CRM records with ON DUPLICATE KEY UPDATE"""
+CRM_UPSERT_QUERY = """
+INSERT INTO crm_records (contact_name, company, email, phone, notes, status)
+VALUES (%s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+company = VALUES(company),
+phone = VALUES(phone),
+notes = VALUES(notes),
+status = VALUES(status)
+"""
+
+def crm_rows(crm_records):
+    """Parameter tuples for CRM_UPSERT_QUERY"""
+    data_to_insert = []
+    for record in crm_records:
+        data_to_insert.append((
+            record.get('contact_name', ''),
+            record.get('company', None),
+            record.get('email', None),
+            record.get('phone', None),
+            record.get('notes', ''),
+            record.get('status', 'Lead')
+        ))
+    return data_to_insert
+
+def write_crm_records(cursor, crm_records):
+    """Upsert CRM records and their counter changes in the caller's transaction"""
+    data_to_insert = crm_rows(crm_records)
+    existing = find_existing_rows(cursor, 'crm_records', CRM_KEY_COLUMNS, 'id',
+                                  crm_counter_keys(data_to_insert))
+    counter_deltas = crm_counter_deltas(data_to_insert, existing)
+    cursor.executemany(CRM_UPSERT_QUERY, data_to_insert)
+    apply_counter_deltas(cursor, counter_deltas)
+
+@metrics.timed
+def insert_crm_data(crm_records: List[Dict[str, Any]]):
+    """Insert CRM records with ON DUPLICATE KEY UPDATE (True, False or LOGGED_ONLY)"""
     if not crm_records:
         return True
         
     connection = get_db_connection()
     if not connection:
-        logger.warning("Database connection failed - logging CRM data only")
-        for record in crm_records:
-            logger.info(f"Would insert CRM: {record}")
-        return True
+        payload_log.not_saved(logger, 'CRM', crm_records)
+        return LOGGED_ONLY
     
     try:
         cursor = connection.cursor()
         
-        insert_query = """
-        INSERT INTO crm_records (contact_name, company, email, phone, notes, status)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-        company = VALUES(company),
-        phone = VALUES(phone),
-        notes = VALUES(notes),
-        status = VALUES(status)
-        """
-        
-        data_to_insert = []
-        for record in crm_records:
-            data_to_insert.append((
-                record.get('contact_name', ''),
-                record.get('company', None),
-                record.get('email', None),
-                record.get('phone', None),
-                record.get('notes', ''),
-                record.get('status', 'Lead')
-            ))
-        
-        cursor.executemany(insert_query, data_to_insert)
+        write_crm_records(cursor, crm_records)
         connection.commit()
+        query_cache.invalidate('crm_records')
         
-        logger.info(f"Successfully inserted/updated {len(crm_records)} CRM records to MySQL")
+        logger.info("Successfully inserted/updated %d CRM records to MySQL", len(crm_records))
         return True
         
     except Error as e:
@@ -468,20 +1232,24 @@ def insert_crm_data(crm_records: List[Dict[str, Any]]) -> bool:
             cursor.close()
             connection.close()
 
+def parse_tasks_payload(data) -> List[Dict[str, Any]]:
+    """Task records from a Zapier loop item or a list"""
+    return TASKS_SCHEMA.normalize(data)
+
 @app.route('/api/tasks', methods=['GET', 'POST'])
+@idempotent('tasks')
+@conditional_get('tasks')
 def handle_tasks_webhook():
     """Endpoint for tasks data from AI by Zapier"""
     # Handle GET requests for retrieving data
     if request.method == 'GET':
-        status_filter = request.args.get('status')
-        limit = int(request.args.get('limit', 100))
-        offset = int(request.args.get('offset', 0))
-        records = get_tasks_records(status_filter=status_filter, limit=limit, offset=offset)
-        return jsonify({
-            'status': 'success',
-            'count': len(records),
-            'data': records
-        }), 200
+        try:
+            task_query = parse_task_list_args(request.args)
+            page_key, limit, offset, after = parse_task_page_args(task_query, request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        records = get_tasks_records(limit=limit, offset=offset, after=after, **task_query)
+        return jsonify(page_response(page_key, records, limit)), 200
     
     # Handle POST requests for inserting data
     try:
@@ -490,24 +1258,14 @@ def handle_tasks_webhook():
         if not data:
             return jsonify({'error': 'No JSON data received'}), 400
         
-        logger.info(f"Received tasks data: {json.dumps(data, indent=2)}")
-        
-        # Extract task data from Zapier loop format
-        task_record = {
-            'task_name': data.get('Result Task Name') or data.get('task_name', ''),
-            'task_type': data.get('Result Task Type') or data.get('task_type', 'Other'),
-            'responsible_party': data.get('Result Responsible Party') or data.get('responsible_party', None),
-            'status': data.get('Result Status') or data.get('status', 'Pending'),
-            'best_start_date': data.get('Result Best Start Date') or data.get('best_start_date', None),
-            'best_due_date': data.get('Result Best Due Date') or data.get('best_due_date', None),
-            'time_interval': data.get('Result Time Interval') or data.get('time_interval', None),
-            'notes': data.get('Result Notes') or data.get('notes', ''),
-            'dependency': data.get('Result Dependency') or data.get('dependency', None)
-        }
+        payload_log.received(logger, 'tasks', data)
+        
+        tasks_records = parse_tasks_payload(data)
         
-        tasks_records = [task_record] if not isinstance(data, list) else data
+        if ingest_queue:
+            return accept_for_ingest('tasks', tasks_records, len(tasks_records))
         
-        success = insert_tasks_data(tasks_records)
+        success = tasks_writer.submit(tasks_records)
         
         if success:
             return jsonify({
@@ -519,80 +1277,196 @@ def handle_tasks_webhook():
         else:
             return jsonify({'error': 'Failed to process tasks data', 'data': tasks_records}), 500
     
+    except PayloadError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error processing tasks webhook: {e}")
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
+TASK_STATUSES = ['Pending', 'In Progress', 'Completed', 'Cancelled']
+
+# Bulk edits from the tasks page - at most this many updates per PATCH /api/tasks
+MAX_TASK_UPDATES = int(os.environ.get('MAX_TASK_UPDATES', 500))
+TASK_UPDATE_FIELDS = ('status', 'priority')
+
+def parse_task_id(value) -> int:
+    """A positive task id from a JSON number or a digit string"""
+    task_id = int(value) if isinstance(value, str) and value.isascii() and value.isdigit() else value
+    if isinstance(task_id, int) and not isinstance(task_id, bool) and task_id > 0:
+        return task_id
+    raise ValueError(f"Invalid task id {value!r}")
+
+def parse_task_updates(data) -> Dict[int, Dict[str, Any]]:
+    """Validated {task_id: {field: value}} from a bulk PATCH body
+    
+    Accepts {"updates": [...]} or a bare list of {"id", "status"?, "priority"?}.
+    Later entries for the same task override earlier ones field by field.
+    """
+    items = data.get('updates') if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        raise ValueError('Expected a non-empty list of task updates')
+    if len(items) > MAX_TASK_UPDATES:
+        raise ValueError(f'At most {MAX_TASK_UPDATES} task updates per request')
+    
+    updates = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f'Update {index} is not a JSON object')
+        task_id = parse_task_id(item.get('id'))
+        changes = {}
+        if 'status' in item:
+            if item['status'] not in TASK_STATUSES:
+                raise ValueError(f'Update {index}: invalid status. Must be one of: {", ".join(TASK_STATUSES)}')
+            changes['status'] = item['status']
+        if 'priority' in item:
+            priority = item['priority']
+            if priority is not None and (isinstance(priority, bool) or not isinstance(priority, int)
+                                         or not 1 <= priority <= 99):
+                raise ValueError(f'Update {index}: priority must be between 1 and 99 or null')
+            changes['priority'] = priority
+        if not changes:
+            raise ValueError(f'Update {index} changes nothing - send status and/or priority')
+        updates.setdefault(task_id, {}).update(changes)
+    return updates
+
+def locked_tasks_query(task_ids):
+    """Lock the tasks being edited and read their old status (for pending_tasks)"""
+    placeholders = ', '.join(['%s'] * len(task_ids))
+    return f"SELECT id, status FROM tasks WHERE id IN ({placeholders}) FOR UPDATE", list(task_ids)
+
+def task_updates_query(updates, task_ids):
+    """One UPDATE ... CASE statement applying every change to the given tasks"""
+    assignments = []
+    params = []
+    for field in TASK_UPDATE_FIELDS:
+        changed = [task_id for task_id in task_ids if field in updates[task_id]]
+        if not changed:
+            continue
+        cases = ' '.join(['WHEN %s THEN %s'] * len(changed))
+        assignments.append(f"{field} = CASE id {cases} ELSE {field} END")
+        for task_id in changed:
+            params.extend((task_id, updates[task_id][field]))
+    placeholders = ', '.join(['%s'] * len(task_ids))
+    query = f"""
+    UPDATE tasks
+    SET {', '.join(assignments)}, updated_at = CURRENT_TIMESTAMP
+    WHERE id IN ({placeholders})
+    """
+    return query, params + list(task_ids)
+
+def pending_tasks_delta(updates, old_statuses) -> int:
+    return sum((changes['status'] == 'Pending') - (old_statuses[task_id] == 'Pending')
+               for task_id, changes in updates.items()
+               if 'status' in changes and task_id in old_statuses)
+
+def apply_task_updates(cursor, updates) -> List[int]:
+    """Apply validated updates in the caller's transaction; returns the ids not found"""
+    task_ids = sorted(updates)
+    cursor.execute(*locked_tasks_query(task_ids))
+    old_statuses = {task_id: status for task_id, status in cursor.fetchall()}
+    found = [task_id for task_id in task_ids if task_id in old_statuses]
+    if found:
+        cursor.execute(*task_updates_query(updates, found))
+        apply_counter_deltas(cursor, {'pending_tasks': pending_tasks_delta(updates, old_statuses)})
+    return [task_id for task_id in task_ids if task_id not in old_statuses]
+
+def update_tasks_in_db(updates):
+    """Run apply_task_updates in its own transaction; returns not-found ids, or None on error"""
+    connection = get_db_connection()
+    if not connection:
+        return None
+    
+    try:
+        cursor = connection.cursor()
+        not_found = apply_task_updates(cursor, updates)
+        connection.commit()
+        if len(not_found) < len(updates):
+            query_cache.invalidate('tasks')
+        return not_found
+    except Error as e:
+        connection.rollback()
+        logger.error(f"Error updating tasks (rolled back): {e}")
+        return None
+    finally:
+        if connection.is_connected():
+            cursor.close()
+            connection.close()
+
+@app.route('/api/tasks', methods=['PATCH'])
+def update_tasks():
+    """Apply a batch of status/priority edits in one transaction
+    
+    Example: {"updates": [{"id": 4, "status": "Completed"}, {"id": 7, "priority": 2}]}
+    """
+    try:
+        updates = parse_task_updates(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    not_found = update_tasks_in_db(updates)
+    if not_found is None:
+        return jsonify({'error': 'Failed to update tasks - no changes were saved'}), 500
+    
+    logger.info("Updated %d tasks in one batch", len(updates) - len(not_found))
+    return jsonify({
+        'status': 'success',
+        'updated': len(updates) - len(not_found),
+        'not_found': not_found
+    }), 200
+
 @app.route('/api/tasks/<int:task_id>/status', methods=['PATCH'])
 def update_task_status(task_id):
     """Update task status (for checkbox toggle)"""
-    try:
-        data = request.get_json()
-        
-        if not data or 'status' not in data:
-            return jsonify({'error': 'Status is required'}), 400
-        
-        new_status = data['status']
-        
-        # Validate status
-        valid_statuses = ['Pending', 'In Progress', 'Completed', 'Cancelled']
-        if new_status not in valid_statuses:
-            return jsonify({'error': f'Invalid status. Must be one of: {", ".join(valid_statuses)}'}), 400
-        
-        connection = get_db_connection()
-        if not connection:
-            return jsonify({'error': 'Database connection failed'}), 500
-        
-        try:
-            cursor = connection.cursor()
-            
-            # Update task status
-            query = """
-            UPDATE tasks 
-            SET status = %s, updated_at = CURRENT_TIMESTAMP
-            WHERE id = %s
-            """
-            cursor.execute(query, (new_status, task_id))
-            connection.commit()
-            
-            if cursor.rowcount == 0:
-                return jsonify({'error': 'Task not found'}), 404
-            
-            logger.info(f"Updated task {task_id} status to {new_status}")
-            
-            return jsonify({
-                'status': 'success',
-                'message': f'Task status updated to {new_status}',
-                'task_id': task_id,
-                'new_status': new_status
-            }), 200
-            
-        except Error as e:
-            logger.error(f"Error updating task status: {e}")
-            return jsonify({'error': 'Failed to update task status'}), 500
-        finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+    data = request.get_json(silent=True)
     
-    except Exception as e:
-        logger.error(f"Error in update_task_status: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    if not data or 'status' not in data:
+        return jsonify({'error': 'Status is required'}), 400
+    
+    new_status = data['status']
+    
+    # Validate status
+    if new_status not in TASK_STATUSES:
+        return jsonify({'error': f'Invalid status. Must be one of: {", ".join(TASK_STATUSES)}'}), 400
+    
+    not_found = update_tasks_in_db({task_id: {'status': new_status}})
+    if not_found is None:
+        return jsonify({'error': 'Failed to update task status'}), 500
+    if not_found:
+        return jsonify({'error': 'Task not found'}), 404
+    
+    logger.info(f"Updated task {task_id} status to {new_status}")
+    
+    return jsonify({
+        'status': 'success',
+        'message': f'Task status updated to {new_status}',
+        'task_id': task_id,
+        'new_status': new_status
+    }), 200
+
+def parse_crm_payload(data) -> List[Dict[str, Any]]:
+    """CRM records from a Zapier loop item or a list"""
+    return CRM_SCHEMA.normalize(data)
 
 @app.route('/api/crm', methods=['GET', 'POST'])
+@idempotent('crm')
+@conditional_get('crm_records')
 def handle_crm_webhook():
     """Endpoint for CRM data from AI by Zapier"""
     # Handle GET requests for retrieving data
     if request.method == 'GET':
         search_query = request.args.get('search')
-        limit = int(request.args.get('limit', 100))
-        offset = int(request.args.get('offset', 0))
-        records = get_crm_records(search_query=search_query, limit=limit, offset=offset)
-        return jsonify({
-            'status': 'success',
-            'count': len(records),
-            'data': records
-        }), 200
+        try:
+            limit, offset, after = parse_page_args('crm_records', request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if search_query and after:
+            # Search results are ranked by relevance, not by the cursor's sort key
+            return jsonify({'error': 'cursor paging is not supported with search - use offset'}), 400
+        records = get_crm_records(search_query=search_query, limit=limit, offset=offset, after=after)
+        body = page_response('crm_records', records, limit)
+        if search_query:
+            body['next_cursor'] = None
+        return jsonify(body), 200
     
     # Handle POST requests for inserting data
     try:
@@ -601,21 +1475,14 @@ def handle_crm_webhook():
         if not data:
             return jsonify({'error': 'No JSON data received'}), 400
         
-        logger.info(f"Received CRM data: {json.dumps(data, indent=2)}")
+        payload_log.received(logger, 'CRM', data)
         
-        # Extract CRM data
-        crm_record = {
-            'contact_name': data.get('Result Contact Name') or data.get('contact_name', ''),
-            'company': data.get('Result Company') or data.get('company', None),
-            'email': data.get('Result Email') or data.get('email', None),
-            'phone': data.get('Result Phone') or data.get('phone', None),
-            'notes': data.get('Result Notes') or data.get('notes', ''),
-            'status': data.get('Result Status') or data.get('status', 'Lead')
-        }
+        crm_records = parse_crm_payload(data)
         
-        crm_records = [crm_record] if not isinstance(data, list) else data
+        if ingest_queue:
+            return accept_for_ingest('crm', crm_records, len(crm_records))
         
-        success = insert_crm_data(crm_records)
+        success = crm_writer.submit(crm_records)
         
         if success:
             return jsonify({
@@ -627,11 +1494,85 @@ def handle_crm_webhook():
         else:
             return jsonify({'error': 'Failed to process CRM data', 'data': crm_records}), 500
             
+    except PayloadError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error processing CRM webhook: {e}")
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
+diet_writer = WriteCoalescer('diet', insert_diet_data, **WRITE_BATCH_CONFIG)
+tasks_writer = WriteCoalescer('tasks', insert_tasks_data, **WRITE_BATCH_CONFIG)
+crm_writer = WriteCoalescer('crm', insert_crm_data, **WRITE_BATCH_CONFIG)
+
+def database_available() -> bool:
+    """Check that a pooled MySQL connection can be obtained"""
+    connection = get_db_connection()
+    if not connection:
+        return False
+    connection.close()
+    return True
+
+def ingest_records_job(insert_func):
+    """Queue handler for record lists; retries instead of the helpers' log-only fallback"""
+    def handler(records):
+        if not database_available():
+            return False
+        # MySQL can still drop between the check and the insert - records the
+        # helper only logged stay queued
+        result = insert_func(records)
+        return bool(result) and result is not LOGGED_ONLY
+    return handler
+
+def ingest_plaud_job(data):
+    """Queue handler for full Plaud payloads"""
+    return process_plaud_payload(data) is not None
+
+if INGEST_CONFIG['mode'] == 'async':
+    ingest_queue = IngestQueue(INGEST_CONFIG['queue_path'],
+                               max_attempts=INGEST_CONFIG['max_attempts'],
+                               retry_base=INGEST_CONFIG['retry_base'],
+                               retry_cap=INGEST_CONFIG['retry_cap'])
+    ingest_workers = IngestWorkerPool(ingest_queue, {
+        'plaud': ingest_plaud_job,
+        'diet': ingest_records_job(diet_writer.submit),
+        'tasks': ingest_records_job(tasks_writer.submit),
+        'crm': ingest_records_job(crm_writer.submit)
+    }, workers=INGEST_CONFIG['workers'])
+else:
+    ingest_queue = None
+    ingest_workers = None
+
+@app.before_request
+def start_ingest_workers():
+    """Start queue workers in each gunicorn worker process on its first request"""
+    if ingest_workers:
+        ingest_workers.start()
+
+def accept_for_ingest(kind, payload, count):
+    """Durably queue a webhook payload and answer 202 Accepted"""
+    job_id = ingest_queue.enqueue(kind, payload)
+    ingest_workers.notify()
+    logger.info("Queued %s ingest job %s (%d records)", kind, job_id, count)
+    return jsonify({
+        'status': 'accepted',
+        'message': f'Queued {count} {kind} records for processing',
+        'job_id': job_id,
+        'status_url': f'/api/ingest/{job_id}'
+    }), 202
+
+@app.route('/api/ingest/<int:job_id>', methods=['GET'])
+def get_ingest_job(job_id):
+    """Processing status of a queued webhook payload"""
+    if not ingest_queue:
+        return jsonify({'error': 'Async ingest is disabled (INGEST_MODE=sync)'}), 404
+    
+    job = ingest_queue.get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'status': 'success', 'data': job}), 200
+
 @app.route('/api/stats', methods=['GET'])
+@conditional_get('diet', 'tasks', 'crm_records', 'dashboard_counters')
 def get_stats():
     """Get dashboard statistics"""
     stats = get_dashboard_stats()
@@ -646,12 +1587,265 @@ def health_check():
     connection = get_db_connection()
     if connection:
         connection.close()
-        return jsonify({'status': 'healthy', 'database': 'connected'}), 200
+        health = {'status': 'healthy', 'database': 'connected'}
+        status_code = 200
+    else:
+        health = {'status': 'unhealthy', 'database': 'disconnected'}
+        status_code = 500
+    
+    health['pool'] = get_pool_stats()
+    health['cache'] = query_cache.stats()
+    health['write_batches'] = {writer.name: writer.stats()
+                               for writer in (diet_writer, tasks_writer, crm_writer)}
+    if ingest_queue:
+        health['ingest_queue'] = ingest_queue.stats()
+    if log_handler:
+        health['logging'] = log_handler.stats()
+    health['idempotency'] = idempotency.stats()
+    health['json'] = json_codec.stats()
+    return jsonify(health), status_code
+
+@app.before_request
+def start_request_metrics():
+    metrics.start_request()
+
+@app.after_request
+def finish_request_metrics(response):
+    """Record the request and tell the client where its time went"""
+    stats = metrics.finish_request(request.endpoint, request.method, response.status_code,
+                                   request.content_length)
+    if stats is not None and METRICS_CONFIG['server_timing']:
+        response.headers['Server-Timing'] = metrics.server_timing(stats)
+    return response
+
+@app.after_request
+def compress_response(response):
+    """Gzip HTML/JSON bodies for clients that accept it (streams are left alone)"""
+    if (not COMPRESSION_CONFIG['enabled'] or response.direct_passthrough or response.is_streamed
+            or response.status_code != 200 or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    if request.accept_encodings['gzip'] <= 0:
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESSION_CONFIG['min_size']:
+        return response
+    
+    response.set_data(gzip.compress(body, compresslevel=COMPRESSION_CONFIG['level'], mtime=0))
+    response.headers['Content-Encoding'] = 'gzip'
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(etag + GZIP_ETAG_SUFFIX, weak)
+    return response
+
+@app.route('/static/<path:filename>')
+def static_asset(filename):
+    """Asset from the manifest in the best encoding the client accepts"""
+    asset, immutable = static_assets.lookup(filename)
+    if asset is None:
+        return Response('Not found', status=404, mimetype='text/plain')
+    
+    encoding, body = asset.negotiate(request.accept_encodings)
+    etag = asset.etag(encoding)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
     else:
-        return jsonify({'status': 'unhealthy', 'database': 'disconnected'}), 500
+        response = Response(body, mimetype=asset.mimetype)
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    # Unfingerprinted paths can change under the same URL, so they are revalidated
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if immutable else 'public, no-cache'
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus metrics for this worker process"""
+    pool_gauge = metrics.gauge('plaud_db_pool_connections', 'Connection pool state', labels=('state',))
+    pool = get_pool_stats()
+    for state in ('open', 'checked_out', 'idle', 'overflow'):
+        pool_gauge.set(pool[state], state=state)
+    cache_gauge = metrics.gauge('plaud_query_cache_events', 'Query cache events since start',
+                                labels=('event',))
+    for event, value in query_cache.stats().items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            cache_gauge.set(value, event=event)
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+DIET_COLUMNS = "id, food, food_type, estimated_calories, time_of_day, date, created_at"
+TASKS_COLUMNS = """id, task_name, task_type, responsible_party, status, priority,
+                   best_start_date, best_due_date, time_interval, notes, dependency, created_at"""
+CRM_COLUMNS = "id, contact_name, company, email, phone, notes, status, created_at, updated_at"
+TRANSCRIPT_META_COLUMNS = ("id, transcript_id, title, body_bytes, body_codec IS NOT NULL AS compressed, "
+                           "content_hash, create_time, processed_at")
+
+# Pagination - list endpoints accept either offset or an opaque keyset cursor
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', 500))
+
+# Sort key columns (all DESC, id last as the tiebreaker) per paginated table
+PAGE_KEYS = {
+    'diet': ('date', 'time_of_day', 'id'),
+    'tasks': ('created_at', 'id'),
+    'crm_records': ('created_at', 'id'),
+    'plaud_transcripts': ('create_time', 'id')
+}
+
+def keyset_condition(columns, descending=True):
+    """WHERE clause selecting rows after a cursor for a sort on columns
+    
+    Expanded into OR/AND form (instead of a row constructor) so MySQL can use
+    a range scan on the matching index.
+    """
+    column = columns[0]
+    operator = '<' if descending else '>'
+    if len(columns) == 1:
+        return f"{column} {operator} %s"
+    return (f"({column} {operator} %s OR ({column} = %s AND "
+            f"{keyset_condition(columns[1:], descending)}))")
+
+def keyset_params(values):
+    """Parameters for keyset_condition, in placeholder order"""
+    if len(values) == 1:
+        return [values[0]]
+    return [values[0], values[0]] + keyset_params(values[1:])
+
+# Whitelisted task sorts (id is the tiebreaker). Each has an index of its own and one
+# behind status; the nullable ones list unset values last.
+TASK_SORTS = ('created_at', 'priority', 'best_due_date', 'task_name', 'task_type', 'status',
+              'responsible_party')
+NULLABLE_TASK_SORTS = {'priority', 'best_due_date', 'task_type', 'status', 'responsible_party'}
+
+def task_page_key(sort, descending):
+    """PAGE_KEYS entry for a task sort - plain 'tasks' for the default newest-first"""
+    if sort == 'created_at' and descending:
+        return 'tasks'
+    return f"tasks/{sort}/{'desc' if descending else 'asc'}"
+
+PAGE_KEYS.update({task_page_key(sort, descending): (sort, 'id')
+                  for sort in TASK_SORTS for descending in (False, True)})
+
+def task_keyset(sort, after, descending):
+    """(condition, params) selecting tasks after a cursor's (sort value, id)
+    
+    status is an ENUM: it sorts in declaration order (TASK_STATUSES) but compares
+    with a string as text, so the statuses that come later are listed instead.
+    """
+    if sort != 'status':
+        return keyset_condition((sort, 'id'), descending), keyset_params(after)
+    status, task_id = after
+    position = TASK_STATUSES.index(status)
+    later = TASK_STATUSES[:position] if descending else TASK_STATUSES[position + 1:]
+    condition = f"(status = %s AND id {'<' if descending else '>'} %s)"
+    if not later:
+        return condition, [status, task_id]
+    placeholders = ', '.join(['%s'] * len(later))
+    return f"(status IN ({placeholders}) OR {condition})", later + [status, task_id]
+
+def parse_task_page_args(task_query, args):
+    """(page key, limit, offset, after) for a task list, raising ValueError on bad input"""
+    page_key = task_page_key(task_query['sort'], task_query['descending'])
+    limit, offset, after = parse_page_args(page_key, args)
+    if after and task_query['sort'] == 'status' and after[0] not in (None, *TASK_STATUSES):
+        raise ValueError('Invalid cursor')
+    return page_key, limit, offset, after
+
+def parse_task_list_args(args) -> Dict[str, Any]:
+    """get_tasks_records keyword arguments from query args, raising ValueError on bad input"""
+    status = args.get('status') or None
+    if status and status not in TASK_STATUSES:
+        raise ValueError(f'Invalid status. Must be one of: {", ".join(TASK_STATUSES)}')
+    due_range = {}
+    for name in ('due_from', 'due_to'):
+        if args.get(name):
+            try:
+                due_range[name] = date.fromisoformat(args[name]).isoformat()
+            except ValueError:
+                raise ValueError(f'{name} must be a date (YYYY-MM-DD)')
+    
+    sort = args.get('sort') or 'created_at'
+    if sort not in TASK_SORTS:
+        raise ValueError(f'sort must be one of: {", ".join(TASK_SORTS)}')
+    order = args.get('order') or ('desc' if sort == 'created_at' else 'asc')
+    if order not in ('asc', 'desc'):
+        raise ValueError("order must be 'asc' or 'desc'")
+    return {
+        'status_filter': status,
+        'task_type': args.get('task_type') or None,
+        'responsible_party': args.get('responsible_party') or None,
+        'due_from': due_range.get('due_from'),
+        'due_to': due_range.get('due_to'),
+        'sort': sort,
+        'descending': order == 'desc'
+    }
 
-def get_diet_records(date_filter=None, limit=100, offset=0):
-    """Retrieve diet records from database"""
+def task_list_query(task_query) -> Dict[str, str]:
+    """Query args that parse_task_list_args turns back into task_query (defaults left out)"""
+    query = {name: task_query[key] for name, key in (
+        ('status', 'status_filter'), ('task_type', 'task_type'),
+        ('responsible_party', 'responsible_party'), ('due_from', 'due_from'), ('due_to', 'due_to')
+    ) if task_query[key]}
+    if task_query['sort'] != 'created_at' or not task_query['descending']:
+        query['sort'] = task_query['sort']
+        query['order'] = 'desc' if task_query['descending'] else 'asc'
+    return query
+
+def format_cursor_value(value):
+    """Render a sort key value as a string MySQL compares back correctly"""
+    if isinstance(value, timedelta):
+        return time_string(value)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+def encode_page_cursor(table, record):
+    """Opaque next-page token built from the last record's sort key"""
+    values = [format_cursor_value(record[column]) for column in PAGE_KEYS[table]]
+    raw = json.dumps([table, values], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_page_cursor(table, token):
+    """Sort key values from a token, raising ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        cursor_table, values = json.loads(raw)
+    except Exception as e:
+        raise ValueError('Invalid cursor') from e
+    if cursor_table != table or len(values) != len(PAGE_KEYS[table]):
+        raise ValueError('Cursor does not belong to this endpoint')
+    return tuple(values)
+
+def parse_page_args(table, args):
+    """Read limit/offset/cursor query args, raising ValueError on bad input"""
+    limit = int(args.get('limit', 100))
+    offset = int(args.get('offset', 0))
+    if limit < 1 or offset < 0:
+        raise ValueError('limit must be positive and offset non-negative')
+    
+    token = args.get('cursor')
+    after = decode_page_cursor(table, token) if token else None
+    return min(limit, MAX_PAGE_SIZE), offset, after
+
+def page_response(table, records, limit):
+    """JSON body for a list endpoint, with the cursor for the next page"""
+    next_cursor = None
+    if len(records) == limit:
+        next_cursor = encode_page_cursor(table, records[-1])
+    return {
+        'status': 'success',
+        'count': len(records),
+        'data': records,
+        'next_cursor': next_cursor
+    }
+
+@metrics.timed
+@query_cache.cached('diet_records', tables=('diet',), ttl=CACHE_TTLS['diet'])
+def get_diet_records(date_filter=None, limit=100, offset=0, after=None):
+    """Retrieve diet records from database (pass after= for keyset pagination)"""
     connection = get_db_connection()
     if not connection:
         return []
@@ -659,37 +1853,55 @@ def get_diet_records(date_filter=None, limit=100, offset=0):
     try:
         cursor = connection.cursor(dictionary=True)
         
+        conditions = []
+        params = []
         if date_filter:
-            query = """
-            SELECT id, food, food_type, estimated_calories, time_of_day, date, created_at
-            FROM diet
-            WHERE date = %s
-            ORDER BY date DESC, time_of_day DESC
-            LIMIT %s OFFSET %s
-            """
-            cursor.execute(query, (date_filter, limit, offset))
-        else:
-            query = """
-            SELECT id, food, food_type, estimated_calories, time_of_day, date, created_at
-            FROM diet
-            ORDER BY date DESC, time_of_day DESC
-            LIMIT %s OFFSET %s
-            """
-            cursor.execute(query, (limit, offset))
+            conditions.append("date = %s")
+            params.append(date_filter)
+        if after:
+            conditions.append(keyset_condition(PAGE_KEYS['diet']))
+            params.extend(keyset_params(after))
+            offset = 0
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        query = f"""
+        SELECT {DIET_COLUMNS}
+        FROM diet
+        {where}
+        ORDER BY date DESC, time_of_day DESC, id DESC
+        LIMIT %s OFFSET %s
+        """
+        cursor.execute(query, params + [limit, offset])
         
         records = cursor.fetchall()
         return records
         
     except Error as e:
         logger.error(f"Error retrieving diet records: {e}")
+        mark_database_unavailable()
         return []
     finally:
         if connection.is_connected():
             cursor.close()
             connection.close()
 
-def get_tasks_records(status_filter=None, limit=100, offset=0):
-    """Retrieve tasks from database"""
+@metrics.timed
+@query_cache.cached('tasks_records', tables=('tasks',), ttl=CACHE_TTLS['tasks'])
+def get_tasks_records(status_filter=None, limit=100, offset=0, after=None, task_type=None,
+                      responsible_party=None, due_from=None, due_to=None, sort='created_at',
+                      descending=None):
+    """Retrieve tasks from database (pass after= for keyset pagination)
+    
+    Filters are ANDed; sort is one of TASK_SORTS. A nullable sort column is read in
+    two index-ordered passes - rows with a value, then unset rows by id - so that
+    neither needs a filesort.
+    """
+    if sort not in TASK_SORTS:
+        raise ValueError(f"Unsupported task sort {sort!r}")
+    if descending is None:
+        descending = sort == 'created_at'
+    direction = 'DESC' if descending else 'ASC'
+    
     connection = get_db_connection()
     if not connection:
         return []
@@ -697,39 +1909,137 @@ def get_tasks_records(status_filter=None, limit=100, offset=0):
     try:
         cursor = connection.cursor(dictionary=True)
         
-        if status_filter:
-            query = """
-            SELECT id, task_name, task_type, responsible_party, status, 
-                   best_start_date, best_due_date, time_interval, notes, dependency, created_at
-            FROM tasks
-            WHERE status = %s
-            ORDER BY created_at DESC
-            LIMIT %s OFFSET %s
-            """
-            cursor.execute(query, (status_filter, limit, offset))
-        else:
-            query = """
-            SELECT id, task_name, task_type, responsible_party, status, 
-                   best_start_date, best_due_date, time_interval, notes, dependency, created_at
+        conditions = []
+        params = []
+        for column, value in (('status', status_filter), ('task_type', task_type),
+                              ('responsible_party', responsible_party)):
+            if value:
+                conditions.append(f"{column} = %s")
+                params.append(value)
+        if due_from:
+            conditions.append("best_due_date >= %s")
+            params.append(due_from)
+        if due_to:
+            conditions.append("best_due_date <= %s")
+            params.append(due_to)
+        
+        def select(extra_conditions, extra_params, order_by, count, skip=0):
+            where_conditions = conditions + extra_conditions
+            where = f"WHERE {' AND '.join(where_conditions)}" if where_conditions else ""
+            query = f"""
+            SELECT {TASKS_COLUMNS}
             FROM tasks
-            ORDER BY created_at DESC
+            {where}
+            ORDER BY {order_by}
             LIMIT %s OFFSET %s
             """
-            cursor.execute(query, (limit, offset))
-        
-        records = cursor.fetchall()
+            cursor.execute(query, params + extra_params + [count, skip])
+            return cursor.fetchall()
+        
+        order_by = f"{sort} {direction}, id {direction}"
+        if sort not in NULLABLE_TASK_SORTS:
+            if after:
+                condition, condition_params = task_keyset(sort, after, descending)
+                return select([condition], condition_params, order_by, limit)
+            return select([], [], order_by, limit, offset)
+        
+        if offset and not after:
+            # Deep offset paging across both passes - only this path sorts in memory
+            return select([], [], f"{sort} IS NULL, {order_by}", limit, offset)
+        
+        records = []
+        if not after or after[0] is not None:
+            extra_conditions = [f"{sort} IS NOT NULL"]
+            extra_params = []
+            if after:
+                condition, extra_params = task_keyset(sort, after, descending)
+                extra_conditions.append(condition)
+            records = select(extra_conditions, extra_params, order_by, limit)
+        if len(records) < limit:
+            extra_conditions = [f"{sort} IS NULL"]
+            extra_params = []
+            if after and after[0] is None:
+                extra_conditions.append(keyset_condition(('id',), descending))
+                extra_params = [after[1]]
+            records += select(extra_conditions, extra_params, f"id {direction}",
+                              limit - len(records))
         return records
         
     except Error as e:
         logger.error(f"Error retrieving tasks: {e}")
+        mark_database_unavailable()
+        return []
+    finally:
+        if connection.is_connected():
+            cursor.close()
+            connection.close()
+
+@metrics.timed
+@query_cache.cached('task_responsible_parties', tables=('tasks',), ttl=CACHE_TTLS['tasks'])
+def get_task_responsible_parties():
+    """Distinct responsible parties for the tasks page filter"""
+    connection = get_db_connection()
+    if not connection:
+        return []
+    
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+        SELECT DISTINCT responsible_party
+        FROM tasks
+        WHERE responsible_party IS NOT NULL AND responsible_party <> ''
+        ORDER BY responsible_party
+        """)
+        return [row[0] for row in cursor.fetchall()]
+        
+    except Error as e:
+        logger.error(f"Error retrieving responsible parties: {e}")
+        mark_database_unavailable()
         return []
     finally:
         if connection.is_connected():
             cursor.close()
             connection.close()
 
-def get_crm_records(search_query=None, limit=100, offset=0):
-    """Retrieve CRM contacts from database"""
+# CRM search - 'fulltext' uses the ft_contact_search index, 'like' the old substring scan
+CRM_SEARCH_MODE = os.environ.get('CRM_SEARCH_MODE', 'fulltext')
+
+# InnoDB's default FULLTEXT stopwords and minimum token size - such terms never match
+FULLTEXT_STOPWORDS = {
+    'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de', 'en', 'for', 'from',
+    'how', 'i', 'in', 'is', 'it', 'la', 'of', 'on', 'or', 'that', 'the', 'this', 'to',
+    'was', 'what', 'when', 'where', 'who', 'will', 'with', 'und', 'www'
+}
+FULLTEXT_MIN_TOKEN = int(os.environ.get('FULLTEXT_MIN_TOKEN', 3))
+
+def fulltext_boolean_query(text):
+    """Turn free text into a BOOLEAN MODE query requiring every word as a prefix
+    
+    'Ali techc' -> '+ali* +techc*'. Returns None when no word is long enough for
+    the FULLTEXT index, so the caller can fall back to LIKE.
+    """
+    words = [word for word in re.findall(r'\w+', text.lower())
+             if len(word) >= FULLTEXT_MIN_TOKEN and word not in FULLTEXT_STOPWORDS]
+    if not words:
+        return None
+    return ' '.join(f'+{word}*' for word in words)
+
+def search_crm_fulltext(cursor, boolean_query, limit, offset):
+    """Ranked CRM search through the ft_contact_search FULLTEXT index"""
+    cursor.execute(f"""
+        SELECT {CRM_COLUMNS},
+               MATCH(contact_name, company, email) AGAINST (%s IN BOOLEAN MODE) AS relevance
+        FROM crm_records
+        WHERE MATCH(contact_name, company, email) AGAINST (%s IN BOOLEAN MODE)
+        ORDER BY relevance DESC, id DESC
+        LIMIT %s OFFSET %s
+    """, (boolean_query, boolean_query, limit, offset))
+    return cursor.fetchall()
+
+@metrics.timed
+@query_cache.cached('crm_records', tables=('crm_records',), ttl=CACHE_TTLS['crm'])
+def get_crm_records(search_query=None, limit=100, offset=0, after=None):
+    """Retrieve CRM contacts from database (pass after= for keyset pagination)"""
     connection = get_db_connection()
     if not connection:
         return []
@@ -737,103 +2047,499 @@ def get_crm_records(search_query=None, limit=100, offset=0):
     try:
         cursor = connection.cursor(dictionary=True)
         
+        boolean_query = fulltext_boolean_query(search_query) if search_query else None
+        if boolean_query and CRM_SEARCH_MODE == 'fulltext':
+            try:
+                return search_crm_fulltext(cursor, boolean_query, limit, offset)
+            except Error as e:
+                # e.g. the FULLTEXT index has not been created yet
+                logger.warning(f"FULLTEXT CRM search failed, falling back to LIKE: {e}")
+        
+        conditions = []
+        params = []
         if search_query:
-            query = """
-            SELECT id, contact_name, company, email, phone, notes, status, created_at, updated_at
-            FROM crm_records
-            WHERE contact_name LIKE %s OR company LIKE %s OR email LIKE %s
-            ORDER BY created_at DESC
-            LIMIT %s OFFSET %s
-            """
+            conditions.append("(contact_name LIKE %s OR company LIKE %s OR email LIKE %s)")
             search_pattern = f"%{search_query}%"
-            cursor.execute(query, (search_pattern, search_pattern, search_pattern, limit, offset))
-        else:
-            query = """
-            SELECT id, contact_name, company, email, phone, notes, status, created_at, updated_at
-            FROM crm_records
-            ORDER BY created_at DESC
-            LIMIT %s OFFSET %s
-            """
-            cursor.execute(query, (limit, offset))
+            params.extend([search_pattern, search_pattern, search_pattern])
+        if after:
+            conditions.append(keyset_condition(PAGE_KEYS['crm_records']))
+            params.extend(keyset_params(after))
+            offset = 0
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        query = f"""
+        SELECT {CRM_COLUMNS}
+        FROM crm_records
+        {where}
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s OFFSET %s
+        """
+        cursor.execute(query, params + [limit, offset])
         
         records = cursor.fetchall()
         return records
         
     except Error as e:
         logger.error(f"Error retrieving CRM records: {e}")
+        mark_database_unavailable()
         return []
     finally:
         if connection.is_connected():
             cursor.close()
             connection.close()
 
-def get_dashboard_stats():
-    """Get statistics for dashboard"""
+@metrics.timed
+@query_cache.cached('transcript_records', tables=('plaud_transcripts',), ttl=CACHE_TTLS['transcripts'])
+def get_transcript_records(limit=100, offset=0, after=None):
+    """Transcript metadata, newest first - bodies are never read here"""
     connection = get_db_connection()
     if not connection:
-        return {}
+        return []
     
     try:
         cursor = connection.cursor(dictionary=True)
         
-        # Total calories today
+        where = ""
+        params = []
+        if after:
+            where = f"WHERE {keyset_condition(PAGE_KEYS['plaud_transcripts'])}"
+            params.extend(keyset_params(after))
+            offset = 0
+        
+        query = f"""
+        SELECT {TRANSCRIPT_META_COLUMNS}
+        FROM plaud_transcripts
+        {where}
+        ORDER BY create_time DESC, id DESC
+        LIMIT %s OFFSET %s
+        """
+        cursor.execute(query, params + [limit, offset])
+        
+        records = cursor.fetchall()
+        return records
+        
+    except Error as e:
+        logger.error(f"Error retrieving transcripts: {e}")
+        mark_database_unavailable()
+        return []
+    finally:
+        if connection.is_connected():
+            cursor.close()
+            connection.close()
+
+# Bulk export - rows are streamed from an unbuffered cursor, so memory stays flat
+EXPORT_FETCH_SIZE = int(os.environ.get('EXPORT_FETCH_SIZE', 1000))
+
+TRANSCRIPT_COLUMNS = ("id, transcript_id, title, body_codec, transcript_body, transcript_text, "
+                      "summary_text, create_time, processed_at")
+
+def export_transcript_row(row):
+    """Replace the stored (codec, blob, legacy text) triple with the plain body"""
+    return row[:3] + (decode_transcript_body(row[3], row[4], row[5]),) + row[6:]
+
+# Export name -> (table, columns, column used by from/to filters, row transform)
+# A row transform is (output column names, function applied to each row tuple)
+EXPORT_TABLES = {
+    'diet': ('diet', DIET_COLUMNS, 'date', None),
+    'tasks': ('tasks', TASKS_COLUMNS, 'created_at', None),
+    'crm': ('crm_records', CRM_COLUMNS, 'created_at', None),
+    'transcripts': ('plaud_transcripts', TRANSCRIPT_COLUMNS, 'create_time',
+                    (('id', 'transcript_id', 'title', 'transcript_text', 'summary_text',
+                      'create_time', 'processed_at'), export_transcript_row))
+}
+
+def stream_export_rows(connection, query, params, export_format, row_transform=None):
+    """Yield an export body chunk by chunk from an unbuffered cursor"""
+    cursor = connection.cursor()
+    finished = False
+    try:
+        # Slow clients read at their own pace - don't let MySQL drop the stream
+        cursor.execute("SET SESSION net_write_timeout = 600")
+        cursor.execute(query, params)
+        columns = cursor.column_names
+        if row_transform:
+            columns, convert_row = row_transform
+        
+        if export_format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+        
+        while True:
+            rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+            if not rows:
+                break
+            if row_transform:
+                rows = [convert_row(row) for row in rows]
+            if export_format == 'csv':
+                writer.writerows([json_value(value) for value in row] for row in rows)
+                chunk = buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            else:
+                chunk = b''.join(json_codec.dumps(dict(zip(columns, row))) + b'\n'
+                                 for row in rows)
+            yield chunk
+        finished = True
+    except Error as e:
+        # Headers are already sent, so the truncated body is the only signal left
+        logger.error(f"Error streaming export: {e}")
+    finally:
+        if finished:
+            cursor.close()
+            connection.close()
+        else:
+            # Unread rows would have to be drained before reuse - drop the connection
+            connection.discard()
+
+@app.route('/api/export/<table>', methods=['GET'])
+def export_table(table):
+    """Stream a whole table as NDJSON (default) or CSV, optionally filtered by date
+    
+    Example: /api/export/diet?format=csv&from=2025-01-01&to=2025-01-31
+    """
+    if table not in EXPORT_TABLES:
+        return jsonify({'error': f'Unknown table. Must be one of: {", ".join(EXPORT_TABLES)}'}), 404
+    
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({'error': 'format must be ndjson or csv'}), 400
+    
+    table_name, columns, date_column, row_transform = EXPORT_TABLES[table]
+    conditions = []
+    params = []
+    try:
+        if request.args.get('from'):
+            conditions.append(f"{date_column} >= %s")
+            params.append(datetime.strptime(request.args['from'], '%Y-%m-%d').date())
+        if request.args.get('to'):
+            # Inclusive end date, also for DATETIME/TIMESTAMP columns
+            conditions.append(f"{date_column} < %s")
+            params.append(datetime.strptime(request.args['to'], '%Y-%m-%d').date()
+                          + timedelta(days=1))
+    except ValueError:
+        return jsonify({'error': 'from/to must be dates in YYYY-MM-DD format'}), 400
+    
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"SELECT {columns} FROM {table_name} {where} ORDER BY id"
+    
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    extension = 'csv' if export_format == 'csv' else 'ndjson'
+    response = Response(
+        stream_export_rows(connection, query, params, export_format, row_transform),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={table}.{extension}'}
+    )
+    # No-op once the stream finished; frees the connection if it never started
+    response.call_on_close(connection.discard)
+    return response
+
+# Dashboard counters are kept in a small key/value table and adjusted in the same
+# transaction as every write, so /api/stats reads a handful of primary-key rows
+# instead of scanning diet, tasks and crm_records.
+STATS_RECONCILE_INTERVAL = int(os.environ.get('STATS_RECONCILE_INTERVAL', 3600))
+TOTAL_COUNTERS = ('total_contacts', 'total_diet_entries', 'total_tasks', 'pending_tasks')
+RECONCILED_AT_COUNTER = 'reconciled_at'
+
+COUNTERS_QUERY = """
+    SELECT counter_name, counter_value
+    FROM dashboard_counters
+    WHERE counter_name IN (%s, %s, %s, %s, %s, %s)
+"""
+
+RECOUNT_TOTALS_QUERY = """
+    SELECT
+        (SELECT COUNT(*) FROM crm_records) AS total_contacts,
+        (SELECT COUNT(*) FROM diet) AS total_diet_entries,
+        (SELECT COUNT(*) FROM tasks) AS total_tasks,
+        (SELECT COUNT(*) FROM tasks WHERE status = 'Pending') AS pending_tasks
+"""
+
+def calories_counter(day) -> str:
+    """Counter name holding the calorie total for one diet date"""
+    return f"calories:{day}"
+
+def parse_calories(value) -> int:
+    """Extract the numeric calories from values like '~450 cal'"""
+    return int(''.join(filter(str.isdigit, str(value or ''))) or 0)
+
+def counters_query_params():
+    """Parameters for COUNTERS_QUERY (totals, today's calories, last reconciliation)"""
+    today = datetime.now().strftime('%Y-%m-%d')
+    return TOTAL_COUNTERS + (calories_counter(today), RECONCILED_AT_COUNTER)
+
+COUNTER_UPSERT_QUERY = """
+INSERT INTO dashboard_counters (counter_name, counter_value)
+VALUES (%s, %s)
+ON DUPLICATE KEY UPDATE counter_value = counter_value + VALUES(counter_value)
+"""
+
+# Unique keys matched by the diet and CRM upserts
+DIET_KEY_COLUMNS = ('food', 'food_type', 'time_of_day', 'date')
+CRM_KEY_COLUMNS = ('contact_name', 'email')
+
+def counter_changes(deltas: Dict[str, int]):
+    """Non-zero deltas as COUNTER_UPSERT_QUERY rows
+    
+    Sorted so concurrent writers always lock counter rows in the same order.
+    """
+    return sorted((name, delta) for name, delta in deltas.items() if delta)
+
+def apply_counter_deltas(cursor, deltas: Dict[str, int]):
+    """Add deltas to dashboard counters inside the caller's transaction"""
+    changes = counter_changes(deltas)
+    if changes:
+        cursor.executemany(COUNTER_UPSERT_QUERY, changes)
+
+def existing_rows_query(table, key_columns, value_column, keys):
+    """(query, params) for find_existing_rows"""
+    where = " AND ".join(f"{column} = %s" for column in key_columns)
+    branch = f"SELECT %s AS idx, {value_column} AS value FROM {table} WHERE {where} FOR UPDATE"
+    query = " UNION ALL ".join(f"({branch})" for _ in keys)
+    params = []
+    for index, key in keys:
+        params.append(index)
+        params.extend(key)
+    return query, params
+
+def find_existing_rows(cursor, table, key_columns, value_column, keys):
+    """Return {index: value_column} for every key tuple that already exists in table
+    
+    Uses one UNION ALL query of unique-key lookups so MySQL applies its own
+    collation and type coercion when matching, exactly like the upsert will.
+    """
+    if not keys:
+        return {}
+    
+    cursor.execute(*existing_rows_query(table, key_columns, value_column, keys))
+    return {int(idx): value for idx, value in cursor.fetchall()}
+
+def diet_counter_keys(rows):
+    """(index, DIET_KEY_COLUMNS values) for each diet row (food, type, calories, time, date)"""
+    return [(i, (row[0], row[1], row[3], row[4])) for i, row in enumerate(rows)]
+
+def diet_counter_deltas(rows, existing) -> Dict[str, int]:
+    """Counter changes caused by upserting diet rows, given the stored calories by index"""
+    deltas = {}
+    seen = {}
+    for i, row in enumerate(rows):
+        key = (row[0], row[1], row[3], row[4])
+        calories = parse_calories(row[2])
+        if key in seen:
+            previous = seen[key]
+        elif i in existing:
+            previous = parse_calories(existing[i])
+        else:
+            previous = None
+            deltas['total_diet_entries'] = deltas.get('total_diet_entries', 0) + 1
+        seen[key] = calories
+        
+        counter = calories_counter(row[4])
+        deltas[counter] = deltas.get(counter, 0) + calories - (previous or 0)
+    return deltas
+
+def crm_counter_keys(rows):
+    """(index, CRM_KEY_COLUMNS values) for each CRM row (name, company, email, ...)"""
+    # The unique key only collides when both contact_name and email are set
+    return [(i, (row[0], row[2])) for i, row in enumerate(rows)
+            if row[0] is not None and row[2] is not None]
+
+def crm_counter_deltas(rows, existing) -> Dict[str, int]:
+    """Counter changes caused by upserting CRM rows, given the matched rows by index"""
+    new_contacts = 0
+    seen = set()
+    for i, row in enumerate(rows):
+        key = (row[0], row[2])
+        if i in existing or key in seen:
+            continue
+        if row[0] is not None and row[2] is not None:
+            seen.add(key)
+        new_contacts += 1
+    return {'total_contacts': new_contacts}
+
+def tasks_counter_deltas(rows) -> Dict[str, int]:
+    """Counter changes caused by inserting task rows (name, type, party, status, ...)"""
+    return {
+        'total_tasks': len(rows),
+        'pending_tasks': sum(1 for row in rows if row[3] == 'Pending')
+    }
+
+def reconcile_dashboard_counters(connection, force=False):
+    """Recount the counters from the real tables if the last reconciliation is stale
+    
+    Only one worker wins the claim on the reconciled_at row, so the full scans run
+    at most once per STATS_RECONCILE_INTERVAL across all gunicorn workers.
+    """
+    cursor = connection.cursor()
+    try:
+        # End any open read so the recount snapshot starts after the counter locks
+        connection.rollback()
+        now = int(time.time())
+        cursor.execute("""
+            INSERT IGNORE INTO dashboard_counters (counter_name, counter_value)
+            VALUES (%s, 0)
+        """, (RECONCILED_AT_COUNTER,))
         cursor.execute("""
-            SELECT COALESCE(SUM(estimated_calories), 0) as total_calories
+            UPDATE dashboard_counters SET counter_value = %s
+            WHERE counter_name = %s AND (counter_value <= %s OR %s)
+        """, (now, RECONCILED_AT_COUNTER, now - STATS_RECONCILE_INTERVAL, force))
+        if cursor.rowcount == 0:
+            connection.rollback()
+            return False
+        
+        # Lock existing counter rows so concurrent writers queue behind the recount
+        cursor.execute("SELECT counter_name FROM dashboard_counters FOR UPDATE")
+        cursor.fetchall()
+        
+        cursor.execute(RECOUNT_TOTALS_QUERY)
+        totals = dict(zip(TOTAL_COUNTERS, cursor.fetchone()))
+        
+        # Past dates can no longer become "today", so only current/future totals matter
+        today = datetime.now().strftime('%Y-%m-%d')
+        cursor.execute("""
+            SELECT date, COALESCE(SUM(estimated_calories), 0)
             FROM diet
-            WHERE date = CURDATE()
-        """)
-        calories_today = cursor.fetchone()['total_calories']
+            WHERE date >= %s
+            GROUP BY date
+        """, (today,))
+        calories = {calories_counter(day): total for day, total in cursor.fetchall()}
+        
+        calories.setdefault(calories_counter(today), 0)
         
-        # Pending tasks count
         cursor.execute("""
-            SELECT COUNT(*) as pending_tasks
-            FROM tasks
-            WHERE status = 'Pending'
-        """)
-        pending_tasks = cursor.fetchone()['pending_tasks']
-        
-        # Total contacts
-        cursor.execute("SELECT COUNT(*) as total_contacts FROM crm_records")
-        total_contacts = cursor.fetchone()['total_contacts']
-        
-        # Total diet entries
-        cursor.execute("SELECT COUNT(*) as total_entries FROM diet")
-        total_entries = cursor.fetchone()['total_entries']
-        
-        # Total tasks
-        cursor.execute("SELECT COUNT(*) as total_tasks FROM tasks")
-        total_tasks = cursor.fetchone()['total_tasks']
-        
-        return {
-            'calories_today': int(calories_today),
-            'pending_tasks': int(pending_tasks),
-            'total_contacts': int(total_contacts),
-            'total_diet_entries': int(total_entries),
-            'total_tasks': int(total_tasks)
-        }
+            DELETE FROM dashboard_counters
+            WHERE counter_name LIKE %s AND counter_name < %s
+        """, (calories_counter('%'), calories_counter(today)))
+        cursor.executemany("""
+            INSERT INTO dashboard_counters (counter_name, counter_value)
+            VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE counter_value = VALUES(counter_value)
+        """, sorted({**totals, **calories}.items()))
+        
+        connection.commit()
+        query_cache.invalidate('dashboard_counters')
+        logger.info(f"Reconciled dashboard counters: {totals}")
+        return True
+    except Error as e:
+        connection.rollback()
+        logger.error(f"Error reconciling dashboard counters: {e}")
+        return False
+    finally:
+        cursor.close()
+
+def counters_are_stale(counter_rows) -> bool:
+    """True when the counters were never or too long ago reconciled"""
+    for row in counter_rows:
+        if row['counter_name'] == RECONCILED_AT_COUNTER:
+            return time.time() - int(row['counter_value']) > STATS_RECONCILE_INTERVAL
+    return True
+
+def format_dashboard_stats(counter_rows):
+    """Convert counter rows into the dict the dashboard and /api/stats return"""
+    counters = {row['counter_name']: int(row['counter_value']) for row in counter_rows}
+    today = datetime.now().strftime('%Y-%m-%d')
+    return {
+        'calories_today': counters.get(calories_counter(today), 0),
+        'pending_tasks': counters.get('pending_tasks', 0),
+        'total_contacts': counters.get('total_contacts', 0),
+        'total_diet_entries': counters.get('total_diet_entries', 0),
+        'total_tasks': counters.get('total_tasks', 0)
+    }
+
+def read_dashboard_stats(connection, cursor, counter_rows):
+    """Format counter rows, reconciling and re-reading them once if they are stale"""
+    if counters_are_stale(counter_rows) and reconcile_dashboard_counters(connection):
+        cursor.execute(COUNTERS_QUERY, counters_query_params())
+        counter_rows = cursor.fetchall()
+    return format_dashboard_stats(counter_rows)
+
+@metrics.timed
+@query_cache.cached('dashboard_stats', tables=('diet', 'tasks', 'crm_records', 'dashboard_counters'),
+                    ttl=CACHE_TTLS['stats'])
+def get_dashboard_stats():
+    """Get statistics for dashboard from the maintained counters (O(1))"""
+    connection = get_db_connection()
+    if not connection:
+        return {}
+    
+    try:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(COUNTERS_QUERY, counters_query_params())
+        return read_dashboard_stats(connection, cursor, cursor.fetchall())
         
     except Error as e:
         logger.error(f"Error retrieving stats: {e}")
+        mark_database_unavailable()
         return {}
     finally:
         if connection.is_connected():
             cursor.close()
             connection.close()
 
+@metrics.timed
+@query_cache.cached('dashboard_data', tables=('diet', 'tasks', 'crm_records', 'dashboard_counters'),
+                    ttl=CACHE_TTLS['stats'])
+def get_dashboard_data(recent_limit=5):
+    """Load stats and recent diet/tasks/CRM rows in one round trip on one connection
+    
+    The four SELECTs are sent as a single multi-statement batch, so the dashboard
+    costs one pooled connection and one network round trip regardless of table size.
+    """
+    dashboard_data = {
+        'stats': {},
+        'recent_diet': [],
+        'recent_tasks': [],
+        'recent_contacts': []
+    }
+    
+    connection = get_db_connection()
+    if not connection:
+        return dashboard_data
+    
+    try:
+        cursor = connection.cursor(dictionary=True)
+        
+        batch = ";".join([
+            COUNTERS_QUERY,
+            f"SELECT {DIET_COLUMNS} FROM diet ORDER BY date DESC, time_of_day DESC LIMIT %s",
+            f"SELECT {TASKS_COLUMNS} FROM tasks ORDER BY created_at DESC LIMIT %s",
+            f"SELECT {CRM_COLUMNS} FROM crm_records ORDER BY created_at DESC LIMIT %s"
+        ])
+        
+        result_sets = []
+        params = counters_query_params() + (recent_limit, recent_limit, recent_limit)
+        for result in cursor.execute(batch, params, multi=True):
+            if result.with_rows:
+                result_sets.append(result.fetchall())
+        
+        counter_rows, diet_rows, tasks_rows, crm_rows = result_sets
+        dashboard_data['stats'] = read_dashboard_stats(connection, cursor, counter_rows)
+        dashboard_data['recent_diet'] = diet_rows
+        dashboard_data['recent_tasks'] = tasks_rows
+        dashboard_data['recent_contacts'] = crm_rows
+        return dashboard_data
+        
+    except Error as e:
+        logger.error(f"Error retrieving dashboard data: {e}")
+        mark_database_unavailable()
+        return dashboard_data
+    finally:
+        if connection.is_connected():
+            cursor.close()
+            connection.close()
+
 @app.route('/')
+@conditional_get('diet', 'tasks', 'crm_records', 'dashboard_counters')
 def dashboard():
     """Web dashboard homepage"""
     from flask import render_template
-    stats = get_dashboard_stats()
-    recent_diet = get_diet_records(limit=5)
-    recent_tasks = get_tasks_records(limit=5)
-    recent_contacts = get_crm_records(limit=5)
+    dashboard_data = get_dashboard_data(recent_limit=5)
     
-    return render_template('dashboard.html', 
-                         stats=stats,
-                         recent_diet=recent_diet,
-                         recent_tasks=recent_tasks,
-                         recent_contacts=recent_contacts)
+    return render_template('dashboard.html', **dashboard_data)
 
 @app.route('/api')
 def api_home():
@@ -845,18 +2551,24 @@ def api_home():
             '/': 'Web Dashboard (GET)',
             '/api': 'API Documentation (GET)',
             '/api/diet': 'Diet data (GET/POST)',
-            '/api/tasks': 'Tasks data (GET/POST)',
+            '/api/tasks': 'Tasks data (GET/POST), bulk status/priority edits (PATCH)',
             '/api/crm': 'CRM data (GET/POST)',
             '/api/stats': 'Dashboard statistics (GET)',
-            '/health': 'Health check (GET)'
+            '/api/transcripts': 'Transcript metadata, paginated (GET)',
+            '/api/transcripts/<transcript_id>': 'One transcript with its body (GET)',
+            '/api/transcripts/search': 'Ranked transcript search with snippets (GET ?q=)',
+            '/api/export/<table>': 'Stream diet/tasks/crm/transcripts as NDJSON or CSV (GET)',
+            '/api/ingest/<job_id>': 'Status of a queued webhook payload (GET, INGEST_MODE=async)',
+            '/health': 'Health check with connection pool stats (GET)',
+            '/metrics': 'Prometheus request/DB metrics for this worker (GET)'
         },
         'database': 'MySQL - slack database',
         'status': 'running'
     }), 200
 
 if __name__ == '__main__':
-    # Initialize database tables
-    create_tables()
+    # Verify (and if needed migrate) the database schema
+    check_schema()
     
     # Run the Flask app
     port = int(os.environ.get('PORT', 5000))
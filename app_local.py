@@ -1,9 +1,10 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, url_for
 import json
 import logging
 from datetime import datetime
 import os
 from typing import List, Dict, Any
+from urllib.parse import urlencode
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -11,6 +12,9 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+# Plain /static URLs - the fingerprinted, precompressed assets are only served by app.py
+app.jinja_env.globals['asset_url'] = lambda path: url_for('static', filename=path)
+
 # Mock data for local testing
 MOCK_STATS = {
     'calories_today': 1850,
@@ -59,11 +63,55 @@ def diet_page():
     date_filter = request.args.get('date')
     return render_template('diet.html', records=MOCK_DIET, date_filter=date_filter)
 
+TASK_STATUSES = ['Pending', 'In Progress', 'Completed', 'Cancelled']
+TASK_SORTS = ('created_at', 'priority', 'best_due_date', 'task_name', 'task_type', 'status',
+              'responsible_party')
+TASKS_PAGE_SIZE = 50
+
+def task_list_filters(args) -> Dict[str, str]:
+    """Filter and sort args as app.py's task_list_query returns them (defaults left out)"""
+    filters = {name: args[name] for name in ('status', 'task_type', 'responsible_party', 'due_from', 'due_to')
+               if args.get(name)}
+    sort = args.get('sort') if args.get('sort') in TASK_SORTS else 'created_at'
+    order = args.get('order') or ('desc' if sort == 'created_at' else 'asc')
+    if sort != 'created_at' or order != 'desc':
+        filters['sort'] = sort
+        filters['order'] = order
+    return filters
+
+def filter_mock_tasks(filters) -> List[Dict[str, Any]]:
+    """Mock tasks matching the filters, sorted like get_tasks_records (NULLs last)"""
+    tasks = [task for task in MOCK_TASKS
+             if all(task.get(name) == filters[name] for name in ('status', 'task_type', 'responsible_party')
+                    if name in filters)
+             and (not filters.get('due_from') or (task['best_due_date'] or '') >= filters['due_from'])
+             and (not filters.get('due_to') or (task['best_due_date'] or '9999') <= filters['due_to'])]
+    sort = filters.get('sort', 'created_at')
+    descending = filters.get('order', 'desc') == 'desc'
+    # status is an ENUM in MySQL, ordered as declared rather than alphabetically
+    def sort_key(task):
+        return TASK_STATUSES.index(task['status']) if sort == 'status' else task[sort]
+    present = sorted((task for task in tasks if task.get(sort) is not None),
+                     key=sort_key, reverse=descending)
+    return present + [task for task in tasks if task.get(sort) is None]
+
+def mock_tasks_page(filters, limit, offset=0):
+    """One page of filtered tasks and its cursor (the next offset - mock data is never paged by key)"""
+    tasks = filter_mock_tasks(filters)
+    page = tasks[offset:offset + limit]
+    next_cursor = str(offset + limit) if offset + limit < len(tasks) else None
+    return page, next_cursor
+
 @app.route('/tasks')
 def tasks_page():
     """Tasks management page"""
-    status_filter = request.args.get('status')
-    return render_template('tasks.html', tasks=MOCK_TASKS, status_filter=status_filter)
+    filters = task_list_filters(request.args)
+    tasks, next_cursor = mock_tasks_page(filters, TASKS_PAGE_SIZE)
+    responsible_parties = sorted({task['responsible_party'] for task in MOCK_TASKS if task['responsible_party']})
+    return render_template('tasks.html', tasks=tasks, filters=filters,
+                           list_query=urlencode(filters), task_statuses=TASK_STATUSES,
+                           responsible_parties=responsible_parties,
+                           page_size=TASKS_PAGE_SIZE, next_cursor=next_cursor)
 
 @app.route('/crm')
 def crm_page():
@@ -85,6 +133,61 @@ def health_check():
         'database': 'mock_data'
     }), 200
 
+@app.route('/api/tasks', methods=['GET'])
+def get_tasks():
+    """Filtered page of mock tasks (the tasks page's filters, sort and "Load more")"""
+    try:
+        limit = int(request.args.get('limit', TASKS_PAGE_SIZE))
+        offset = int(request.args.get('cursor') or 0)
+    except ValueError:
+        return jsonify({'error': 'limit and cursor must be integers'}), 400
+    tasks, next_cursor = mock_tasks_page(task_list_filters(request.args), limit, offset)
+    return jsonify({
+        'status': 'success',
+        'count': len(tasks),
+        'data': tasks,
+        'next_cursor': next_cursor
+    }), 200
+
+@app.route('/api/tasks', methods=['PATCH'])
+def update_tasks():
+    """Apply a batch of status/priority edits to the mock tasks
+
+    Example: {"updates": [{"id": 4, "status": "Completed"}, {"id": 5, "priority": 2}]}
+    """
+    data = request.get_json(silent=True)
+    updates = data.get('updates') if isinstance(data, dict) else data
+    if not isinstance(updates, list) or not updates:
+        return jsonify({'error': 'Expected a non-empty list of task updates'}), 400
+
+    for index, update in enumerate(updates):
+        if not isinstance(update, dict) or not isinstance(update.get('id'), int):
+            return jsonify({'error': f'Update {index} needs an integer id'}), 400
+        if 'status' in update and update['status'] not in TASK_STATUSES:
+            return jsonify({'error': f'Update {index}: invalid status. Must be one of: {", ".join(TASK_STATUSES)}'}), 400
+        priority = update.get('priority')
+        if priority is not None and (isinstance(priority, bool) or not isinstance(priority, int)
+                                     or not 1 <= priority <= 99):
+            return jsonify({'error': f'Update {index}: priority must be between 1 and 99 or null'}), 400
+
+    tasks = {task['id']: task for task in MOCK_TASKS}
+    updated = set()
+    not_found = set()
+    for update in updates:
+        task = tasks.get(update['id'])
+        if task is None:
+            not_found.add(update['id'])
+            continue
+        task.update({field: update[field] for field in ('status', 'priority') if field in update})
+        updated.add(update['id'])
+
+    logger.info(f"Updated {len(updated)} mock tasks in one batch")
+    return jsonify({
+        'status': 'success',
+        'updated': len(updated),
+        'not_found': sorted(not_found)
+    }), 200
+
 @app.route('/api/tasks/<int:task_id>/status', methods=['PATCH'])
 def update_task_status(task_id):
     """Update task status (for checkbox toggle)"""
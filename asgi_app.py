@@ -0,0 +1,412 @@
+"""Optional async (ASGI) deployment of the webhook routes.
+
+Serves /api/plaud, /api/diet, /api/tasks, /api/crm, /api/stats and
+PATCH /api/tasks (bulk) and /api/tasks/<id>/status with Starlette and an aiomysql connection pool. A request
+waiting on MySQL only holds a coroutine, not a worker thread, so one process can
+keep hundreds of Zapier webhooks in flight during a burst.
+
+Payload parsing, SQL statements, counter bookkeeping and idempotency keys are
+imported from app.py, so both servers write identical rows and replay each other's
+saved responses to retried deliveries. The dashboard pages, exports and search stay
+on the WSGI app. GET list reads reuse its cached helpers from a worker thread.
+
+    pip install -r requirements-async.txt
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5000 --workers 2
+"""
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+
+import aiomysql
+from pymysql.err import MySQLError
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from app import (
+    COUNTERS_QUERY, COUNTER_UPSERT_QUERY, CRM_KEY_COLUMNS, CRM_UPSERT_QUERY, DB_CONFIG,
+    DB_POOL_CONFIG, DIET_KEY_COLUMNS, DIET_UPSERT_QUERY, IDEMPOTENCY_CONFIG, TASKS_INSERT_QUERY,
+    TASK_STATUSES, TRANSCRIPT_HASH_QUERY, TRANSCRIPT_UPSERT_QUERY, counter_changes,
+    counters_are_stale, counters_query_params, crm_counter_deltas, crm_counter_keys, crm_rows,
+    diet_counter_deltas, diet_counter_keys, diet_rows, existing_rows_query,
+    format_dashboard_stats, get_crm_records, get_dashboard_stats, get_diet_records,
+    get_tasks_records, idempotency, index_transcript, json_codec, locked_tasks_query,
+    page_response, parse_crm_payload, parse_diet_payload, parse_page_args, parse_plaud_payload,
+    parse_task_list_args, parse_task_page_args, parse_task_updates, parse_tasks_payload,
+    pending_tasks_delta, query_cache, task_updates_query, tasks_counter_deltas, tasks_rows,
+    transcript_content_hash, transcript_row
+)
+from idempotency import idempotency_key
+from payload_schema import PayloadError
+
+logger = logging.getLogger(__name__)
+
+# Async pool - coroutines are cheap, so it can be much larger than the WSGI pool
+# (MySQL max_connections still bounds it across processes)
+ASYNC_DB_POOL_CONFIG = {
+    'minsize': int(os.environ.get('ASYNC_DB_POOL_MIN', 5)),
+    'maxsize': int(os.environ.get('ASYNC_DB_POOL_MAX', 50)),
+    'pool_recycle': int(os.environ.get('ASYNC_DB_POOL_RECYCLE', 300))
+}
+
+db_pool = None
+
+class JSONResponseBody(JSONResponse):
+    """JSONResponse encoded by the WSGI app's json_codec, so both servers send the same JSON"""
+
+    def render(self, content):
+        return json_codec.dumps(content)
+
+def jsonify(body, status_code=200):
+    return JSONResponseBody(body, status_code=status_code)
+
+# Idempotency key -> Event set when the first delivery in this process finishes
+inflight_deliveries = {}
+
+async def idempotent(endpoint, request, data, handler):
+    """Replay the saved response for a repeated delivery, or run handler() and save its success
+
+    Same keys and idempotency_keys table as the WSGI app's @idempotent, so a retry
+    is recognized whichever server got the first delivery.
+    """
+    if not IDEMPOTENCY_CONFIG['enabled']:
+        return await handler()
+
+    key, source = idempotency_key(endpoint, request.headers.get('Idempotency-Key'), data)
+    ttl = idempotency.ttl_for(source)
+    while key in inflight_deliveries:
+        try:
+            await asyncio.wait_for(inflight_deliveries[key].wait(), idempotency.wait_timeout)
+        except asyncio.TimeoutError:
+            break
+    event = inflight_deliveries[key] = asyncio.Event()
+    try:
+        stored = await asyncio.to_thread(idempotency.lookup, key, ttl)
+        if stored is not None:
+            status_code, body = stored
+            logger.info("Replaying saved %s response for a repeated delivery", endpoint)
+            return Response(body, status_code=status_code, media_type='application/json',
+                            headers={'Idempotent-Replayed': 'true'})
+
+        response = await handler()
+        # Only successes are saved - a failed delivery must be retried for real
+        if response.status_code in (200, 202):
+            await asyncio.to_thread(idempotency.save, key, endpoint, response.status_code,
+                                    response.body.decode('utf-8'), ttl)
+        return response
+    finally:
+        if inflight_deliveries.get(key) is event:
+            del inflight_deliveries[key]
+        event.set()
+
+async def read_json(request):
+    """Request body as JSON, or None if it is missing or malformed"""
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+@asynccontextmanager
+async def lifespan(app):
+    """Open the async MySQL pool for the lifetime of the server process"""
+    global db_pool
+    db_pool = await aiomysql.create_pool(
+        host=DB_CONFIG['host'],
+        port=DB_CONFIG['port'],
+        db=DB_CONFIG['database'],
+        user=DB_CONFIG['user'],
+        password=DB_CONFIG['password'],
+        charset=DB_CONFIG['charset'],
+        init_command=f"SET NAMES {DB_CONFIG['charset']} COLLATE {DB_CONFIG['collation']}",
+        autocommit=False,
+        **ASYNC_DB_POOL_CONFIG
+    )
+    logger.info(f"Opened async MySQL pool ({ASYNC_DB_POOL_CONFIG['maxsize']} connections max)")
+    try:
+        yield
+    finally:
+        db_pool.close()
+        await db_pool.wait_closed()
+
+@asynccontextmanager
+async def transaction(cursor_class=aiomysql.Cursor):
+    """Cursor on a pooled connection; commits on success and rolls back on error"""
+    connection = await asyncio.wait_for(db_pool.acquire(), DB_POOL_CONFIG['timeout'])
+    try:
+        async with connection.cursor(cursor_class) as cursor:
+            try:
+                yield cursor
+                await connection.commit()
+            except BaseException:
+                await connection.rollback()
+                raise
+    finally:
+        db_pool.release(connection)
+
+async def find_existing_rows(cursor, table, key_columns, value_column, keys):
+    if not keys:
+        return {}
+    await cursor.execute(*existing_rows_query(table, key_columns, value_column, keys))
+    return {int(idx): value for idx, value in await cursor.fetchall()}
+
+async def apply_counter_deltas(cursor, deltas):
+    changes = counter_changes(deltas)
+    if changes:
+        await cursor.executemany(COUNTER_UPSERT_QUERY, changes)
+
+async def apply_task_updates(cursor, updates):
+    task_ids = sorted(updates)
+    await cursor.execute(*locked_tasks_query(task_ids))
+    old_statuses = {task_id: status for task_id, status in await cursor.fetchall()}
+    found = [task_id for task_id in task_ids if task_id in old_statuses]
+    if found:
+        await cursor.execute(*task_updates_query(updates, found))
+        await apply_counter_deltas(cursor, {'pending_tasks': pending_tasks_delta(updates, old_statuses)})
+    return [task_id for task_id in task_ids if task_id not in old_statuses]
+
+async def write_diet_records(cursor, diet_records):
+    rows = diet_rows(diet_records)
+    existing = await find_existing_rows(cursor, 'diet', DIET_KEY_COLUMNS, 'estimated_calories',
+                                        diet_counter_keys(rows))
+    counter_deltas = diet_counter_deltas(rows, existing)
+    await cursor.executemany(DIET_UPSERT_QUERY, rows)
+    await apply_counter_deltas(cursor, counter_deltas)
+
+async def write_tasks_records(cursor, tasks_records):
+    rows = tasks_rows(tasks_records)
+    await cursor.executemany(TASKS_INSERT_QUERY, rows)
+    await apply_counter_deltas(cursor, tasks_counter_deltas(rows))
+
+async def write_crm_records(cursor, crm_records):
+    rows = crm_rows(crm_records)
+    existing = await find_existing_rows(cursor, 'crm_records', CRM_KEY_COLUMNS, 'id',
+                                        crm_counter_keys(rows))
+    counter_deltas = crm_counter_deltas(rows, existing)
+    await cursor.executemany(CRM_UPSERT_QUERY, rows)
+    await apply_counter_deltas(cursor, counter_deltas)
+
+async def write_transcript_record(cursor, transcript_data):
+    """Upsert the transcript, returning False if an identical copy is already stored"""
+    content_hash = transcript_content_hash(transcript_data)
+    await cursor.execute(TRANSCRIPT_HASH_QUERY, (transcript_data.get('id', ''),))
+    row = await cursor.fetchone()
+    if row is not None and row[0] == content_hash:
+        return False
+    # Compression is CPU-bound - keep it off the event loop
+    params = await asyncio.to_thread(transcript_row, transcript_data, content_hash)
+    await cursor.execute(TRANSCRIPT_UPSERT_QUERY, params)
+    return True
+
+# Payload section -> (table invalidated in the cache, writer)
+PLAUD_SECTIONS = {
+    'diet_data': ('diet', write_diet_records),
+    'tasks_data': ('tasks', write_tasks_records),
+    'crm_data': ('crm_records', write_crm_records)
+}
+
+async def handle_plaud_webhook(request):
+    data = await read_json(request)
+    if not data:
+        return jsonify({'error': 'No JSON data received'}, 400)
+    return await idempotent('plaud', request, data, lambda: store_plaud_payload(data))
+
+async def store_plaud_payload(data):
+    """Store the transcript and every extracted section in one transaction"""
+    try:
+        data = parse_plaud_payload(data)
+    except PayloadError as e:
+        return jsonify({'error': str(e)}, 400)
+
+    try:
+        async with transaction() as cursor:
+            transcript_changed = await write_transcript_record(cursor, data)
+            processed = {'transcript': int(transcript_changed)}
+            for section, (table, writer) in PLAUD_SECTIONS.items():
+                records = data.get(section) or []
+                if records:
+                    await writer(cursor, records)
+                processed[section.replace('_data', '')] = len(records)
+    except (MySQLError, asyncio.TimeoutError) as e:
+        logger.error(f"Error storing transcript payload (rolled back): {e}")
+        return jsonify({'error': 'Failed to process transcript data - no changes were saved'}, 500)
+
+    if transcript_changed:
+        await asyncio.to_thread(index_transcript, data)
+        query_cache.invalidate('plaud_transcripts')
+    for section, (table, writer) in PLAUD_SECTIONS.items():
+        if data.get(section):
+            query_cache.invalidate(table)
+
+    return jsonify({
+        'status': 'success',
+        'message': 'Data processed successfully',
+        'processed': processed
+    })
+
+async def store_records(kind, table, writer, parse, data):
+    """Parse and write one webhook's records and build the same response as the WSGI route"""
+    try:
+        records = parse(data)
+    except PayloadError as e:
+        return jsonify({'error': str(e)}, 400)
+
+    try:
+        async with transaction() as cursor:
+            await writer(cursor, records)
+    except (MySQLError, asyncio.TimeoutError) as e:
+        logger.error(f"Error inserting {kind} data: {e}")
+        return jsonify({'error': f'Failed to process {kind} data', 'data': records}, 500)
+
+    query_cache.invalidate(table)
+    return jsonify({
+        'status': 'success',
+        'message': f'Processed {len(records)} {kind} records',
+        'count': len(records),
+        'data': records
+    })
+
+async def handle_diet_webhook(request):
+    if request.method == 'GET':
+        try:
+            limit, offset, after = parse_page_args('diet', request.query_params)
+        except ValueError as e:
+            return jsonify({'error': str(e)}, 400)
+        records = await asyncio.to_thread(get_diet_records,
+                                          date_filter=request.query_params.get('date'),
+                                          limit=limit, offset=offset, after=after)
+        return jsonify(page_response('diet', records, limit))
+
+    data = await read_json(request)
+    if not data:
+        return jsonify({'error': 'No JSON data received'}, 400)
+    return await idempotent('diet', request, data, lambda: store_records(
+        'diet', 'diet', write_diet_records, parse_diet_payload, data))
+
+async def handle_tasks_webhook(request):
+    if request.method == 'GET':
+        try:
+            task_query = parse_task_list_args(request.query_params)
+            page_key, limit, offset, after = parse_task_page_args(task_query, request.query_params)
+        except ValueError as e:
+            return jsonify({'error': str(e)}, 400)
+        records = await asyncio.to_thread(get_tasks_records, limit=limit, offset=offset,
+                                          after=after, **task_query)
+        return jsonify(page_response(page_key, records, limit))
+
+    data = await read_json(request)
+    if not data:
+        return jsonify({'error': 'No JSON data received'}, 400)
+    return await idempotent('tasks', request, data, lambda: store_records(
+        'task', 'tasks', write_tasks_records, parse_tasks_payload, data))
+
+async def handle_crm_webhook(request):
+    if request.method == 'GET':
+        search_query = request.query_params.get('search')
+        try:
+            limit, offset, after = parse_page_args('crm_records', request.query_params)
+        except ValueError as e:
+            return jsonify({'error': str(e)}, 400)
+        if search_query and after:
+            return jsonify({'error': 'cursor paging is not supported with search - use offset'}, 400)
+        records = await asyncio.to_thread(get_crm_records, search_query=search_query,
+                                          limit=limit, offset=offset, after=after)
+        body = page_response('crm_records', records, limit)
+        if search_query:
+            body['next_cursor'] = None
+        return jsonify(body)
+
+    data = await read_json(request)
+    if not data:
+        return jsonify({'error': 'No JSON data received'}, 400)
+    return await idempotent('crm', request, data, lambda: store_records(
+        'CRM', 'crm_records', write_crm_records, parse_crm_payload, data))
+
+async def update_tasks(request):
+    """Apply a batch of status/priority edits in one transaction"""
+    try:
+        updates = parse_task_updates(await read_json(request))
+    except ValueError as e:
+        return jsonify({'error': str(e)}, 400)
+
+    try:
+        async with transaction() as cursor:
+            not_found = await apply_task_updates(cursor, updates)
+    except (MySQLError, asyncio.TimeoutError) as e:
+        logger.error(f"Error updating tasks (rolled back): {e}")
+        return jsonify({'error': 'Failed to update tasks - no changes were saved'}, 500)
+
+    if len(not_found) < len(updates):
+        query_cache.invalidate('tasks')
+    return jsonify({
+        'status': 'success',
+        'updated': len(updates) - len(not_found),
+        'not_found': not_found
+    })
+
+async def update_task_status(request):
+    """Update task status (for checkbox toggle)"""
+    task_id = request.path_params['task_id']
+    data = await read_json(request)
+    if not data or 'status' not in data:
+        return jsonify({'error': 'Status is required'}, 400)
+
+    new_status = data['status']
+    if new_status not in TASK_STATUSES:
+        return jsonify({'error': f'Invalid status. Must be one of: {", ".join(TASK_STATUSES)}'}, 400)
+
+    try:
+        async with transaction() as cursor:
+            not_found = await apply_task_updates(cursor, {task_id: {'status': new_status}})
+    except (MySQLError, asyncio.TimeoutError) as e:
+        logger.error(f"Error updating task status: {e}")
+        return jsonify({'error': 'Failed to update task status'}, 500)
+    if not_found:
+        return jsonify({'error': 'Task not found'}, 404)
+
+    query_cache.invalidate('tasks')
+    return jsonify({
+        'status': 'success',
+        'message': f'Task status updated to {new_status}',
+        'task_id': task_id,
+        'new_status': new_status
+    })
+
+async def get_stats(request):
+    """Dashboard statistics from the maintained counters"""
+    try:
+        async with transaction(aiomysql.DictCursor) as cursor:
+            await cursor.execute(COUNTERS_QUERY, counters_query_params())
+            counter_rows = await cursor.fetchall()
+    except (MySQLError, asyncio.TimeoutError) as e:
+        logger.error(f"Error retrieving stats: {e}")
+        counter_rows = []
+
+    if counters_are_stale(counter_rows):
+        # Reconciliation is rare (hourly) and lock-heavy - let the sync path do it
+        stats = await asyncio.to_thread(get_dashboard_stats)
+    else:
+        stats = format_dashboard_stats(counter_rows)
+    return jsonify({'status': 'success', 'data': stats})
+
+async def health_check(request):
+    return jsonify({
+        'status': 'healthy',
+        'server': 'asgi',
+        'db_pool': {
+            'size': db_pool.size if db_pool else 0,
+            'free': db_pool.freesize if db_pool else 0,
+            'max': ASYNC_DB_POOL_CONFIG['maxsize']
+        }
+    })
+
+app = Starlette(routes=[
+    Route('/api/plaud', handle_plaud_webhook, methods=['POST']),
+    Route('/api/diet', handle_diet_webhook, methods=['GET', 'POST']),
+    Route('/api/tasks', handle_tasks_webhook, methods=['GET', 'POST']),
+    Route('/api/tasks', update_tasks, methods=['PATCH']),
+    Route('/api/tasks/{task_id:int}/status', update_task_status, methods=['PATCH']),
+    Route('/api/crm', handle_crm_webhook, methods=['GET', 'POST']),
+    Route('/api/stats', get_stats, methods=['GET']),
+    Route('/health', health_check, methods=['GET'])
+], lifespan=lifespan)
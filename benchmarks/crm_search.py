@@ -0,0 +1,161 @@
+"""Compare the LIKE and FULLTEXT CRM search paths on a scratch table.
+
+Creates a scratch database on a local MySQL/MariaDB server, seeds a
+bench_crm_records table in it (same columns and indexes as crm_records), times both
+query shapes used by get_crm_records and drops the database again. The server in
+app.py's DB_CONFIG is refused unless --allow-app-server is given.
+
+Usage:
+    python benchmarks/crm_search.py --host 127.0.0.1 --user root --rows 50000 --repeat 20
+"""
+import argparse
+import os
+import random
+import statistics
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector  # noqa: E402
+
+from app import DB_CONFIG, fulltext_boolean_query  # noqa: E402
+
+FIRST_NAMES = ['Alice', 'Bob', 'Carol', 'David', 'Emma', 'Frank', 'Grace', 'Henry',
+               'Isabel', 'Jack', 'Karen', 'Liam', 'Maria', 'Noah', 'Olivia', 'Peter']
+LAST_NAMES = ['Johnson', 'Smith', 'White', 'Brown', 'Davis', 'Miller', 'Wilson',
+              'Moore', 'Taylor', 'Anderson', 'Thomas', 'Jackson', 'Martin', 'Lee']
+COMPANY_WORDS = ['Tech', 'Design', 'Consulting', 'Marketing', 'Global', 'Digital',
+                 'Studio', 'Labs', 'Partners', 'Systems', 'Health', 'Capital']
+
+SEARCH_TERMS = ['alice', 'smith', 'techcorp', 'Maria Wilson', 'digital labs', 'zzznomatch']
+
+def random_contact(index):
+    first = random.choice(FIRST_NAMES)
+    last = random.choice(LAST_NAMES)
+    company = ''.join(random.sample(COMPANY_WORDS, 2))
+    suffix = ''.join(random.choices(string.ascii_lowercase, k=4))
+    return (
+        f"{first} {last} {suffix}",
+        company,
+        f"{first.lower()}.{last.lower()}{index}@{company.lower()}.com",
+        f"555-{index % 10000:04d}",
+        'Seeded by benchmarks/crm_search.py',
+        random.choice(['Lead', 'Prospect', 'Customer', 'Lost'])
+    )
+
+def seed(cursor, rows):
+    cursor.execute("DROP TABLE IF EXISTS bench_crm_records")
+    cursor.execute("""
+        CREATE TABLE bench_crm_records (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            contact_name VARCHAR(255),
+            company VARCHAR(255),
+            email VARCHAR(255),
+            phone VARCHAR(50),
+            notes TEXT,
+            status ENUM('Lead', 'Prospect', 'Customer', 'Lost') DEFAULT 'Lead',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            UNIQUE KEY unique_contact (contact_name, email),
+            FULLTEXT KEY ft_contact_search (contact_name, company, email)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    batch = []
+    for index in range(rows):
+        batch.append(random_contact(index))
+        if len(batch) == 1000:
+            insert(cursor, batch)
+            batch = []
+    if batch:
+        insert(cursor, batch)
+
+def insert(cursor, batch):
+    cursor.executemany("""
+        INSERT IGNORE INTO bench_crm_records (contact_name, company, email, phone, notes, status)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, batch)
+
+def time_query(cursor, query, params, repeat):
+    timings = []
+    matches = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor.execute(query, params)
+        matches = len(cursor.fetchall())
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'p50': statistics.median(timings),
+        'p95': timings[max(0, int(len(timings) * 0.95) - 1)],
+        'matches': matches
+    }
+
+def like_search(cursor, term, repeat):
+    pattern = f"%{term}%"
+    return time_query(cursor, """
+        SELECT id FROM bench_crm_records
+        WHERE contact_name LIKE %s OR company LIKE %s OR email LIKE %s
+        ORDER BY created_at DESC, id DESC
+        LIMIT 50
+    """, (pattern, pattern, pattern), repeat)
+
+def fulltext_search(cursor, term, repeat):
+    boolean_query = fulltext_boolean_query(term)
+    return time_query(cursor, """
+        SELECT id, MATCH(contact_name, company, email) AGAINST (%s IN BOOLEAN MODE) AS relevance
+        FROM bench_crm_records
+        WHERE MATCH(contact_name, company, email) AGAINST (%s IN BOOLEAN MODE)
+        ORDER BY relevance DESC, id DESC
+        LIMIT 50
+    """, (boolean_query, boolean_query), repeat)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3306)
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--database', default='plaud_crm_search', help='scratch database')
+    parser.add_argument('--rows', type=int, default=50000, help='contacts to seed')
+    parser.add_argument('--repeat', type=int, default=20, help='runs per query')
+    parser.add_argument('--keep', action='store_true', help='keep the scratch database')
+    parser.add_argument('--allow-app-server', action='store_true',
+                        help="run even if --host/--port is the server in app.py's DB_CONFIG")
+    args = parser.parse_args()
+
+    if (args.host, args.port) == (DB_CONFIG['host'], DB_CONFIG['port']) and not args.allow_app_server:
+        sys.exit(f"{args.host}:{args.port} is the server app.py writes to - point --host at a "
+                 f"scratch server (or pass --allow-app-server)")
+    if args.database == DB_CONFIG['database']:
+        sys.exit(f"Refusing to use the app's database {args.database!r} as the scratch database")
+
+    server = {'host': args.host, 'port': args.port, 'user': args.user, 'password': args.password}
+    connection = mysql.connector.connect(**server)
+    cursor = connection.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS `{args.database}`")
+    cursor.execute(f"CREATE DATABASE `{args.database}` CHARACTER SET utf8mb4 "
+                   f"COLLATE utf8mb4_unicode_ci")
+    cursor.execute(f"USE `{args.database}`")
+    try:
+        print(f"Seeding {args.rows} contacts...")
+        seed(cursor, args.rows)
+        connection.commit()
+
+        print(f"\n{'term':<16} {'LIKE p50':>10} {'LIKE p95':>10} {'FT p50':>10} {'FT p95':>10}"
+              f" {'LIKE hits':>10} {'FT hits':>8}")
+        for term in SEARCH_TERMS:
+            like = like_search(cursor, term, args.repeat)
+            fulltext = fulltext_search(cursor, term, args.repeat)
+            print(f"{term:<16} {like['p50']:>8.2f}ms {like['p95']:>8.2f}ms "
+                  f"{fulltext['p50']:>8.2f}ms {fulltext['p95']:>8.2f}ms "
+                  f"{like['matches']:>10} {fulltext['matches']:>8}")
+    finally:
+        if not args.keep:
+            cursor.execute(f"DROP DATABASE IF EXISTS `{args.database}`")
+        cursor.close()
+        connection.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""Cost of serializing large list responses.
+
+Builds 10k-row pages shaped like cursor(dictionary=True) results - DATE as date,
+TIME as timedelta, TIMESTAMP as datetime, DECIMAL as Decimal - and times jsonify()
+with Flask's stock JSON provider (the path the routes used before json_codec)
+against app.py's provider on each json_codec backend. The stock provider cannot
+encode TIME columns, so the diet table has no "before" column. No database is needed.
+
+Usage:
+    python benchmarks/json_responses.py --rows 10000 --repeat 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify  # noqa: E402
+
+import app  # noqa: E402
+from json_codec import JSONCodec, orjson  # noqa: E402
+
+FOODS = ['Oatmeal', 'Chicken salad', 'Latte', 'Apple', 'Pasta', 'Protein bar', 'Green tea']
+STATUSES = ['Pending', 'In Progress', 'Completed', 'Cancelled']
+
+def created_at(index):
+    return datetime(2025, 1, 1, 8, 0, 0) + timedelta(minutes=index * 7)
+
+def diet_row(index):
+    return {
+        'id': index,
+        'food': f"{random.choice(FOODS)} {index}",
+        'food_type': random.choice(['Meal', 'Snack', 'Drink']),
+        'estimated_calories': random.randint(50, 900),
+        'time_of_day': timedelta(hours=random.randint(6, 22), minutes=random.choice([0, 15, 30, 45])),
+        'date': date(2025, 1, 1) + timedelta(days=index % 365),
+        'created_at': created_at(index)
+    }
+
+def task_row(index):
+    return {
+        'id': index,
+        'task_name': f"Follow up on item {index}",
+        'task_type': 'Follow-up',
+        'responsible_party': random.choice([None, 'Me', 'Alice', 'Bob']),
+        'status': random.choice(STATUSES),
+        'priority': random.choice([None, 1, 2, 3]),
+        'best_start_date': date(2025, 1, 1) + timedelta(days=index % 90),
+        'best_due_date': random.choice([None, date(2025, 3, 1) + timedelta(days=index % 60)]),
+        'time_interval': None,
+        'notes': 'Discussed in the weekly sync',
+        'dependency': None,
+        'created_at': created_at(index)
+    }
+
+def crm_row(index):
+    return {
+        'id': index,
+        'contact_name': f"Contact {index}",
+        'company': f"Company {index % 300}",
+        'email': f"contact{index}@example.com",
+        'phone': f"555-{index % 10000:04d}",
+        'notes': '',
+        'status': random.choice(['Lead', 'Prospect', 'Customer', 'Lost']),
+        'created_at': created_at(index),
+        'updated_at': created_at(index + 30)
+    }
+
+def stats_row(index):
+    # Aggregates come back from SUM()/AVG() as DECIMAL
+    return {
+        'date': date(2025, 1, 1) + timedelta(days=index),
+        'total_calories': Decimal(random.randint(1200, 3200)),
+        'avg_calories': Decimal(random.randint(20000, 90000)) / 100
+    }
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def jsonify_seconds(flask_app, body, repeat):
+    """Best time for jsonify(body), or None if the provider cannot encode it"""
+    with flask_app.app_context():
+        try:
+            jsonify(body)
+        except TypeError:
+            return None
+        return best_of(repeat, lambda: jsonify(body))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000, help='rows per response')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per case (best is reported)')
+    args = parser.parse_args()
+
+    random.seed(1)
+    stock_app = Flask('stock')
+    backends = ['json'] + (['orjson'] if orjson is not None else [])
+    tables = [('diet', diet_row), ('tasks', task_row), ('crm', crm_row), ('stats', stats_row)]
+
+    header = f"{'table':<7} {'rows':>6} {'KiB':>7} {'flask ms':>9}"
+    for backend in backends:
+        header += f" {backend + ' ms':>10} {'speedup':>8}"
+    print(header)
+    for table, make_row in tables:
+        records = [make_row(index) for index in range(args.rows)]
+        body = {'status': 'success', 'count': len(records), 'data': records, 'next_cursor': None}
+
+        before = jsonify_seconds(stock_app, body, args.repeat)
+        line = f"{table:<7} {len(records):>6} "
+        sizes = []
+        timings = []
+        for backend in backends:
+            app.json_codec = JSONCodec(backend)
+            with app.app.app_context():
+                sizes.append(len(jsonify(body).get_data()))
+            timings.append(jsonify_seconds(app.app, body, args.repeat))
+        line += f"{sizes[0] / 1024:>7.0f} "
+        line += f"{before * 1000:>9.1f}" if before is not None else f"{'fails':>9}"
+        for seconds in timings:
+            speedup = f"{before / seconds:>7.1f}x" if before is not None else f"{'-':>8}"
+            line += f" {seconds * 1000:>10.1f} {speedup}"
+        print(line)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,413 @@
+"""Latency, throughput and DB round trips for the webhook and read endpoints.
+
+Drives /api/plaud, /api/diet, /api/tasks and /api/crm (Zapier loop items and lists)
+plus the list APIs, /api/stats and the dashboard pages with concurrent clients and
+reports p50/p95/p99 latency, requests per second and MySQL round trips per request.
+
+By default the Flask app runs in-process against a scratch database on a local
+MySQL/MariaDB server, built with migrations.py and seeded through the insert helpers.
+With --url the same scenarios are sent to a running server (gunicorn or uvicorn)
+instead; round trips are only counted in-process.
+
+Results can be saved as a baseline in benchmarks/baselines/ and later runs compared
+against it, failing when p95 latency regresses beyond --tolerance or a scenario
+needs more round trips or starts failing.
+
+Usage:
+    python benchmarks/load_test.py --host 127.0.0.1 --user root --save-baseline local
+    python benchmarks/load_test.py --host 127.0.0.1 --user root --compare local
+    python benchmarks/load_test.py --url http://127.0.0.1:5000 --scenarios plaud,diet-zapier
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+# Writes must reach MySQL before the response, and the search index must not touch
+# the real transcript_search.db
+os.environ['INGEST_MODE'] = 'sync'
+os.environ.setdefault('TRANSCRIPT_SEARCH_PATH',
+                      os.path.join(tempfile.mkdtemp(prefix='plaud_load_test_'), 'search.db'))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+STATUSES = ['Pending', 'In Progress', 'Completed', 'Cancelled']
+FOOD_TYPES = ['Meal', 'Snack', 'Drink']
+WORDS = ['budget', 'meeting', 'follow', 'up', 'client', 'lunch', 'review', 'call',
+         'proposal', 'deadline', 'invoice', 'design', 'launch', 'the', 'and', 'with']
+
+_round_trips = threading.local()
+
+
+class CountingCursor:
+    """Cursor wrapper counting statements sent to MySQL by the current thread"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, *args, **kwargs):
+        _round_trips.count += 1
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        # mysql-connector rewrites multi-row INSERTs into one statement
+        _round_trips.count += 1
+        return self._cursor.executemany(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class CountingConnection:
+    """Pooled connection wrapper counting commits, rollbacks and cursor statements"""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def cursor(self, **kwargs):
+        return CountingCursor(self._connection.cursor(**kwargs))
+
+    def commit(self):
+        _round_trips.count += 1
+        return self._connection.commit()
+
+    def rollback(self):
+        _round_trips.count += 1
+        return self._connection.rollback()
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+def unique_suffix():
+    return uuid.uuid4().hex[:10]
+
+def transcript_text(words):
+    return ' '.join(random.choice(WORDS) for _ in range(words))
+
+def diet_item():
+    return {
+        'food': f"food {unique_suffix()}",
+        'food_type': random.choice(FOOD_TYPES),
+        'estimated_calories': f"~{random.randint(50, 900)} cal",
+        'time_of_day': f"{random.randint(6, 22):02d}:{random.randint(0, 59):02d}:00",
+        'date': (date.today() - timedelta(days=random.randint(0, 30))).isoformat()
+    }
+
+def task_item():
+    return {
+        'task_name': f"task {unique_suffix()}",
+        'task_type': 'Follow-up',
+        'responsible_party': 'Me',
+        'status': random.choice(STATUSES),
+        'best_due_date': (date.today() + timedelta(days=random.randint(0, 30))).isoformat(),
+        'notes': transcript_text(12)
+    }
+
+def crm_item():
+    suffix = unique_suffix()
+    return {
+        'contact_name': f"contact {suffix}",
+        'company': f"company {suffix[:3]}",
+        'email': f"{suffix}@example.com",
+        'phone': f"555-{random.randint(0, 9999):04d}",
+        'notes': transcript_text(12),
+        'status': 'Lead'
+    }
+
+def zapier_item(record):
+    """A record as a Zapier loop step sends it ('Result Food', 'Result Task Name', ...)"""
+    return {'Result ' + key.replace('_', ' ').title(): value for key, value in record.items()}
+
+def plaud_payload(transcript_words):
+    return {
+        'id': f"load-{unique_suffix()}",
+        'title': transcript_text(6),
+        'transcript': transcript_text(transcript_words),
+        'summary': transcript_text(60),
+        'create_time': datetime.now().isoformat(timespec='seconds'),
+        'diet_data': [diet_item() for _ in range(3)],
+        'tasks_data': [task_item() for _ in range(3)],
+        'crm_data': [crm_item() for _ in range(2)]
+    }
+
+def build_scenarios(args):
+    """Scenario name -> (method, path, body factory or None)"""
+    return {
+        'plaud': ('POST', '/api/plaud', lambda: plaud_payload(args.transcript_words)),
+        'diet-zapier': ('POST', '/api/diet', lambda: zapier_item(diet_item())),
+        'diet-list': ('POST', '/api/diet', lambda: [diet_item() for _ in range(args.list_size)]),
+        'tasks-zapier': ('POST', '/api/tasks', lambda: zapier_item(task_item())),
+        'tasks-list': ('POST', '/api/tasks', lambda: [task_item() for _ in range(args.list_size)]),
+        'crm-zapier': ('POST', '/api/crm', lambda: zapier_item(crm_item())),
+        'crm-list': ('POST', '/api/crm', lambda: [crm_item() for _ in range(args.list_size)]),
+        'get-diet': ('GET', '/api/diet?limit=50', None),
+        'get-tasks': ('GET', '/api/tasks?limit=50&status=Pending', None),
+        'get-crm': ('GET', '/api/crm?limit=50', None),
+        'get-crm-search': ('GET', '/api/crm?search=company&limit=50', None),
+        'get-transcripts': ('GET', '/api/transcripts?limit=50', None),
+        'get-stats': ('GET', '/api/stats', None),
+        'page-dashboard': ('GET', '/', None),
+        'page-diet': ('GET', '/diet', None),
+        'page-tasks': ('GET', '/tasks', None),
+        'page-crm': ('GET', '/crm', None)
+    }
+
+def in_process_client(app_module):
+    """send(method, path, body) -> (status, round trips) through the Flask test client"""
+    original = app_module.get_db_connection
+
+    def counting_connection():
+        connection = original()
+        return CountingConnection(connection) if connection else None
+
+    app_module.get_db_connection = counting_connection
+    clients = threading.local()
+
+    def send(method, path, body):
+        if not hasattr(clients, 'client'):
+            clients.client = app_module.app.test_client()
+        _round_trips.count = 0
+        response = clients.client.open(path, method=method, json=body)
+        response.close()
+        return response.status_code, _round_trips.count
+
+    return send
+
+def http_client(base_url):
+    """send(method, path, body) -> (status, None) against a running server"""
+    def send(method, path, body):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = urllib.request.Request(base_url.rstrip('/') + path, data=data, method=method,
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                return response.status, None
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+    return send
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def run_scenario(send, method, path, make_body, requests, concurrency, warmup):
+    """Send `requests` calls from `concurrency` threads and summarize them"""
+    for _ in range(warmup):
+        send(method, path, make_body() if make_body else None)
+
+    # Bodies are built up front so payload generation is not timed
+    bodies = [make_body() if make_body else None for _ in range(requests)]
+
+    def timed(body):
+        start = time.perf_counter()
+        status, round_trips = send(method, path, body)
+        return (time.perf_counter() - start) * 1000, status, round_trips
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed, bodies))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _, _ in results)
+    counted = [round_trips for _, _, round_trips in results if round_trips is not None]
+    return {
+        'requests': requests,
+        'errors': sum(1 for _, status, _ in results if status >= 400),
+        'rps': round(requests / elapsed, 1),
+        'p50': round(percentile(latencies, 0.50), 2),
+        'p95': round(percentile(latencies, 0.95), 2),
+        'p99': round(percentile(latencies, 0.99), 2),
+        'round_trips': round(sum(counted) / len(counted), 2) if counted else None
+    }
+
+def seed(app_module, rows):
+    """Fill the scratch database through the same helpers the webhooks use"""
+    for start in range(0, rows, 500):
+        count = min(500, rows - start)
+        app_module.insert_diet_data([diet_item() for _ in range(count)])
+        app_module.insert_tasks_data([task_item() for _ in range(count)])
+        app_module.insert_crm_data([crm_item() for _ in range(count)])
+    for _ in range(min(rows, 200)):
+        payload = plaud_payload(200)
+        for section in ('diet_data', 'tasks_data', 'crm_data'):
+            payload.pop(section)
+        app_module.process_plaud_payload(payload)
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+def save_baseline(name, meta, results):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(baseline_path(name), 'w') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+    print(f"\nSaved baseline {baseline_path(name)}")
+
+def environment(meta):
+    """The parts of a run's meta that latency depends on"""
+    return {key: meta.get(key) for key in ('host', 'platform', 'processor', 'cpus', 'database')}
+
+def compare_baseline(name, meta, results, tolerance):
+    """Regressions of `results` against a saved baseline, as printable lines"""
+    with open(baseline_path(name)) as f:
+        saved = json.load(f)
+    baseline = saved['results']
+
+    recorded = environment(saved.get('meta', {}))
+    current = environment(meta)
+    for key in recorded:
+        if recorded[key] != current[key]:
+            print(f"Warning: baseline {name} was recorded with {key} {recorded[key]!r}, "
+                  f"this run has {current[key]!r}")
+
+    regressions = []
+    print(f"\n{'scenario':<18} {'p95 base':>10} {'p95 now':>10} {'change':>8} {'trips base':>11} {'now':>6}")
+    for scenario, current in results.items():
+        previous = baseline.get(scenario)
+        if previous is None:
+            continue
+        change = (current['p95'] - previous['p95']) / previous['p95'] if previous['p95'] else 0.0
+        print(f"{scenario:<18} {previous['p95']:>8.2f}ms {current['p95']:>8.2f}ms {change:>+7.0%} "
+              f"{previous['round_trips'] if previous['round_trips'] is not None else '-':>11} "
+              f"{current['round_trips'] if current['round_trips'] is not None else '-':>6}")
+        if change > tolerance:
+            regressions.append(f"{scenario}: p95 {previous['p95']}ms -> {current['p95']}ms")
+        if (current['round_trips'] is not None and previous['round_trips'] is not None
+                and current['round_trips'] > previous['round_trips']):
+            regressions.append(f"{scenario}: round trips {previous['round_trips']} -> "
+                               f"{current['round_trips']}")
+        if current['errors'] and not previous['errors']:
+            regressions.append(f"{scenario}: {current['errors']} failed requests")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='benchmark a running server instead of the in-process app')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3306)
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--database', default='plaud_load_test', help='scratch database')
+    parser.add_argument('--rows', type=int, default=5000, help='rows to seed per table')
+    parser.add_argument('--keep', action='store_true', help='keep the scratch database')
+    parser.add_argument('--no-cache', action='store_true', help='disable the read cache')
+    parser.add_argument('--scenarios', help='comma-separated subset of scenarios to run')
+    parser.add_argument('--requests', type=int, default=200, help='requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=4, help='concurrent clients')
+    parser.add_argument('--warmup', type=int, default=10, help='untimed requests per scenario')
+    parser.add_argument('--list-size', type=int, default=10, help='records per list payload')
+    parser.add_argument('--transcript-words', type=int, default=5000,
+                        help='words per /api/plaud transcript')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for generated payloads')
+    parser.add_argument('--save-baseline', metavar='NAME', help='write results to baselines/NAME.json')
+    parser.add_argument('--compare', metavar='NAME', help='compare against baselines/NAME.json')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed p95 regression before --compare fails (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    scenarios = build_scenarios(args)
+    if args.scenarios:
+        selected = args.scenarios.split(',')
+        unknown = set(selected) - set(scenarios)
+        if unknown:
+            sys.exit(f"Unknown scenarios: {', '.join(sorted(unknown))} "
+                     f"(choose from {', '.join(scenarios)})")
+        scenarios = {name: scenarios[name] for name in selected}
+
+    admin = None
+    database = None
+    if args.url:
+        send = http_client(args.url)
+    else:
+        if args.no_cache:
+            os.environ['CACHE_ENABLED'] = 'False'
+        import mysql.connector
+        import app as app_module
+        from migrations import migrate
+
+        server = {'host': args.host, 'port': args.port, 'user': args.user, 'password': args.password}
+        admin = mysql.connector.connect(**server)
+        admin_cursor = admin.cursor()
+        admin_cursor.execute("SELECT VERSION()")
+        database = {'server': admin_cursor.fetchone()[0], 'host': f"{args.host}:{args.port}"}
+        admin_cursor.execute(f"DROP DATABASE IF EXISTS `{args.database}`")
+        admin_cursor.execute(f"CREATE DATABASE `{args.database}` CHARACTER SET utf8mb4 "
+                             f"COLLATE utf8mb4_unicode_ci")
+        # The pool reads DB_CONFIG on every connect, so pointing it at the scratch database is enough
+        app_module.DB_CONFIG.update(server, database=args.database)
+        logging_level = app_module.logger.level
+        app_module.logger.setLevel('WARNING')
+
+        connection = app_module.get_db_connection()
+        migrate(connection)
+        connection.close()
+        print(f"Seeding {args.rows} rows per table...")
+        seed(app_module, args.rows)
+        send = in_process_client(app_module)
+
+    results = {}
+    try:
+        print(f"\n{'scenario':<18} {'p50':>9} {'p95':>9} {'p99':>9} {'req/s':>8} {'trips':>6} {'errors':>6}")
+        for name, (method, path, make_body) in scenarios.items():
+            result = run_scenario(send, method, path, make_body, args.requests,
+                                  args.concurrency, args.warmup)
+            results[name] = result
+            round_trips = result['round_trips'] if result['round_trips'] is not None else '-'
+            print(f"{name:<18} {result['p50']:>7.2f}ms {result['p95']:>7.2f}ms "
+                  f"{result['p99']:>7.2f}ms {result['rps']:>8.1f} {round_trips:>6} "
+                  f"{result['errors']:>6}")
+    finally:
+        if admin:
+            app_module.logger.setLevel(logging_level)
+            if not args.keep:
+                admin_cursor.execute(f"DROP DATABASE IF EXISTS `{args.database}`")
+            admin_cursor.close()
+            admin.close()
+
+    meta = {
+        'target': args.url or 'in-process',
+        'rows': args.rows,
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'list_size': args.list_size,
+        'transcript_words': args.transcript_words,
+        'cache': not args.no_cache,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'host': platform.node(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'database': database,
+        'created': datetime.now().isoformat(timespec='seconds')
+    }
+    if args.save_baseline:
+        save_baseline(args.save_baseline, meta, results)
+    if args.compare:
+        regressions = compare_baseline(args.compare, meta, results, args.tolerance)
+        if regressions:
+            sys.exit('\nRegressions against baseline:\n  ' + '\n  '.join(regressions))
+        print(f"\nNo regressions against baseline {args.compare}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Per-record cost of payload normalization on large batches.
+
+Times payload_schema's column-wise normalizer on 10k-record diet, tasks and CRM
+batches in each Zapier format. Zapier loop items are also timed with the old
+per-record parsing the routes did before payload_schema. The old code skipped
+lists entirely, so they have no "before" column. No database is needed.
+
+Usage:
+    python benchmarks/normalize_payloads.py --records 10000 --repeat 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from payload_schema import CRM_SCHEMA, DIET_SCHEMA, TASKS_SCHEMA  # noqa: E402
+
+FOODS = ['Oatmeal', 'Chicken salad', 'Latte', 'Apple', 'Pasta', 'Protein bar', 'Green tea']
+STATUSES = ['Pending', 'in progress', 'Completed', 'Cancelled']
+CRM_STATUSES = ['Lead', 'prospect', 'Customer', 'Lost']
+
+def diet_record(index):
+    return {
+        'food': f"{random.choice(FOODS)} {index}",
+        'food_type': random.choice(['Meal', 'snack', 'Drink']),
+        'estimated_calories': f"~{random.randint(50, 900)} cal",
+        'time_of_day': f"{random.randint(6, 22):02d}:{random.choice(['00', '15', '30', '45'])}",
+        'date': (date.today() - timedelta(days=random.randint(0, 60))).isoformat()
+    }
+
+def task_record(index):
+    return {
+        'task_name': f"Follow up on item {index}",
+        'task_type': 'Follow-up',
+        'responsible_party': random.choice(['Me', 'Alice', 'Bob']),
+        'status': random.choice(STATUSES),
+        'best_due_date': (date.today() + timedelta(days=random.randint(0, 60))).isoformat(),
+        'notes': 'Discussed in the weekly sync'
+    }
+
+def crm_record(index):
+    return {
+        'contact_name': f"Contact {index}",
+        'company': f"Company {index % 300}",
+        'email': f"contact{index}@example.com",
+        'phone': f"555-{index % 10000:04d}",
+        'status': random.choice(CRM_STATUSES)
+    }
+
+def zapier_item(record):
+    return {'Result ' + key.replace('_', ' ').title(): value for key, value in record.items()}
+
+def line_items(records):
+    return {key: ', '.join(str(record[key]) for record in records) for key in records[0]}
+
+# The per-record parsing the routes used before payload_schema, kept for comparison
+def legacy_diet(data):
+    calories_raw = data.get('Result Estimated Calories') or data.get('estimated_calories', '0')
+    calories_clean = ''.join(filter(str.isdigit, str(calories_raw))) or '0'
+    return [{
+        'food': data.get('Result Food') or data.get('food', ''),
+        'food_type': data.get('Result Food Type') or data.get('food_type', 'Meal'),
+        'estimated_calories': int(calories_clean),
+        'time_of_day': data.get('Result Time Of Day') or data.get('time_of_day', '00:00:00'),
+        'date': data.get('Result Date') or data.get('date', datetime.now().strftime('%Y-%m-%d'))
+    }]
+
+def legacy_tasks(data):
+    return [{
+        'task_name': data.get('Result Task Name') or data.get('task_name', ''),
+        'task_type': data.get('Result Task Type') or data.get('task_type', 'Other'),
+        'responsible_party': data.get('Result Responsible Party') or data.get('responsible_party', None),
+        'status': data.get('Result Status') or data.get('status', 'Pending'),
+        'best_start_date': data.get('Result Best Start Date') or data.get('best_start_date', None),
+        'best_due_date': data.get('Result Best Due Date') or data.get('best_due_date', None),
+        'time_interval': data.get('Result Time Interval') or data.get('time_interval', None),
+        'notes': data.get('Result Notes') or data.get('notes', ''),
+        'dependency': data.get('Result Dependency') or data.get('dependency', None)
+    }]
+
+def legacy_crm(data):
+    return [{
+        'contact_name': data.get('Result Contact Name') or data.get('contact_name', ''),
+        'company': data.get('Result Company') or data.get('company', None),
+        'email': data.get('Result Email') or data.get('email', None),
+        'phone': data.get('Result Phone') or data.get('phone', None),
+        'notes': data.get('Result Notes') or data.get('notes', ''),
+        'status': data.get('Result Status') or data.get('status', 'Lead')
+    }]
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=10000, help='records per batch')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per case (best is reported)')
+    args = parser.parse_args()
+
+    random.seed(1)
+    tables = [
+        ('diet', DIET_SCHEMA, diet_record, legacy_diet, True),
+        ('tasks', TASKS_SCHEMA, task_record, legacy_tasks, False),
+        ('crm', CRM_SCHEMA, crm_record, legacy_crm, False)
+    ]
+    count = args.records
+    print(f"{'table':<7} {'format':<12} {'before us/rec':>14} {'schema us/rec':>14} {'records':>8}")
+    for table, schema, make_record, legacy, has_line_items in tables:
+        records = [make_record(index) for index in range(count)]
+        items = [zapier_item(record) for record in records]
+        cases = [
+            ('zapier items', items,
+             lambda: [row for item in items for row in legacy(item)]),
+            ('list', records, None)
+        ]
+        if has_line_items:
+            cases.append(('line items', line_items(records), None))
+
+        for name, payload, before in cases:
+            normalized = schema.normalize(payload)
+            after_seconds = best_of(args.repeat, lambda: schema.normalize(payload))
+            before_us = (f"{best_of(args.repeat, before) / count * 1e6:>14.2f}"
+                         if before else f"{'-':>14}")
+            print(f"{table:<7} {name:<12} {before_us} {after_seconds / count * 1e6:>14.2f} "
+                  f"{len(normalized):>8}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""Fail if a hot read query stops using an index.
+
+Creates a scratch database on a local MySQL/MariaDB server, builds the schema with
+the migrations in migrations.py and seeds it. It then runs every read helper behind the
+list endpoints and the dashboard, and records each SQL statement they send. Each
+statement is EXPLAINed. The run fails if a plan does a full table scan
+(type=ALL) or a filesort.
+
+CRM text search is not checked: the LIKE fallback scans by design, and the
+FULLTEXT path sorts its matches by relevance.
+
+Usage:
+    python benchmarks/query_plans.py --host 127.0.0.1 --user root --password secret
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+# Every helper must reach MySQL, not the read cache
+os.environ['CACHE_ENABLED'] = 'False'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector  # noqa: E402
+
+import app  # noqa: E402
+from migrations import migrate  # noqa: E402
+
+STATUSES = ['Pending', 'In Progress', 'Completed', 'Cancelled']
+PEOPLE = [None, 'Me', 'Alice', 'Bob', 'Carol']
+
+# Bounded to a few dozen rows by design (reconciliation prunes old calories rows)
+SMALL_TABLES = {'dashboard_counters'}
+
+
+class RecordingCursor:
+    """Cursor wrapper that remembers every statement it executes"""
+
+    def __init__(self, cursor, statements):
+        self._cursor = cursor
+        self._statements = statements
+
+    def execute(self, query, params=None, multi=False):
+        self._statements.append((query, params, multi))
+        return self._cursor.execute(query, params, multi=multi)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class RecordingConnection:
+    """Pooled connection wrapper handing out RecordingCursors"""
+
+    def __init__(self, connection, statements):
+        self._connection = connection
+        self._statements = statements
+
+    def cursor(self, **kwargs):
+        return RecordingCursor(self._connection.cursor(**kwargs), self._statements)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+def seed(cursor, rows):
+    today = date.today()
+    now = datetime.now()
+    cursor.executemany("""
+        INSERT IGNORE INTO diet (food, food_type, estimated_calories, time_of_day, date)
+        VALUES (%s, %s, %s, %s, %s)
+    """, [(f"food {index}", random.choice(['Meal', 'Snack', 'Drink']), random.randint(50, 900),
+           f"{random.randint(6, 22):02d}:{random.randint(0, 59):02d}:00",
+           today - timedelta(days=random.randint(0, 365)))
+          for index in range(rows)])
+    cursor.executemany("""
+        INSERT INTO tasks (task_name, status, priority, responsible_party, best_due_date, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, [(f"task {index}", random.choice(STATUSES), random.choice([None, *range(1, 10)]),
+           random.choice(PEOPLE), random.choice([None, today + timedelta(days=index % 90)]),
+           now - timedelta(minutes=index))
+          for index in range(rows)])
+    cursor.executemany("""
+        INSERT IGNORE INTO crm_records (contact_name, company, email, created_at)
+        VALUES (%s, %s, %s, %s)
+    """, [(f"contact {index}", f"company {index % 500}", f"contact{index}@example.com",
+           now - timedelta(minutes=index))
+          for index in range(rows)])
+    cursor.executemany("""
+        INSERT INTO plaud_transcripts (transcript_id, title, create_time) VALUES (%s, %s, %s)
+    """, [(f"bench-{index}", f"transcript {index}", now - timedelta(minutes=index))
+          for index in range(rows)])
+    for table in ('diet', 'tasks', 'crm_records', 'plaud_transcripts'):
+        cursor.execute(f"ANALYZE TABLE {table}")
+        cursor.fetchall()
+
+def page_after(table, records):
+    """Keyset cursor values continuing after the last record of a page"""
+    return tuple(app.format_cursor_value(records[-1][column]) for column in app.PAGE_KEYS[table])
+
+def run_hot_reads():
+    """Call every hot read helper and return (label, statements) pairs"""
+    first_day = app.get_diet_records(limit=1)[0]['date'].isoformat()
+    calls = [
+        ('diet', lambda: app.get_diet_records(limit=50)),
+        ('diet?date=', lambda: app.get_diet_records(date_filter=first_day, limit=50)),
+        ('diet?cursor=', lambda: app.get_diet_records(
+            limit=50, after=page_after('diet', app.get_diet_records(limit=50)))),
+        ('tasks', lambda: app.get_tasks_records(limit=50)),
+        ('tasks?status=', lambda: app.get_tasks_records(status_filter='Pending', limit=50)),
+        ('tasks?status=&cursor=', lambda: app.get_tasks_records(
+            status_filter='Pending', limit=50,
+            after=page_after('tasks', app.get_tasks_records(status_filter='Pending', limit=50)))),
+        ('tasks?sort=priority', lambda: app.get_tasks_records(sort='priority', limit=50)),
+        ('tasks?status=&sort=priority', lambda: app.get_tasks_records(
+            status_filter='Pending', sort='priority', limit=50)),
+        ('tasks?sort=priority&cursor=', lambda: app.get_tasks_records(
+            sort='priority', limit=50,
+            after=page_after('tasks/priority/asc', app.get_tasks_records(sort='priority', limit=50)))),
+        ('tasks?status=&sort=due', lambda: app.get_tasks_records(
+            status_filter='Pending', sort='best_due_date', descending=True, limit=50)),
+        ('tasks?due_from=&due_to=', lambda: app.get_tasks_records(
+            sort='best_due_date', due_from=date.today().isoformat(),
+            due_to=(date.today() + timedelta(days=14)).isoformat(), limit=50)),
+        ('tasks?responsible_party=', lambda: app.get_tasks_records(
+            responsible_party='Alice', limit=50)),
+        ('tasks?sort=task_name', lambda: app.get_tasks_records(sort='task_name', limit=50)),
+        ('tasks?status=&sort=task_type', lambda: app.get_tasks_records(
+            status_filter='Pending', sort='task_type', limit=50)),
+        ('tasks?sort=responsible_party', lambda: app.get_tasks_records(
+            sort='responsible_party', descending=True, limit=50)),
+        ('tasks?sort=status&cursor=', lambda: app.get_tasks_records(
+            sort='status', limit=50,
+            after=page_after('tasks/status/asc', app.get_tasks_records(sort='status', limit=50)))),
+        ('task responsible parties', lambda: app.get_task_responsible_parties()),
+        ('crm', lambda: app.get_crm_records(limit=50)),
+        ('crm?cursor=', lambda: app.get_crm_records(
+            limit=50, after=page_after('crm_records', app.get_crm_records(limit=50)))),
+        ('transcripts', lambda: app.get_transcript_records(limit=50)),
+        ('stats', lambda: app.get_dashboard_stats()),
+        ('stats (reconcile)', reconcile_counters),
+        ('dashboard', lambda: app.get_dashboard_data()),
+    ]
+
+    original = app.get_db_connection
+    results = []
+    for label, call in calls:
+        statements = []
+
+        def recording_connection():
+            connection = original()
+            return RecordingConnection(connection, statements) if connection else None
+
+        # Statements issued while fetching the first page for a cursor are hot too
+        app.get_db_connection = recording_connection
+        try:
+            call()
+        finally:
+            app.get_db_connection = original
+        results.append((label, statements))
+    return results
+
+def reconcile_counters():
+    connection = app.get_db_connection()
+    try:
+        app.reconcile_dashboard_counters(connection, force=True)
+    finally:
+        connection.close()
+
+def split_statements(query, params, multi):
+    """Yield (sql, params) for each SELECT, splitting multi-statement batches"""
+    parts = query.split(';') if multi else [query]
+    params = list(params or [])
+    for part in parts:
+        placeholders = part.count('%s')
+        part_params, params = params[:placeholders], params[placeholders:]
+        if part.strip().upper().startswith('SELECT'):
+            yield part.strip(), tuple(part_params)
+
+def check_plan(cursor, sql, params):
+    """Problems found in the EXPLAIN output of one statement"""
+    cursor.execute(f"EXPLAIN {sql}", params)
+    problems = []
+    for row in cursor.fetchall():
+        if row.get('table') in SMALL_TABLES:
+            continue
+        extra = row.get('Extra') or ''
+        if row.get('type') == 'ALL':
+            problems.append(f"full scan of {row['table']}")
+        if 'Using filesort' in extra:
+            problems.append(f"filesort on {row['table']}")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3306)
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--database', default='plaud_query_plans', help='scratch database')
+    parser.add_argument('--rows', type=int, default=20000, help='rows to seed per table')
+    parser.add_argument('--keep', action='store_true', help='keep the scratch database')
+    args = parser.parse_args()
+
+    server = {'host': args.host, 'port': args.port, 'user': args.user, 'password': args.password}
+    admin = mysql.connector.connect(**server)
+    admin_cursor = admin.cursor()
+    admin_cursor.execute(f"DROP DATABASE IF EXISTS `{args.database}`")
+    admin_cursor.execute(f"CREATE DATABASE `{args.database}` CHARACTER SET utf8mb4 "
+                         f"COLLATE utf8mb4_unicode_ci")
+
+    # The pool reads DB_CONFIG on every connect, so pointing it at the scratch database is enough
+    app.DB_CONFIG.update(server, database=args.database)
+    failures = 0
+    try:
+        connection = app.get_db_connection()
+        migrate(connection)
+        cursor = connection.cursor(dictionary=True)
+        print(f"Seeding {args.rows} rows per table...")
+        seed(cursor, args.rows)
+        connection.commit()
+
+        print(f"\n{'read path':<28} {'plan':<6} statement")
+        for label, statements in run_hot_reads():
+            for query, params, multi in statements:
+                for sql, sql_params in split_statements(query, params, multi):
+                    problems = check_plan(cursor, sql, sql_params)
+                    failures += bool(problems)
+                    summary = ' '.join(sql.split())[:70]
+                    print(f"{label:<28} {'FAIL' if problems else 'ok':<6} {summary}")
+                    for problem in problems:
+                        print(f"{'':<31}-> {problem}")
+        cursor.close()
+        connection.close()
+    finally:
+        if not args.keep:
+            admin_cursor.execute(f"DROP DATABASE IF EXISTS `{args.database}`")
+        admin_cursor.close()
+        admin.close()
+
+    if failures:
+        sys.exit(f"\n{failures} hot queries are not index-backed")
+    print("\nAll hot queries are index-backed")
+
+if __name__ == '__main__':
+    main()
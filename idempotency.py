@@ -0,0 +1,206 @@
+"""Idempotency keys for retried webhook deliveries.
+
+Zapier retries a webhook that timed out, even if the first delivery was stored.
+Each POST gets a key: the client's Idempotency-Key header, else the transcript id
+and loop item index the delivery carries, else the transcript id plus a hash of the
+body. Only a delivery that names no transcript is keyed by its body alone, and that
+key is kept for a short TTL, since two recordings can produce identical items. The
+first successful response is saved under the key in the idempotency_keys table and
+in a bounded in-process cache. Repeats get the saved response back without running
+the handler or touching the data tables.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Delete expired rows on every Nth save instead of in a separate job
+PURGE_EVERY = 500
+
+# Where a delivery names its transcript - /api/plaud posts the transcript itself
+TRANSCRIPT_ID_FIELDS = {'plaud': ('id',)}
+DEFAULT_TRANSCRIPT_ID_FIELDS = ('transcript_id', 'Result Transcript Id')
+# Zapier's Looping step numbers its items as "Loop Iteration"
+ITEM_INDEX_FIELDS = ('item_index', 'Loop Iteration', 'loop_iteration')
+
+
+def _first_value(payload, fields):
+    for field in fields:
+        value = payload.get(field)
+        if value is not None and value != '':
+            return str(value)
+    return None
+
+def idempotency_key(endpoint, header_key, payload):
+    """(key, source) for one delivery to an endpoint
+
+    key is a stable 64-character hash; source says what it was built from:
+    'header', 'item' (transcript id and item index), 'transcript' (transcript id
+    and body) or 'body'.
+    """
+    transcript_id = index = None
+    if not header_key and isinstance(payload, dict):
+        transcript_id = _first_value(payload, TRANSCRIPT_ID_FIELDS.get(endpoint,
+                                                                       DEFAULT_TRANSCRIPT_ID_FIELDS))
+        index = _first_value(payload, ITEM_INDEX_FIELDS)
+
+    if header_key:
+        source, material = 'header', header_key
+    elif transcript_id and index:
+        source, material = 'item', f"{transcript_id}\0{index}"
+    else:
+        body = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False,
+                          default=str)
+        source = 'transcript' if transcript_id else 'body'
+        material = f"{transcript_id}\0{body}" if transcript_id else body
+    material = f"{endpoint}\0{source}\0{material}"
+    return hashlib.sha256(material.encode('utf-8')).hexdigest(), source
+
+
+class IdempotencyStore:
+    """Saved responses by key: LRU/TTL cache in front of the idempotency_keys table"""
+
+    def __init__(self, get_connection, ttl=86400, body_ttl=900, max_entries=10000,
+                 wait_timeout=30.0):
+        self.get_connection = get_connection
+        self.ttl = ttl
+        self.body_ttl = body_ttl  # for keys hashed from the body alone
+        self.max_entries = max_entries
+        self.wait_timeout = wait_timeout
+        self._cache = OrderedDict()  # key -> (expires_at, status_code, body)
+        self._inflight = {}  # key -> Event set when the first delivery finishes
+        self._lock = threading.Lock()
+        self._saves = 0
+        self._counters = {'replayed': 0, 'stored': 0, 'waited': 0, 'errors': 0}
+
+    def _cached(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry[1], entry[2]
+
+    def ttl_for(self, source):
+        """Seconds a response saved under a key from idempotency_key() is replayed"""
+        return min(self.body_ttl, self.ttl) if source == 'body' else self.ttl
+
+    def _remember(self, key, status_code, body, ttl, age=0.0):
+        with self._lock:
+            self._cache[key] = (time.monotonic() + ttl - age, status_code, body)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def lookup(self, key, ttl=None):
+        """(status_code, body) saved for key within ttl seconds, or None (counts replays)"""
+        ttl = self.ttl if ttl is None else ttl
+        stored = self._cached(key)
+        if stored is not None:
+            self._counters['replayed'] += 1
+            return stored
+
+        connection = self.get_connection()
+        if not connection:
+            return None
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT status_code, response_body, TIMESTAMPDIFF(SECOND, created_at, NOW())
+                FROM idempotency_keys
+                WHERE idem_key = %s AND created_at > NOW() - INTERVAL %s SECOND
+            """, (key, ttl))
+            row = cursor.fetchone()
+            cursor.close()
+        except Exception as e:
+            self._counters['errors'] += 1
+            logger.warning(f"Idempotency lookup failed - handling request normally: {e}")
+            return None
+        finally:
+            connection.close()
+
+        if row is None:
+            return None
+        status_code, body, age = row
+        self._remember(key, status_code, body, ttl, age=float(age or 0))
+        self._counters['replayed'] += 1
+        return status_code, body
+
+    def save(self, key, endpoint, status_code, body, ttl=None):
+        """Remember a successful response for later deliveries with the same key
+
+        Nothing is remembered while MySQL is unreachable: the records behind the
+        response were most likely only logged, so a retry has to run again.
+        """
+        connection = self.get_connection()
+        if not connection:
+            return
+        self._remember(key, status_code, body, self.ttl if ttl is None else ttl)
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+                INSERT INTO idempotency_keys (idem_key, endpoint, status_code, response_body)
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                status_code = VALUES(status_code),
+                response_body = VALUES(response_body),
+                created_at = CURRENT_TIMESTAMP
+            """, (key, endpoint, status_code, body))
+            with self._lock:
+                self._saves += 1
+                purge = self._saves % PURGE_EVERY == 0
+            if purge:
+                cursor.execute("""
+                    DELETE FROM idempotency_keys
+                    WHERE created_at < NOW() - INTERVAL %s SECOND
+                    LIMIT 1000
+                """, (self.ttl,))
+            connection.commit()
+            cursor.close()
+            self._counters['stored'] += 1
+        except Exception as e:
+            self._counters['errors'] += 1
+            logger.warning(f"Could not save idempotency key for {endpoint}: {e}")
+        finally:
+            connection.close()
+
+    @contextmanager
+    def claim(self, key, ttl=None):
+        """Yield the saved response for key, or None if the caller should handle it
+
+        Concurrent deliveries with the same key in this process wait for the first
+        one to finish, then get its response instead of writing a second copy.
+        """
+        while True:
+            with self._lock:
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    break
+            self._counters['waited'] += 1
+            event.wait(self.wait_timeout)
+            stored = self._cached(key)
+            if stored is not None:
+                self._counters['replayed'] += 1
+                yield stored
+                return
+
+        try:
+            yield self.lookup(key, ttl)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def stats(self):
+        with self._lock:
+            size = len(self._cache)
+        return {'cached': size, 'ttl': self.ttl, 'body_ttl': self.body_ttl, **self._counters}
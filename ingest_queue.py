@@ -0,0 +1,235 @@
+"""Durable accept-then-process queue for webhook payloads.
+
+Payloads are committed to a local SQLite file before the webhook replies, and a
+pool of background threads drains them into MySQL with retries and exponential
+backoff. SQLite (WAL mode) lets every gunicorn worker on the host share one queue
+file; claims are leased, so jobs held by a crashed worker are picked up again.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class IngestQueue:
+    """SQLite-backed job queue with leases and retry scheduling"""
+
+    def __init__(self, path, max_attempts=8, retry_base=2.0, retry_cap=300.0, lease=120.0):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_cap = retry_cap
+        self.lease = lease
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS ingest_jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    finished_at REAL
+                )
+            """)
+            db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ingest_jobs_ready
+                ON ingest_jobs (status, available_at)
+            """)
+
+    def _connect(self):
+        # One short-lived connection per call keeps the queue safe across threads
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return _ClosingConnection(db)
+
+    def enqueue(self, kind, payload):
+        """Durably store a job and return its id"""
+        now = time.time()
+        with self._connect() as db:
+            cursor = db.execute("""
+                INSERT INTO ingest_jobs (kind, payload, available_at, created_at)
+                VALUES (?, ?, ?, ?)
+            """, (kind, json.dumps(payload, default=str), now, now))
+            return cursor.lastrowid
+
+    def claim(self):
+        """Lease the next ready job, or return None if nothing is due"""
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute("""
+                    SELECT id, kind, payload, attempts FROM ingest_jobs
+                    WHERE status IN ('pending', 'processing') AND available_at <= ?
+                    ORDER BY available_at
+                    LIMIT 1
+                """, (now,)).fetchone()
+                if row is None:
+                    db.execute("COMMIT")
+                    return None
+                # The lease doubles as crash recovery: an expired 'processing' job is ready again
+                db.execute("""
+                    UPDATE ingest_jobs
+                    SET status = 'processing', attempts = attempts + 1, available_at = ?
+                    WHERE id = ?
+                """, (now + self.lease, row['id']))
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        return {
+            'id': row['id'],
+            'kind': row['kind'],
+            'payload': json.loads(row['payload']),
+            'attempts': row['attempts'] + 1
+        }
+
+    def complete(self, job_id):
+        """Mark a job as done"""
+        with self._connect() as db:
+            db.execute("""
+                UPDATE ingest_jobs SET status = 'done', finished_at = ?, last_error = NULL
+                WHERE id = ?
+            """, (time.time(), job_id))
+
+    def fail(self, job_id, attempts, error):
+        """Schedule a retry with exponential backoff, or give up after max_attempts"""
+        now = time.time()
+        with self._connect() as db:
+            if attempts >= self.max_attempts:
+                db.execute("""
+                    UPDATE ingest_jobs SET status = 'dead', finished_at = ?, last_error = ?
+                    WHERE id = ?
+                """, (now, error, job_id))
+                logger.error(f"Ingest job {job_id} failed permanently after {attempts} attempts: {error}")
+                return
+            delay = min(self.retry_cap, self.retry_base * 2 ** (attempts - 1))
+            db.execute("""
+                UPDATE ingest_jobs SET status = 'pending', available_at = ?, last_error = ?
+                WHERE id = ?
+            """, (now + delay, error, job_id))
+            logger.warning(f"Ingest job {job_id} attempt {attempts} failed, retrying in {delay:.0f}s: {error}")
+
+    def get_job(self, job_id):
+        """Status of one job (without its payload)"""
+        with self._connect() as db:
+            row = db.execute("""
+                SELECT id, kind, status, attempts, last_error, created_at, finished_at
+                FROM ingest_jobs WHERE id = ?
+            """, (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def purge_finished(self, older_than):
+        """Delete completed jobs finished more than older_than seconds ago"""
+        with self._connect() as db:
+            db.execute("""
+                DELETE FROM ingest_jobs WHERE status = 'done' AND finished_at < ?
+            """, (time.time() - older_than,))
+
+    def stats(self):
+        """Job counts by status"""
+        with self._connect() as db:
+            rows = db.execute("""
+                SELECT status, COUNT(*) AS jobs FROM ingest_jobs GROUP BY status
+            """).fetchall()
+        counts = {'pending': 0, 'processing': 0, 'done': 0, 'dead': 0}
+        counts.update({row['status']: row['jobs'] for row in rows})
+        return counts
+
+
+class _ClosingConnection:
+    """Context manager that closes the sqlite3 connection on exit"""
+
+    def __init__(self, db):
+        self._db = db
+
+    def __enter__(self):
+        return self._db
+
+    def __exit__(self, *exc_info):
+        self._db.close()
+
+
+class IngestWorkerPool:
+    """Background threads that drain an IngestQueue through per-kind handlers
+
+    A handler returns True on success; returning False or raising schedules a retry.
+    """
+
+    def __init__(self, queue, handlers, workers=2, poll_interval=0.5, retention=86400):
+        self.queue = queue
+        self.handlers = handlers
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def start(self):
+        """Start the threads once per process (safe to call on every request)"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"ingest-worker-{index}",
+                                          daemon=True)
+                thread.start()
+            logger.info(f"Started {self.workers} ingest workers in process {self._pid}")
+
+    def notify(self):
+        """Wake idle workers after an enqueue"""
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self):
+        last_purge = 0.0
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim()
+            except Exception as e:
+                logger.error(f"Error claiming ingest job: {e}")
+                job = None
+
+            if job is None:
+                if time.time() - last_purge > 3600:
+                    last_purge = time.time()
+                    try:
+                        self.queue.purge_finished(self.retention)
+                    except Exception as e:
+                        logger.error(f"Error purging ingest jobs: {e}")
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+
+            self._process(job)
+
+    def _process(self, job):
+        handler = self.handlers.get(job['kind'])
+        if handler is None:
+            self.queue.fail(job['id'], self.queue.max_attempts, f"No handler for {job['kind']}")
+            return
+        try:
+            if handler(job['payload']):
+                self.queue.complete(job['id'])
+                return
+            error = 'Handler reported failure'
+        except Exception as e:
+            error = str(e)
+        self.queue.fail(job['id'], job['attempts'], error)
@@ -0,0 +1,85 @@
+"""JSON encoding for record-heavy API responses.
+
+The list endpoints return thousands of rows straight from MySQL, whose DATE,
+DATETIME, TIME (a timedelta) and DECIMAL values the standard encoder cannot
+serialize on its own. JSONCodec encodes them the same way on every path: dates and
+timestamps as ISO 8601, TIME as 'HH:MM:SS' and DECIMAL as an int or float. With
+the optional orjson package installed it does the whole body in C; otherwise it
+uses the json module with compact separators.
+"""
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+try:
+    import orjson  # Optional - JSON_BACKEND=orjson (picked automatically when installed)
+except ImportError:
+    orjson = None
+
+JSON_BACKENDS = ('auto', 'orjson', 'json')
+
+
+def time_string(value):
+    """MySQL TIME value (a timedelta, possibly negative or over 24h) as '[-]HH:MM:SS[.ffffff]'"""
+    sign = '-' if value < timedelta(0) else ''
+    value = abs(value)
+    seconds = value.days * 86400 + value.seconds
+    text = f"{sign}{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{text}.{value.microseconds:06d}" if value.microseconds else text
+
+def json_value(value):
+    """Convert a MySQL value into something JSON/CSV can represent (others pass through)"""
+    if isinstance(value, timedelta):
+        return time_string(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return value
+
+def json_default(value):
+    """`default=` hook for json.dumps/orjson.dumps"""
+    converted = json_value(value)
+    if converted is value:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return converted
+
+
+class JSONCodec:
+    """Encodes response bodies to UTF-8 JSON bytes with the configured backend
+
+    orjson writes datetime, date and time natively, in the same ISO format as
+    json_value. Bodies it rejects (integers over 64 bits, non-string keys) are
+    encoded again with the json module rather than failing the request.
+    """
+
+    def __init__(self, backend='auto'):
+        if backend not in JSON_BACKENDS:
+            raise ValueError(f"Unknown JSON backend {backend!r} - use one of {', '.join(JSON_BACKENDS)}")
+        if backend == 'auto':
+            backend = 'orjson' if orjson is not None else 'json'
+        if backend == 'orjson' and orjson is None:
+            raise ValueError("JSON backend 'orjson' needs the orjson package")
+        self.backend = backend
+        self._counters = {'encoded': 0, 'fallbacks': 0}
+
+    def dumps(self, obj):
+        if self.backend == 'orjson':
+            try:
+                body = orjson.dumps(obj, default=json_default)
+            except TypeError:
+                self._counters['fallbacks'] += 1
+            else:
+                self._counters['encoded'] += 1
+                return body
+        body = json.dumps(obj, default=json_default, ensure_ascii=False,
+                          separators=(',', ':')).encode('utf-8')
+        self._counters['encoded'] += 1
+        return body
+
+    def stats(self):
+        return {'backend': self.backend, **self._counters}
@@ -0,0 +1,200 @@
+"""Cheap logging for the webhook hot path.
+
+Request threads only build a LogRecord and put it on a bounded queue; a background
+thread formats it and writes it out. Payloads are logged through lazy wrappers, so a
+transcript is only summarized (or dumped) if the record is actually emitted, and
+then off the request thread. Summaries are capped in size; full dumps are sampled.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueListener
+
+# Attributes every LogRecord has - anything else came in through `extra=`
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with any `extra=` fields as keys"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class BackgroundLogHandler(logging.Handler):
+    """Queue records for a writer thread that formats them and runs the real handlers
+
+    The writer is (re)started lazily in each process, so it also works after a
+    gunicorn fork. When the queue is full, INFO and below are dropped (and
+    counted) rather than blocking a request; warnings and errors wait.
+    """
+
+    def __init__(self, handlers, max_queue=10000):
+        super().__init__()
+        self.handlers = handlers
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._pid = None
+        self._queue = None
+        self._listener = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(self.max_queue)
+                self._listener = QueueListener(self._queue, *self.handlers,
+                                               respect_handler_level=True)
+                self._listener.start()
+                self._pid = os.getpid()
+
+    def emit(self, record):
+        self._ensure_listener()
+        try:
+            if record.levelno >= logging.WARNING:
+                self._queue.put(record, timeout=1)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Flush queued records and stop the writer thread"""
+        with self._start_lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+            self._pid = None
+        super().close()
+
+    def stats(self):
+        return {
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'dropped': self.dropped
+        }
+
+
+def configure_logging(level='INFO', log_format='text', background=True, log_file=None,
+                      max_queue=10000):
+    """Install the root handlers; returns the BackgroundLogHandler (or None)"""
+    formatter = (JsonFormatter() if log_format == 'json'
+                 else logging.Formatter('%(levelname)s:%(name)s:%(message)s'))
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    if not background:
+        for handler in handlers:
+            root.addHandler(handler)
+        return None
+
+    background_handler = BackgroundLogHandler(handlers, max_queue=max_queue)
+    root.addHandler(background_handler)
+    atexit.register(background_handler.close)
+    return background_handler
+
+
+def summarize(value, max_chars=500, inline_chars=40):
+    """Short description of a payload: small values inline, big ones as their size
+
+    {'id': 'abc', 'transcript': <str 48213 chars>, 'diet_data': <list 3>}
+    """
+    if isinstance(value, list):
+        text = f"[{len(value)} items"
+        if value:
+            text += f", first: {summarize(value[0], max_chars, inline_chars)}"
+        text += ']'
+    elif isinstance(value, dict):
+        text = '{' + ', '.join(f"{key!r}: {_brief(item, inline_chars)}"
+                               for key, item in value.items()) + '}'
+    else:
+        text = _brief(value, inline_chars)
+    return text if len(text) <= max_chars else text[:max_chars - 1] + '…'
+
+def _brief(value, inline_chars):
+    if isinstance(value, str):
+        return repr(value) if len(value) <= inline_chars else f"<str {len(value)} chars>"
+    if isinstance(value, list):
+        return f"<list {len(value)}>"
+    if isinstance(value, dict):
+        return f"<dict {len(value)} keys>"
+    text = repr(value)
+    return text if len(text) <= inline_chars else f"<{type(value).__name__}>"
+
+
+class PayloadSummary:
+    """Lazy summarize() - only computed if the log record is emitted"""
+
+    __slots__ = ('payload', 'max_chars')
+
+    def __init__(self, payload, max_chars):
+        self.payload = payload
+        self.max_chars = max_chars
+
+    def __str__(self):
+        return summarize(self.payload, self.max_chars)
+
+
+class PayloadDump:
+    """Lazy pretty-printed JSON dump of a whole payload"""
+
+    __slots__ = ('payload',)
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def __str__(self):
+        return json.dumps(self.payload, indent=2, default=str, ensure_ascii=False)
+
+
+class PayloadLogger:
+    """Logs received payloads as capped summaries, with a sampled share of full dumps
+
+    mode is 'summary', 'full' (dump sample_rate of payloads, summarize the rest)
+    or 'off'.
+    """
+
+    def __init__(self, mode='summary', max_chars=500, sample_rate=0.01):
+        self.mode = mode
+        self.max_chars = max_chars
+        self.sample_rate = sample_rate
+
+    def received(self, logger, kind, payload):
+        if self.mode == 'off' or not logger.isEnabledFor(logging.INFO):
+            return
+        if self.mode == 'full' and random.random() < self.sample_rate:
+            logger.info("Received %s data (sampled full payload): %s", kind, PayloadDump(payload),
+                        extra={'payload_kind': kind})
+        else:
+            logger.info("Received %s data: %s", kind, PayloadSummary(payload, self.max_chars),
+                        extra={'payload_kind': kind})
+
+    def not_saved(self, logger, kind, records):
+        """One line for records dropped while the database is unreachable"""
+        logger.warning("Database connection failed - %d %s records not saved: %s",
+                       len(records), kind, PayloadSummary(records, self.max_chars))
@@ -0,0 +1,403 @@
+"""Versioned schema migrations for the Plaud webhook database.
+
+Every schema change is a numbered Migration in MIGRATIONS. Applied versions are
+recorded in schema_migrations with a checksum of their steps, so an edited
+migration is detected instead of silently diverging. Startup only compares the
+highest recorded version with SCHEMA_VERSION - no DDL runs unless something is
+pending.
+
+Steps are idempotent against databases created by the old create_tables.sql /
+create_tables() paths: columns and indexes are only added when missing, and
+conversions only run when the column still has its old type.
+"""
+import hashlib
+import logging
+import time
+
+from mysql.connector import Error, errorcode
+
+logger = logging.getLogger(__name__)
+
+# Held while migrating so concurrently starting workers don't race each other
+MIGRATION_LOCK = 'plaud_schema_migrations'
+
+
+class MigrationError(Exception):
+    """The database schema cannot be brought to SCHEMA_VERSION"""
+
+
+class Sql:
+    """A plain statement, optionally only run while a column still has another type"""
+
+    def __init__(self, statement, if_column=None, unless_type=None):
+        self.statement = statement
+        self.if_column = if_column  # (table, column) that must exist
+        self.unless_type = unless_type  # skip once the column has this DATA_TYPE
+
+    def describe(self):
+        return f"sql {self.if_column} {self.unless_type} {' '.join(self.statement.split())}"
+
+    def apply(self, cursor):
+        if self.if_column:
+            data_type = column_type(cursor, *self.if_column)
+            if data_type is None or data_type == self.unless_type:
+                return
+        cursor.execute(self.statement)
+
+
+class AddColumn:
+    """ALTER TABLE ... ADD COLUMN unless the column already exists"""
+
+    def __init__(self, table, column, definition):
+        self.table = table
+        self.column = column
+        self.definition = definition
+
+    def describe(self):
+        return f"add column {self.table}.{self.column} {self.definition}"
+
+    def apply(self, cursor):
+        if column_type(cursor, self.table, self.column) is None:
+            cursor.execute(f"ALTER TABLE {self.table} ADD COLUMN {self.column} {self.definition}")
+            logger.info(f"Added column {self.column} to {self.table}")
+
+
+class AddIndex:
+    """Build an index without blocking writes, unless an index on its columns exists
+
+    Uses ALGORITHM=INPLACE, LOCK=NONE so inserts keep flowing during the build;
+    index types that cannot be built that way (e.g. the first FULLTEXT index)
+    fall back to the server's default algorithm. Old tables reuse some index
+    names for other columns (tasks.idx_due_date is on due_date), so the columns
+    are compared, not just the name.
+    """
+
+    def __init__(self, table, index, definition):
+        self.table = table
+        self.index = index
+        self.definition = definition
+
+    def describe(self):
+        return f"add index {self.table}.{self.index} {self.definition}"
+
+    def key(self):
+        """('column,column', is_fulltext) parsed from the definition"""
+        columns = self.definition[self.definition.index('(') + 1:self.definition.rindex(')')]
+        names = [column.split('(')[0].strip().strip('`').lower() for column in columns.split(',')]
+        return ','.join(names), self.definition.upper().startswith('FULLTEXT')
+
+    def apply(self, cursor):
+        cursor.execute("""
+            SELECT INDEX_NAME, LOWER(GROUP_CONCAT(COLUMN_NAME ORDER BY SEQ_IN_INDEX)),
+                   MAX(INDEX_TYPE) = 'FULLTEXT'
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+            GROUP BY INDEX_NAME
+        """, (self.table,))
+        existing = {name: (columns, bool(fulltext)) for name, columns, fulltext in cursor.fetchall()}
+        key = self.key()
+        if self.index in existing:
+            if existing[self.index] != key:
+                logger.warning(f"{self.table}.{self.index} already exists on "
+                               f"({existing[self.index][0]}), not ({key[0]}) - left as it is")
+            return
+        if key in existing.values():
+            return
+
+        statement = f"ALTER TABLE {self.table} ADD {self.definition}"
+        try:
+            cursor.execute(f"{statement}, ALGORITHM=INPLACE, LOCK=NONE")
+        except Error as e:
+            if e.errno not in (errorcode.ER_ALTER_OPERATION_NOT_SUPPORTED,
+                               errorcode.ER_ALTER_OPERATION_NOT_SUPPORTED_REASON):
+                raise
+            logger.warning(f"Online build of {self.index} not supported ({e.msg}) - "
+                           f"building with a table lock")
+            cursor.execute(statement)
+        logger.info(f"Added index {self.index} to {self.table}")
+
+
+class Migration:
+    """One schema version: an ordered list of steps
+
+    previous_checksums lists the checksums of earlier revisions of a migration that
+    had to be fixed after release; databases that applied one of them are accepted.
+    """
+
+    def __init__(self, version, name, steps, previous_checksums=()):
+        self.version = version
+        self.name = name
+        self.steps = steps
+        self.previous_checksums = tuple(previous_checksums)
+
+    @property
+    def checksum(self):
+        digest = hashlib.sha256()
+        for step in self.steps:
+            digest.update(step.describe().encode('utf-8'))
+            digest.update(b'\n')
+        return digest.hexdigest()
+
+
+def column_type(cursor, table, column):
+    """DATA_TYPE of a column, or None if the table or column does not exist"""
+    cursor.execute("""
+        SELECT DATA_TYPE FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    row = cursor.fetchone()
+    return row[0].lower() if row else None
+
+
+MIGRATIONS = [
+    Migration(1, 'baseline tables', [
+        Sql("""
+        CREATE TABLE IF NOT EXISTS diet (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            food VARCHAR(255) NOT NULL,
+            food_type ENUM('Meal', 'Snack', 'Drink') NOT NULL,
+            estimated_calories INT,
+            time_of_day TIME NOT NULL,
+            date DATE NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY unique_diet_entry (food, food_type, time_of_day, date)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """),
+        Sql("""
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            task_name VARCHAR(500) NOT NULL,
+            task_type VARCHAR(50) DEFAULT 'Other',
+            responsible_party VARCHAR(255),
+            status ENUM('Pending', 'In Progress', 'Completed', 'Cancelled') DEFAULT 'Pending',
+            best_start_date DATE,
+            best_due_date DATE,
+            time_interval VARCHAR(100),
+            notes TEXT,
+            dependency TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """),
+        Sql("""
+        CREATE TABLE IF NOT EXISTS crm_records (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            contact_name VARCHAR(255) NOT NULL,
+            company VARCHAR(255),
+            email VARCHAR(255),
+            phone VARCHAR(50),
+            notes TEXT,
+            status ENUM('Lead', 'Prospect', 'Customer', 'Lost') DEFAULT 'Lead',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            UNIQUE KEY unique_contact (contact_name, email)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """),
+        Sql("""
+        CREATE TABLE IF NOT EXISTS plaud_transcripts (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            transcript_id VARCHAR(255) UNIQUE,
+            title VARCHAR(500),
+            transcript_text LONGTEXT,
+            summary_text TEXT,
+            create_time DATETIME,
+            processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_transcript_id (transcript_id),
+            INDEX idx_create_time (create_time)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """),
+        Sql("""
+        CREATE TABLE IF NOT EXISTS dashboard_counters (
+            counter_name VARCHAR(64) PRIMARY KEY,
+            counter_value BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """),
+    ]),
+    # Replaces update_calories_column.sql: "~350 cal" strings become 350. MariaDB's
+    # REGEXP_SUBSTR returns '' (MySQL's NULL) for values without digits, which the
+    # INT conversion rejects in strict mode - NULLIF makes both NULL.
+    Migration(2, 'diet calories as integers', [
+        Sql("""
+        UPDATE diet SET estimated_calories = NULLIF(REGEXP_SUBSTR(estimated_calories, '[0-9]+'), '')
+        """, if_column=('diet', 'estimated_calories'), unless_type='int'),
+        Sql("""
+        ALTER TABLE diet MODIFY COLUMN estimated_calories INT
+        """, if_column=('diet', 'estimated_calories'), unless_type='int'),
+    ], previous_checksums=['d8f6973b59353400d1e0324252f2e62394ceb4d9a8377104f8a3ba4ee958a7c7']),
+    # Tables created from the first create_tables.sql have task_description/priority/
+    # due_date instead of the columns the Zapier loop writes
+    Migration(3, 'tasks columns written by the Zapier loop', [
+        AddColumn('tasks', 'task_name', "VARCHAR(500) NOT NULL DEFAULT '' AFTER id"),
+        AddColumn('tasks', 'task_type', "VARCHAR(50) DEFAULT 'Other' AFTER task_name"),
+        AddColumn('tasks', 'responsible_party', "VARCHAR(255) AFTER task_type"),
+        AddColumn('tasks', 'best_start_date', "DATE AFTER status"),
+        AddColumn('tasks', 'best_due_date', "DATE AFTER best_start_date"),
+        AddColumn('tasks', 'time_interval', "VARCHAR(100) AFTER best_due_date"),
+        AddColumn('tasks', 'notes', "TEXT AFTER time_interval"),
+        AddColumn('tasks', 'dependency', "TEXT AFTER notes"),
+        Sql("""
+        UPDATE tasks SET task_name = LEFT(task_description, 500), best_due_date = due_date
+        WHERE task_name = ''
+        """, if_column=('tasks', 'task_description')),
+        # Inserts no longer supply it, so it must not be NOT NULL without a default
+        Sql("""
+        ALTER TABLE tasks MODIFY COLUMN task_description TEXT NULL
+        """, if_column=('tasks', 'task_description')),
+    ]),
+    Migration(4, 'compressed transcript bodies', [
+        AddColumn('plaud_transcripts', 'transcript_body', "LONGBLOB AFTER transcript_text"),
+        AddColumn('plaud_transcripts', 'body_codec', "VARCHAR(16) AFTER transcript_body"),
+        AddColumn('plaud_transcripts', 'body_bytes', "INT AFTER body_codec"),
+        AddColumn('plaud_transcripts', 'content_hash', "CHAR(64) AFTER summary_text"),
+    ]),
+    Migration(5, 'listing and search indexes', [
+        AddIndex('diet', 'idx_date_time', "INDEX idx_date_time (date, time_of_day)"),
+        AddIndex('tasks', 'idx_status_created', "INDEX idx_status_created (status, created_at)"),
+        AddIndex('tasks', 'idx_created_at', "INDEX idx_created_at (created_at)"),
+        AddIndex('crm_records', 'idx_created_at', "INDEX idx_created_at (created_at)"),
+        AddIndex('crm_records', 'ft_contact_search',
+                 "FULLTEXT KEY ft_contact_search (contact_name, company, email)"),
+    ]),
+    # Responses replayed for retried webhook deliveries (see idempotency.py)
+    Migration(6, 'idempotency keys', [
+        Sql("""
+        CREATE TABLE IF NOT EXISTS idempotency_keys (
+            idem_key CHAR(64) PRIMARY KEY,
+            endpoint VARCHAR(32) NOT NULL,
+            status_code SMALLINT NOT NULL,
+            response_body MEDIUMTEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_created_at (created_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """),
+    ]),
+    # Priority edited on the tasks page (1 = most urgent, NULL = unset)
+    Migration(7, 'task priority', [
+        AddColumn('tasks', 'priority', "TINYINT UNSIGNED NULL AFTER status"),
+    ]),
+    # Server-side filters and sorts on /tasks and GET /api/tasks
+    Migration(8, 'task filter and sort indexes', [
+        AddIndex('tasks', 'idx_priority', "INDEX idx_priority (priority)"),
+        AddIndex('tasks', 'idx_status_priority', "INDEX idx_status_priority (status, priority)"),
+        AddIndex('tasks', 'idx_due_date', "INDEX idx_due_date (best_due_date)"),
+        AddIndex('tasks', 'idx_status_due', "INDEX idx_status_due (status, best_due_date)"),
+        AddIndex('tasks', 'idx_responsible_created',
+                 "INDEX idx_responsible_created (responsible_party, created_at)"),
+    ]),
+    # Tables from the first create_tables.sql already had priority ENUM('Low', 'Medium',
+    # 'High'), so migration 7 left it alone. Go through text so High/Medium/Low become
+    # 1/2/3 - a direct MODIFY would store the enum index (Low = 1).
+    Migration(9, 'numeric priority on legacy tasks tables', [
+        Sql("""
+        ALTER TABLE tasks MODIFY COLUMN priority VARCHAR(16) NULL DEFAULT NULL
+        """, if_column=('tasks', 'priority'), unless_type='tinyint'),
+        Sql("""
+        UPDATE tasks SET priority = CASE priority
+            WHEN 'High' THEN '1' WHEN 'Medium' THEN '2' WHEN 'Low' THEN '3' ELSE NULL END
+        WHERE priority NOT REGEXP '^[1-9][0-9]?$'
+        """, if_column=('tasks', 'priority'), unless_type='tinyint'),
+        Sql("""
+        ALTER TABLE tasks MODIFY COLUMN priority TINYINT UNSIGNED NULL DEFAULT NULL
+        """, if_column=('tasks', 'priority'), unless_type='tinyint'),
+    ]),
+    # Legacy tables already had an idx_due_date on due_date, so migration 8 skipped the
+    # best_due_date index there (on newer tables idx_due_date covers it and this is a no-op)
+    Migration(10, 'best_due_date index under an unused name', [
+        AddIndex('tasks', 'idx_best_due_date', "INDEX idx_best_due_date (best_due_date)"),
+    ]),
+    # Sorting /tasks by name, type, status or responsible party (each index ends in the
+    # primary key, which is the id tiebreaker; legacy tables already have idx_status)
+    Migration(11, 'task sort indexes for the text columns', [
+        AddIndex('tasks', 'idx_status', "INDEX idx_status (status)"),
+        AddIndex('tasks', 'idx_task_name', "INDEX idx_task_name (task_name)"),
+        AddIndex('tasks', 'idx_status_task_name', "INDEX idx_status_task_name (status, task_name)"),
+        AddIndex('tasks', 'idx_task_type', "INDEX idx_task_type (task_type)"),
+        AddIndex('tasks', 'idx_status_task_type', "INDEX idx_status_task_type (status, task_type)"),
+        AddIndex('tasks', 'idx_responsible', "INDEX idx_responsible (responsible_party)"),
+        AddIndex('tasks', 'idx_status_responsible',
+                 "INDEX idx_status_responsible (status, responsible_party)"),
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(cursor):
+    """Highest applied migration, 0 for a database that was never migrated"""
+    try:
+        cursor.execute("SELECT MAX(version) FROM schema_migrations")
+    except Error as e:
+        if e.errno == errorcode.ER_NO_SUCH_TABLE:
+            return 0
+        raise
+    return cursor.fetchone()[0] or 0
+
+
+def migrate(connection):
+    """Apply every pending migration in order and return the versions applied
+
+    Raises MigrationError if an applied migration was edited afterwards.
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INT PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                checksum CHAR(64) NOT NULL,
+                execution_ms INT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """)
+        cursor.execute("SELECT GET_LOCK(%s, 300)", (MIGRATION_LOCK,))
+        if cursor.fetchone()[0] != 1:
+            raise MigrationError('Timed out waiting for another process to finish migrating')
+
+        try:
+            cursor.execute("SELECT version, checksum FROM schema_migrations")
+            applied = dict(cursor.fetchall())
+            known = {migration.version for migration in MIGRATIONS}
+            unknown = sorted(set(applied) - known)
+            if unknown:
+                raise MigrationError(f"Database has migrations {unknown} this code does not know - "
+                                     f"deploy the newer code")
+
+            applied_now = []
+            for migration in MIGRATIONS:
+                if migration.version in applied:
+                    if applied[migration.version] not in (migration.checksum,
+                                                          *migration.previous_checksums):
+                        raise MigrationError(f"Migration {migration.version} ({migration.name}) "
+                                             f"was changed after it was applied")
+                    continue
+
+                logger.info(f"Applying migration {migration.version}: {migration.name}")
+                start = time.monotonic()
+                for step in migration.steps:
+                    step.apply(cursor)
+                # DDL commits implicitly - record each version as soon as it is done
+                cursor.execute("""
+                    INSERT INTO schema_migrations (version, name, checksum, execution_ms)
+                    VALUES (%s, %s, %s, %s)
+                """, (migration.version, migration.name, migration.checksum,
+                      int((time.monotonic() - start) * 1000)))
+                connection.commit()
+                applied_now.append(migration.version)
+            return applied_now
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
+            cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def migration_status(cursor):
+    """[{version, name, applied_at}] for every known migration (applied_at None if pending)"""
+    applied = {}
+    if current_version(cursor):
+        cursor.execute("SELECT version, applied_at FROM schema_migrations")
+        applied = dict(cursor.fetchall())
+    return [{'version': migration.version, 'name': migration.name,
+             'applied_at': applied.get(migration.version)}
+            for migration in MIGRATIONS]
@@ -0,0 +1,228 @@
+"""Schema-driven normalization of Zapier webhook payloads.
+
+Zapier sends a record as a loop item ('Result Food', 'Result Estimated Calories', ...),
+as a plain JSON object, as a list of either, or - for old diet zaps - as
+comma-separated "line items". Each table's fields are compiled once into a
+PayloadSchema. A batch is normalized column by column: every field is read from all
+records in one pass, and each distinct raw value is coerced only once, so a 10k-row
+list that repeats the same dates, times and statuses costs one parse per value.
+"""
+import re
+from datetime import date, datetime
+
+_MISSING = object()
+
+
+class PayloadError(ValueError):
+    """Raised when a record in a payload cannot be stored"""
+
+
+def text(max_length=None):
+    """Stripped string, cut to the column length so strict mode cannot reject it"""
+    def coerce(value):
+        value = str(value).strip()
+        return value[:max_length] if max_length else value
+
+    def column(values, default):
+        # Whole-column fast path - text never fails to coerce
+        return [default if value is _MISSING
+                else (value if value.__class__ is str else str(value)).strip()[:max_length]
+                for value in values]
+    coerce.column = column
+    return coerce
+
+_NON_DIGITS = re.compile(r'\D')
+
+def digits_integer(value):
+    """Integer from the digits of values like '~450 cal' (no digits -> 0)"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    return int(_NON_DIGITS.sub('', str(value)) or 0)
+
+def choice(options):
+    """Case-insensitive match against an ENUM column's values"""
+    canonical = {option.lower(): option for option in options}
+
+    def coerce(value):
+        return canonical[str(value).strip().lower()]
+    return coerce
+
+_TIME = re.compile(r'^(\d{1,2})(?::(\d{2}))?(?::(\d{2}))?\s*([ap])?\.?\s*(?:m\.?)?$', re.IGNORECASE)
+
+def time_of_day(value):
+    """'7:30', '07:30:00', '7:30 PM' or '7pm' -> 'HH:MM:SS'"""
+    match = _TIME.match(str(value).strip())
+    if not match:
+        raise ValueError(value)
+    hour, minute, second, meridiem = match.groups()
+    hour, minute, second = int(hour), int(minute or 0), int(second or 0)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            raise ValueError(value)
+        hour = hour % 12 + (12 if meridiem.lower() == 'p' else 0)
+    if hour > 23 or minute > 59 or second > 59:
+        raise ValueError(value)
+    return f"{hour:02d}:{minute:02d}:{second:02d}"
+
+_ISO_DATE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})')
+_DATE_FORMATS = ('%m/%d/%Y', '%Y/%m/%d', '%B %d, %Y', '%b %d, %Y', '%d %B %Y')
+
+def calendar_date(value):
+    """'2024-03-01', an ISO timestamp, '03/01/2024' or 'March 1, 2024' -> 'YYYY-MM-DD'"""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    value = str(value).strip()
+    match = _ISO_DATE.match(value)
+    if match:
+        return date(*map(int, match.groups())).isoformat()
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError(value)
+
+def today():
+    return date.today().isoformat()
+
+
+class Field:
+    """One column: where to find it in a record, how to coerce it and its default
+
+    Values are looked up under the Zapier loop name ('Result Best Due Date') and
+    the plain name ('best_due_date'); the first non-empty one wins. Missing values
+    get the default (called if it is callable). A value that cannot be coerced is
+    an error for strict fields and falls back to the default otherwise.
+    """
+
+    def __init__(self, name, coerce=None, default=None, strict=False):
+        self.name = name
+        self.aliases = ('Result ' + name.replace('_', ' ').title(), name)
+        self.coerce = coerce
+        self.default = default
+        self.strict = strict
+
+    def default_value(self):
+        return self.default() if callable(self.default) else self.default
+
+    def column(self, records):
+        """Coerced values of this field for every record"""
+        loop_name, name = self.aliases
+        raw = []
+        append = raw.append
+        for record in records:
+            value = record.get(loop_name)
+            if value is None or value == '':
+                value = record.get(name, _MISSING)
+                if value is None or value == '':
+                    value = _MISSING
+            append(value)
+
+        coerce = self.coerce
+        if hasattr(coerce, 'column'):
+            return coerce.column(raw, self.default_value())
+
+        default = _MISSING
+        values = []
+        append = values.append
+        # Enum, date and time columns repeat a handful of values - coerce each one once
+        coerced = {}
+        for index, value in enumerate(raw):
+            if value is not _MISSING:
+                if coerce is None:
+                    append(value)
+                    continue
+                hashable = value.__class__ in (str, int, float)
+                if hashable and value in coerced:
+                    append(coerced[value])
+                    continue
+                try:
+                    result = coerce(value)
+                except (ValueError, TypeError, KeyError, OverflowError):
+                    if self.strict:
+                        raise PayloadError(f"Record {index}: invalid {self.name} {value!r}")
+                else:
+                    if hashable:
+                        coerced[value] = result
+                    append(result)
+                    continue
+            if default is _MISSING:
+                default = self.default_value()
+            append(default)
+        return values
+
+
+class PayloadSchema:
+    """Compiled field list for one table"""
+
+    def __init__(self, table, fields, line_items_key=None):
+        self.table = table
+        self.fields = fields
+        self.names = [field.name for field in fields]
+        # Legacy line items: a comma in this field means every field is a comma-separated column
+        self.line_items_key = line_items_key
+
+    def split_line_items(self, data):
+        columns = {name: [item.strip() for item in str(data[name]).split(',')]
+                   for name in self.names if data.get(name) not in (None, '')}
+        count = len(columns[self.line_items_key])
+        return [{name: values[index] for name, values in columns.items() if index < len(values)}
+                for index in range(count)]
+
+    def records(self, data):
+        """The raw records of a payload: one object, a list, or legacy line items"""
+        if isinstance(data, list):
+            records = data
+        elif isinstance(data, dict):
+            key = self.line_items_key
+            if key and isinstance(data.get(key), str) and ',' in data[key]:
+                records = self.split_line_items(data)
+            else:
+                records = [data]
+        else:
+            raise PayloadError(f"Expected a {self.table} record or a list of them")
+        for index, record in enumerate(records):
+            if not isinstance(record, dict):
+                raise PayloadError(f"Record {index} is not a JSON object")
+        return records
+
+    def normalize(self, data):
+        """Validated, coerced records ready for the insert helpers"""
+        records = self.records(data)
+        if not records:
+            return []
+        columns = [field.column(records) for field in self.fields]
+        names = self.names
+        return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+DIET_SCHEMA = PayloadSchema('diet', [
+    Field('food', text(255), default=''),
+    Field('food_type', choice(['Meal', 'Snack', 'Drink']), default='Meal'),
+    Field('estimated_calories', digits_integer, default=0),
+    Field('time_of_day', time_of_day, default='00:00:00', strict=True),
+    Field('date', calendar_date, default=today, strict=True)
+], line_items_key='food')
+
+TASKS_SCHEMA = PayloadSchema('tasks', [
+    Field('task_name', text(500), default=''),
+    Field('task_type', text(50), default='Other'),
+    Field('responsible_party', text(255)),
+    Field('status', choice(['Pending', 'In Progress', 'Completed', 'Cancelled']), default='Pending'),
+    Field('best_start_date', calendar_date),
+    Field('best_due_date', calendar_date),
+    Field('time_interval', text(100)),
+    Field('notes', text(), default=''),
+    Field('dependency', text())
+])
+
+CRM_SCHEMA = PayloadSchema('crm_records', [
+    Field('contact_name', text(255), default=''),
+    Field('company', text(255)),
+    Field('email', text(255)),
+    Field('phone', text(50)),
+    Field('notes', text(), default=''),
+    Field('status', choice(['Lead', 'Prospect', 'Customer', 'Lost']), default='Lead')
+])
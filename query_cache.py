@@ -0,0 +1,288 @@
+"""Read-through query cache with per-table invalidation for the Plaud webhook server.
+
+Cached entries are keyed by the query arguments plus a generation number for every
+table the query reads. Writers bump the generation of the tables they touched, so
+stale entries simply stop being addressed and age out through TTL/LRU eviction.
+"""
+import functools
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import fcntl  # Serializes marker-file bumps across gunicorn workers (not on Windows)
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Sentinel so cached falsy values are distinguishable from misses
+_MISS = object()
+
+def _lock_file(f, exclusive):
+    """flock() an open marker file until it is closed"""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+
+class MemoryCacheBackend:
+    """Bounded in-process LRU cache with per-entry TTL
+
+    Generations are also kept as counters in small marker files in generation_dir,
+    so a write handled by one gunicorn worker invalidates the caches of all workers
+    on the same host. A counter (not the file's mtime) is bumped under flock, so two
+    writes within one timestamp tick still give two generations.
+    """
+
+    def __init__(self, max_entries=1000, generation_dir=None):
+        self.max_entries = max_entries
+        self.generation_dir = generation_dir or os.path.join(
+            tempfile.gettempdir(), 'plaud-cache-generations')
+        os.makedirs(self.generation_dir, exist_ok=True)
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._local_generations = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached value or _MISS"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISS
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return _MISS
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        """Store a value, evicting least recently used entries past max_entries"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _generation_path(self, table):
+        return os.path.join(self.generation_dir, f"{table}.gen")
+
+    def _read_marker(self, table):
+        """(counter, modified epoch seconds) from a table's marker file, or None if unset"""
+        try:
+            with open(self._generation_path(table)) as f:
+                _lock_file(f, exclusive=False)
+                text = f.read().strip()
+                modified = os.fstat(f.fileno()).st_mtime
+        except FileNotFoundError:
+            return None
+        return (int(text), modified) if text.isdigit() else None
+
+    def generation(self, table):
+        """Current generation token for a table"""
+        try:
+            marker = self._read_marker(table)
+        except OSError:
+            marker = None
+        return (self._local_generations.get(table, 0), marker[0] if marker else 0)
+
+    def version(self, table):
+        """(token, modified epoch seconds) for table, identical in every worker on this host
+
+        Used for HTTP validators, so it leaves out the per-process counter and uses
+        the marker's counter, which changes on every write even when the file's mtime
+        does not. A missing marker (first start, or a cleared temp dir) is created
+        from the clock, so ETags handed out before can never match again.
+        """
+        marker = self._read_marker(table)
+        if marker is None:
+            self.bump_generation(table)
+            marker = self._read_marker(table)
+            if marker is None:
+                raise OSError(f"No cache generation marker for {table}")
+        counter, modified = marker
+        return str(counter), modified
+
+    def bump_generation(self, table):
+        """Invalidate every entry that read from table"""
+        with self._lock:
+            self._local_generations[table] = self._local_generations.get(table, 0) + 1
+        try:
+            with open(self._generation_path(table), 'a+') as f:
+                _lock_file(f, exclusive=True)
+                f.seek(0)
+                text = f.read().strip()
+                # A new (or pre-counter, empty) marker starts from the clock, so it
+                # never repeats a value handed out before the file was lost
+                counter = int(text) + 1 if text.isdigit() else time.time_ns()
+                f.seek(0)
+                f.truncate()
+                f.write(str(counter))
+        except OSError as e:
+            logger.warning(f"Could not stamp cache generation for {table}: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self):
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Cache stored in a Redis-compatible server shared by all workers"""
+
+    def __init__(self, url, prefix='plaud:'):
+        import redis  # Optional dependency, only needed for CACHE_BACKEND=redis
+        self._client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.evictions = 0  # Redis evicts on its own (maxmemory-policy allkeys-lru)
+
+    def get(self, key):
+        raw = self._client.get(self.prefix + key)
+        if raw is None:
+            return _MISS
+        return pickle.loads(raw)
+
+    def set(self, key, value, ttl):
+        self._client.set(self.prefix + key, pickle.dumps(value), ex=max(1, int(ttl)))
+
+    def generation(self, table):
+        return int(self._client.get(f"{self.prefix}gen:{table}") or 0)
+
+    def bump_generation(self, table):
+        pipeline = self._client.pipeline()
+        pipeline.incr(f"{self.prefix}gen:{table}")
+        pipeline.set(f"{self.prefix}modified:{table}", time.time())
+        pipeline.execute()
+
+    def version(self, table):
+        """(token, modified epoch seconds) for table, shared by every worker"""
+        generation_key = f"{self.prefix}gen:{table}"
+        modified_key = f"{self.prefix}modified:{table}"
+        generation, modified = self._client.mget(generation_key, modified_key)
+        if generation is None or modified is None:
+            # Never bumped, or lost in a Redis restart - start from a time-based
+            # generation so ETags handed out before can never match again
+            self._client.set(generation_key, time.time_ns(), nx=True)
+            self._client.set(modified_key, time.time(), nx=True)
+            generation, modified = self._client.mget(generation_key, modified_key)
+        return generation.decode('ascii'), float(modified)
+
+    def clear(self):
+        for key in self._client.scan_iter(f"{self.prefix}*"):
+            self._client.delete(key)
+
+    def size(self):
+        return sum(1 for _ in self._client.scan_iter(f"{self.prefix}*"))
+
+
+class QueryCache:
+    """Read-through cache for query helpers, invalidated per table"""
+
+    def __init__(self, backend, enabled=True):
+        self.backend = backend
+        self.enabled = enabled
+        self._local = threading.local()
+        self._counters = {'hits': 0, 'misses': 0, 'errors': 0, 'invalidations': 0}
+
+    def cached(self, name, tables, ttl):
+        """Decorator caching a helper's result until ttl expires or a table changes
+
+        Empty results are never cached, because the helpers also return []/{}
+        when the database is unreachable. Neither is a result the helper flagged
+        with mark_degraded(), which covers fallbacks that are not empty (e.g. a
+        dict of empty lists), so a cache hit is always real data.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+
+                try:
+                    # Read generations before querying so a concurrent write can
+                    # never be stored under the post-write key
+                    generations = [self.backend.generation(table) for table in tables]
+                    key = repr((name, generations, args, sorted(kwargs.items())))
+                    value = self.backend.get(key)
+                except Exception as e:
+                    self._counters['errors'] += 1
+                    logger.warning(f"Cache lookup failed for {name}: {e}")
+                    return func(*args, **kwargs)
+
+                if value is not _MISS:
+                    self._counters['hits'] += 1
+                    return value
+
+                self._counters['misses'] += 1
+                # Saved and restored so a cached helper calling another one sees its own flag
+                outer_degraded = getattr(self._local, 'degraded', False)
+                self._local.degraded = False
+                try:
+                    value = func(*args, **kwargs)
+                    degraded = self._local.degraded
+                finally:
+                    self._local.degraded = outer_degraded or self._local.degraded
+                if value and not degraded:
+                    try:
+                        self.backend.set(key, value, ttl)
+                    except Exception as e:
+                        self._counters['errors'] += 1
+                        logger.warning(f"Cache store failed for {name}: {e}")
+                return value
+            return wrapper
+        return decorator
+
+    def mark_degraded(self):
+        """Called by a helper returning a fallback, so the running cached() call won't store it"""
+        self._local.degraded = True
+
+    def invalidate(self, *tables):
+        """Drop cached results that read from any of the given tables"""
+        for table in tables:
+            try:
+                self.backend.bump_generation(table)
+                self._counters['invalidations'] += 1
+            except Exception as e:
+                self._counters['errors'] += 1
+                logger.warning(f"Cache invalidation failed for {table}: {e}")
+
+    def versions(self, tables):
+        """[(token, modified epoch seconds)] per table, or None if the backend failed
+
+        Unlike the cached entries, versions are kept up to date even when the cache
+        itself is disabled, because invalidate() always bumps generations.
+        """
+        try:
+            return [self.backend.version(table) for table in tables]
+        except Exception as e:
+            self._counters['errors'] += 1
+            logger.warning(f"Could not read table versions for {', '.join(tables)}: {e}")
+            return None
+
+    def stats(self):
+        """Snapshot of cache effectiveness"""
+        return {
+            'enabled': self.enabled,
+            'backend': type(self.backend).__name__,
+            'size': self.backend.size(),
+            'evictions': self.backend.evictions,
+            **self._counters
+        }
+
+
+def create_query_cache(backend='memory', max_entries=1000, redis_url=None, enabled=True):
+    """Build a QueryCache, falling back to the in-process backend if Redis is unusable"""
+    if backend == 'redis':
+        try:
+            return QueryCache(RedisCacheBackend(redis_url), enabled=enabled)
+        except Exception as e:
+            logger.warning(f"Redis cache backend unavailable ({e}) - using in-process cache")
+    return QueryCache(MemoryCacheBackend(max_entries=max_entries), enabled=enabled)
@@ -0,0 +1,305 @@
+"""Per-request instrumentation and Prometheus metrics for the Plaud webhook server.
+
+Each request gets a RequestStats on a thread-local. The connection pool, the
+cursors it hands out and the instrumented helpers record into it, so a slow
+request can be split into connection acquire time, MySQL time and helper time.
+Totals are kept as Prometheus counters and histograms and rendered in the text
+exposition format for /metrics.
+
+Metrics are per process: with several gunicorn workers each worker reports its
+own series, so scrape through the workers or sum them in Prometheus.
+"""
+import functools
+import threading
+import time
+
+# Seconds - from a cache hit up to a slow transcript write
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                    2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(label, '') for label in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, _format_labels(self.labels, key), value)
+                    for key, value in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    """Point-in-time value (set on scrape)"""
+
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = tuple(labels.get(label, '') for label in self.labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by labels"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(label, '') for label in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    labels = _format_labels(self.labels, key, [('le', _format_value(bound))])
+                    samples.append((f"{self.name}_bucket", labels, count))
+                labels = _format_labels(self.labels, key, [('le', '+Inf')])
+                samples.append((f"{self.name}_bucket", labels, series[-1]))
+                samples.append((f"{self.name}_sum", _format_labels(self.labels, key), series[-2]))
+                samples.append((f"{self.name}_count", _format_labels(self.labels, key), series[-1]))
+        return samples
+
+
+class RequestStats:
+    """Timings collected while one request is handled"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.acquire_seconds = 0.0
+        self.helpers = {}  # helper name -> seconds
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+class TimedCursor:
+    """Cursor wrapper timing every statement sent to MySQL"""
+
+    def __init__(self, cursor, metrics):
+        self._cursor = cursor
+        self._metrics = metrics
+
+    def execute(self, *args, **kwargs):
+        multi = kwargs.get('multi', args[2] if len(args) > 2 else False)
+        start = time.perf_counter()
+        try:
+            results = self._cursor.execute(*args, **kwargs)
+        except Exception:
+            self._metrics.record_query(time.perf_counter() - start)
+            raise
+        if multi:
+            return self._timed_results(results, time.perf_counter() - start)
+        self._metrics.record_query(time.perf_counter() - start)
+        return results
+
+    def _timed_results(self, results, sent_seconds):
+        """Iterator over a multi=True execute() recording each statement as it is read
+
+        execute() only sends the batch; each statement's result is read while the
+        caller iterates (and fetches its rows), so a statement is timed from when its
+        result is requested until the next one is. The send counts toward the first.
+        """
+        iterator = iter(results)
+        start = time.perf_counter() - sent_seconds
+        pending = False
+        try:
+            while True:
+                requested = time.perf_counter()
+                if pending:
+                    self._metrics.record_query(requested - start)
+                    start = requested
+                pending = True
+                try:
+                    result = next(iterator)
+                except StopIteration:
+                    pending = False
+                    return
+                yield result
+        finally:
+            if pending:
+                self._metrics.record_query(time.perf_counter() - start)
+
+    def executemany(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(*args, **kwargs)
+        finally:
+            self._metrics.record_query(time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class RequestMetrics:
+    """Registry of the server's metrics plus the per-request bookkeeping"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._local = threading.local()
+        self.requests = Counter(
+            'plaud_http_requests_total', 'HTTP requests handled',
+            labels=('endpoint', 'method', 'status'))
+        self.request_duration = Histogram(
+            'plaud_http_request_duration_seconds', 'Time to build the response',
+            labels=('endpoint',))
+        self.request_bytes = Histogram(
+            'plaud_http_request_body_bytes', 'Request body size',
+            labels=('endpoint',), buckets=SIZE_BUCKETS)
+        self.request_queries = Histogram(
+            'plaud_http_request_db_queries', 'MySQL statements per request',
+            labels=('endpoint',), buckets=QUERY_COUNT_BUCKETS)
+        self.request_db_duration = Histogram(
+            'plaud_http_request_db_seconds', 'MySQL time per request',
+            labels=('endpoint',))
+        self.query_duration = Histogram(
+            'plaud_db_query_duration_seconds', 'Duration of single MySQL statements')
+        self.acquire_duration = Histogram(
+            'plaud_db_pool_acquire_seconds', 'Time to check out a pooled connection')
+        self.helper_duration = Histogram(
+            'plaud_helper_duration_seconds', 'Duration of instrumented helpers (cache hits included)',
+            labels=('helper',))
+        self.gauges = {}
+        self._gauges_lock = threading.Lock()
+        self._metrics = [self.requests, self.request_duration, self.request_bytes,
+                         self.request_queries, self.request_db_duration, self.query_duration,
+                         self.acquire_duration, self.helper_duration]
+
+    def gauge(self, name, help_text, labels=()):
+        """Get or create a gauge (e.g. pool or cache stats refreshed on scrape)"""
+        with self._gauges_lock:
+            if name not in self.gauges:
+                self.gauges[name] = Gauge(name, help_text, labels)
+                self._metrics.append(self.gauges[name])
+            return self.gauges[name]
+
+    def start_request(self):
+        self._local.stats = RequestStats() if self.enabled else None
+
+    def current(self):
+        """RequestStats of the request running on this thread, or None"""
+        return getattr(self._local, 'stats', None)
+
+    def finish_request(self, endpoint, method, status, body_bytes=None):
+        """Record the finished request and return its stats"""
+        stats = self.current()
+        self._local.stats = None
+        if stats is None:
+            return None
+        endpoint = endpoint or 'unmatched'
+        self.requests.inc(endpoint=endpoint, method=method, status=status)
+        self.request_duration.observe(stats.elapsed, endpoint=endpoint)
+        self.request_queries.observe(stats.db_queries, endpoint=endpoint)
+        self.request_db_duration.observe(stats.db_seconds, endpoint=endpoint)
+        if body_bytes:
+            self.request_bytes.observe(body_bytes, endpoint=endpoint)
+        return stats
+
+    def record_query(self, seconds):
+        if not self.enabled:
+            return
+        self.query_duration.observe(seconds)
+        stats = self.current()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_seconds += seconds
+
+    def record_acquire(self, seconds):
+        if not self.enabled:
+            return
+        self.acquire_duration.observe(seconds)
+        stats = self.current()
+        if stats is not None:
+            stats.acquire_seconds += seconds
+
+    def wrap_cursor(self, cursor):
+        return TimedCursor(cursor, self) if self.enabled else cursor
+
+    def timed(self, func):
+        """Decorator recording a helper's duration under its function name"""
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                self.helper_duration.observe(seconds, helper=name)
+                stats = self.current()
+                if stats is not None:
+                    stats.helpers[name] = stats.helpers.get(name, 0.0) + seconds
+        return wrapper
+
+    def server_timing(self, stats):
+        """Server-Timing header value for one request (durations in ms)"""
+        entries = [
+            f"app;dur={stats.elapsed * 1000:.2f}",
+            f"db;dur={stats.db_seconds * 1000:.2f};desc=\"{stats.db_queries} queries\"",
+            f"acquire;dur={stats.acquire_seconds * 1000:.2f}"
+        ]
+        entries.extend(f"{name};dur={seconds * 1000:.2f}" for name, seconds in stats.helpers.items())
+        return ', '.join(entries)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,370 @@
+// Filtering, sorting and paging happen on the server: each change fetches
+// a page of JSON from GET /api/tasks and renders only those rows
+const tasksSection = document.getElementById('tasksSection');
+const PAGE_SIZE = Number(tasksSection.dataset.pageSize);
+let nextCursor = tasksSection.dataset.nextCursor || null;
+// Filters and sort behind the rows on screen - "Load more" repeats them with the cursor
+let activeQuery = new URLSearchParams(tasksSection.dataset.query);
+let currentSort = { column: null, direction: 'asc' };
+let loadSequence = 0;
+
+const FILTER_INPUTS = {
+    status: 'statusFilter',
+    task_type: 'typeFilter',
+    responsible_party: 'responsibleFilter',
+    due_from: 'dueFromFilter',
+    due_to: 'dueToFilter'
+};
+
+// Initialize on page load
+document.addEventListener('DOMContentLoaded', function() {
+    const tbody = document.getElementById('tasksBody');
+
+    // One listener for every row, including rows loaded later
+    tbody.addEventListener('change', function(event) {
+        if (event.target.classList.contains('task-checkbox')) {
+            handleCheckboxChange(event);
+        } else if (event.target.classList.contains('priority-input')) {
+            handlePriorityChange(event);
+        }
+    });
+
+    // Add sorting event listeners
+    document.querySelectorAll('th.sortable').forEach(th => {
+        th.addEventListener('click', function() {
+            sortTable(this.dataset.column);
+        });
+    });
+
+    // A query string wins: the server already rendered that page and its
+    // filter inputs. Otherwise refetch only if saved filters or a saved sort apply
+    if (activeQuery.toString()) {
+        loadSortFromQuery(activeQuery);
+    } else if (loadSavedFilters()) {
+        loadTasks(false);
+    }
+});
+
+// Current filter values, keyed by query parameter
+function currentFilters() {
+    const filters = {};
+    for (const [name, inputId] of Object.entries(FILTER_INPUTS)) {
+        filters[name] = document.getElementById(inputId).value;
+    }
+    return filters;
+}
+
+// Sort indicator for a query the server rendered
+function loadSortFromQuery(query) {
+    if (query.get('sort')) {
+        currentSort = { column: query.get('sort'), direction: query.get('order') || 'asc' };
+        showSortIndicator();
+    }
+}
+
+// Query args for the current filter inputs and sort
+function filterQuery() {
+    const query = new URLSearchParams();
+    for (const [name, value] of Object.entries(currentFilters())) {
+        if (value) {
+            query.set(name, value);
+        }
+    }
+    if (currentSort.column) {
+        query.set('sort', currentSort.column);
+        query.set('order', currentSort.direction);
+    }
+    return query;
+}
+
+// Load saved filters from localStorage; returns true if any is set
+function loadSavedFilters() {
+    const savedFilters = localStorage.getItem('taskFilters');
+    if (!savedFilters) {
+        return false;
+    }
+    const filters = JSON.parse(savedFilters);
+    let active = false;
+    for (const [name, inputId] of Object.entries(FILTER_INPUTS)) {
+        document.getElementById(inputId).value = filters[name] || '';
+        active = active || Boolean(filters[name]);
+    }
+    if (filters.sort) {
+        currentSort = filters.sort;
+        showSortIndicator();
+        active = true;
+    }
+    return active;
+}
+
+// Save filters to localStorage
+function saveFilters() {
+    const filters = currentFilters();
+    filters.sort = currentSort.column ? currentSort : null;
+    localStorage.setItem('taskFilters', JSON.stringify(filters));
+}
+
+// Apply filters
+function applyFilters() {
+    saveFilters();
+    loadTasks(false);
+}
+
+// Clear all filters
+function clearFilters() {
+    for (const inputId of Object.values(FILTER_INPUTS)) {
+        document.getElementById(inputId).value = '';
+    }
+    applyFilters();
+}
+
+// Fetch the first page for the current filters, or the next page of the
+// rows on screen if append (a cursor is only valid with its own filters and sort)
+function loadTasks(append) {
+    if (append && !nextCursor) {
+        return;
+    }
+    const query = append ? activeQuery : filterQuery();
+    const params = new URLSearchParams(query);
+    params.set('limit', PAGE_SIZE);
+    if (append) {
+        params.set('cursor', nextCursor);
+    }
+
+    const sequence = ++loadSequence;
+    fetch(`/api/tasks?${params}`)
+    .then(response => response.json())
+    .then(data => {
+        // A newer filter or sort change has already been requested
+        if (sequence !== loadSequence) {
+            return;
+        }
+        if (data.status !== 'success') {
+            console.error('Failed to load tasks:', data.error);
+            return;
+        }
+
+        const tbody = document.getElementById('tasksBody');
+        if (!append) {
+            tbody.replaceChildren();
+            activeQuery = query;
+            // Reloading or sharing the URL shows the same list
+            history.replaceState(null, '', query.toString() ? `?${query}` : location.pathname);
+        }
+        const fragment = document.createDocumentFragment();
+        data.data.forEach(task => fragment.appendChild(renderTaskRow(task)));
+        tbody.appendChild(fragment);
+        nextCursor = data.next_cursor;
+        updateTaskCount();
+    })
+    .catch(error => {
+        console.error('Error loading tasks:', error);
+    });
+}
+
+// Table row for one task, matching the server-rendered markup
+function renderTaskRow(task) {
+    const row = document.createElement('tr');
+    row.className = 'task-row' + (task.status === 'Completed' ? ' completed-row' : '');
+    row.dataset.id = task.id;
+    row.dataset.status = task.status;
+    row.dataset.priority = task.priority || '';
+
+    const checkboxCell = document.createElement('td');
+    checkboxCell.className = 'checkbox-cell';
+    const checkbox = document.createElement('input');
+    checkbox.type = 'checkbox';
+    checkbox.className = 'task-checkbox';
+    checkbox.dataset.taskId = task.id;
+    checkbox.checked = task.status === 'Completed';
+    checkboxCell.appendChild(checkbox);
+
+    const priorityCell = document.createElement('td');
+    const priority = document.createElement('input');
+    priority.type = 'number';
+    priority.className = 'priority-input';
+    priority.value = task.priority || '';
+    priority.min = 1;
+    priority.max = 99;
+    priority.dataset.taskId = task.id;
+    priority.placeholder = 'Set';
+    priorityCell.appendChild(priority);
+
+    const nameCell = document.createElement('td');
+    const name = document.createElement('strong');
+    name.textContent = task.task_name;
+    nameCell.appendChild(name);
+
+    const statusCell = document.createElement('td');
+    const badge = document.createElement('span');
+    badge.className = `badge badge-${task.status.toLowerCase().replace(' ', '-')}`;
+    badge.textContent = task.status;
+    statusCell.appendChild(badge);
+
+    row.append(
+        checkboxCell,
+        priorityCell,
+        nameCell,
+        textCell(task.task_type),
+        statusCell,
+        textCell(task.responsible_party || '-'),
+        textCell(formatDate(task.best_due_date)),
+        textCell(task.notes || '-')
+    );
+    return row;
+}
+
+function textCell(text) {
+    const cell = document.createElement('td');
+    cell.textContent = text;
+    return cell;
+}
+
+// 'YYYY-MM-DD' from an ISO or HTTP date string
+function formatDate(value) {
+    if (!value) {
+        return '-';
+    }
+    if (/^\d{4}-\d{2}-\d{2}/.test(value)) {
+        return value.slice(0, 10);
+    }
+    const parsed = new Date(value);
+    return isNaN(parsed) ? value : parsed.toISOString().slice(0, 10);
+}
+
+function updateTaskCount() {
+    const count = document.querySelectorAll('#tasksBody .task-row').length;
+    document.getElementById('taskCount').textContent = count;
+    document.getElementById('tasksTable').hidden = count === 0;
+    document.getElementById('taskCountLine').hidden = count === 0;
+    document.getElementById('emptyState').hidden = count > 0;
+    document.getElementById('loadMore').hidden = !nextCursor;
+}
+
+// Handle priority change
+function handlePriorityChange(event) {
+    const input = event.target;
+    const taskId = input.dataset.taskId;
+    const newPriority = parseInt(input.value) || null;
+    const row = input.closest('tr');
+
+    // Validate priority
+    if (newPriority !== null && (newPriority < 1 || newPriority > 99)) {
+        alert('Priority must be between 1 and 99');
+        input.value = row.dataset.priority || '';
+        return;
+    }
+
+    // Update row data attribute
+    row.dataset.priority = newPriority || '';
+
+    // Send update to server
+    updateTaskPriority(taskId, newPriority);
+}
+
+// Update task priority on server
+function updateTaskPriority(taskId, priority) {
+    queueTaskUpdate(taskId, { priority: priority });
+}
+
+// Edits are batched: changes made within SAVE_DELAY_MS of each other are
+// merged per task and sent as one PATCH /api/tasks request
+const SAVE_DELAY_MS = 400;
+let pendingUpdates = {};
+let saveTimer = null;
+
+function queueTaskUpdate(taskId, changes) {
+    pendingUpdates[taskId] = Object.assign(pendingUpdates[taskId] || {}, changes);
+    clearTimeout(saveTimer);
+    saveTimer = setTimeout(flushTaskUpdates, SAVE_DELAY_MS);
+}
+
+function flushTaskUpdates(keepalive) {
+    clearTimeout(saveTimer);
+    saveTimer = null;
+    const updates = Object.entries(pendingUpdates).map(
+        ([id, changes]) => Object.assign({ id: Number(id) }, changes)
+    );
+    pendingUpdates = {};
+    if (updates.length === 0) {
+        return;
+    }
+
+    fetch('/api/tasks', {
+        method: 'PATCH',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ updates: updates }),
+        keepalive: keepalive === true
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.status === 'success') {
+            console.log(`Saved ${data.updated} task edits`);
+        } else {
+            console.error('Failed to save task edits:', data.error);
+        }
+    })
+    .catch(error => {
+        console.error('Error saving task edits:', error);
+    });
+}
+
+// Send anything still queued when the page is hidden or closed
+document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') {
+        flushTaskUpdates(true);
+    }
+});
+window.addEventListener('pagehide', () => flushTaskUpdates(true));
+
+// Handle checkbox change (mark task complete/incomplete)
+function handleCheckboxChange(event) {
+    const checkbox = event.target;
+    const taskId = checkbox.dataset.taskId;
+    const isCompleted = checkbox.checked;
+    const row = checkbox.closest('tr');
+
+    // Update UI immediately
+    if (isCompleted) {
+        row.classList.add('completed-row');
+        row.dataset.status = 'Completed';
+        row.querySelector('.badge').className = 'badge badge-completed';
+        row.querySelector('.badge').textContent = 'Completed';
+    } else {
+        row.classList.remove('completed-row');
+        row.dataset.status = 'Pending';
+        row.querySelector('.badge').className = 'badge badge-pending';
+        row.querySelector('.badge').textContent = 'Pending';
+    }
+
+    // Send update to server
+    updateTaskStatus(taskId, isCompleted ? 'Completed' : 'Pending');
+}
+
+// Update task status on server
+function updateTaskStatus(taskId, status) {
+    queueTaskUpdate(taskId, { status: status });
+}
+
+// Sort by a column on the server - click again to reverse the order
+function sortTable(column) {
+    if (currentSort.column === column) {
+        currentSort.direction = currentSort.direction === 'asc' ? 'desc' : 'asc';
+    } else {
+        currentSort = { column: column, direction: 'asc' };
+    }
+    showSortIndicator();
+    applyFilters();
+}
+
+function showSortIndicator() {
+    document.querySelectorAll('th.sortable').forEach(th => {
+        th.classList.remove('sort-asc', 'sort-desc');
+    });
+    const currentTh = document.querySelector(`th[data-column="${currentSort.column}"]`);
+    if (currentTh) {
+        currentTh.classList.add(currentSort.direction === 'asc' ? 'sort-asc' : 'sort-desc');
+    }
+}
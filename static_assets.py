@@ -0,0 +1,106 @@
+"""Fingerprinted, precompressed static assets for the dashboard pages.
+
+Every file under static/ is read once at startup. Its URL carries a hash of its
+content (/static/css/base.3f2a9c1e7b.css), so browsers may cache it for a year: an
+edited file gets a new URL. Text assets are gzip-compressed - and brotli-compressed
+if the optional brotli package is installed - up front, and each request is served
+from memory in the best encoding the client accepts.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+
+try:
+    import brotli  # Optional - adds Content-Encoding: br for static assets
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = {'text/css', 'text/javascript', 'application/javascript', 'application/json',
+                      'image/svg+xml', 'text/plain'}
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+class StaticAsset:
+    """One file: its fingerprinted path and the body in each encoding"""
+
+    def __init__(self, path, body):
+        self.path = path
+        self.digest = hashlib.sha256(body).hexdigest()
+        stem, extension = os.path.splitext(path)
+        self.fingerprinted_path = f"{stem}.{self.digest[:10]}{extension}"
+        self.mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.variants = {'identity': body}  # Content-Encoding -> body
+
+    def compress(self, min_size):
+        if self.mimetype not in COMPRESSIBLE_TYPES or len(self.variants['identity']) < min_size:
+            return
+        body = self.variants['identity']
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(body, quality=11)
+        self.variants['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+
+    def negotiate(self, accept_encodings):
+        """(encoding, body) for a werkzeug Accept-Encoding header, preferring br"""
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and accept_encodings[encoding] > 0:
+                return encoding, self.variants[encoding]
+        return 'identity', self.variants['identity']
+
+    def etag(self, encoding):
+        """Strong ETag per encoding - the bodies differ byte for byte"""
+        tag = self.digest[:32]
+        return tag if encoding == 'identity' else f"{tag}-{encoding}"
+
+
+class AssetManifest:
+    """All assets under a directory, addressable by logical or fingerprinted path"""
+
+    def __init__(self, root, url_prefix='/static', min_compress_size=256):
+        self.root = root
+        self.url_prefix = url_prefix
+        self.min_compress_size = min_compress_size
+        self.assets = {}  # 'css/base.css' -> StaticAsset
+        self._by_fingerprint = {}  # 'css/base.3f2a9c1e7b.css' -> StaticAsset
+        self.load()
+
+    def load(self):
+        assets = {}
+        for directory, _, filenames in os.walk(self.root):
+            for filename in sorted(filenames):
+                full_path = os.path.join(directory, filename)
+                path = os.path.relpath(full_path, self.root).replace(os.sep, '/')
+                with open(full_path, 'rb') as f:
+                    asset = StaticAsset(path, f.read())
+                asset.compress(self.min_compress_size)
+                assets[path] = asset
+        self.assets = assets
+        self._by_fingerprint = {asset.fingerprinted_path: asset for asset in assets.values()}
+
+    def url(self, path):
+        """Fingerprinted URL for a template (raises KeyError for a missing asset)"""
+        return f"{self.url_prefix}/{self.assets[path].fingerprinted_path}"
+
+    def lookup(self, path):
+        """(asset, immutable) for a requested path, or (None, False)
+
+        Logical paths still resolve, but only fingerprinted ones may be cached forever.
+        """
+        asset = self._by_fingerprint.get(path)
+        if asset is not None:
+            return asset, True
+        return self.assets.get(path), False
+
+    def fingerprint(self):
+        """Hash over every asset - changes whenever any asset URL changes"""
+        digest = hashlib.sha256()
+        for path in sorted(self.assets):
+            digest.update(self.assets[path].fingerprinted_path.encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def stats(self):
+        identity = sum(len(asset.variants['identity']) for asset in self.assets.values())
+        gzipped = sum(len(asset.variants.get('gzip', asset.variants['identity']))
+                      for asset in self.assets.values())
+        return {'assets': len(self.assets), 'bytes': identity, 'gzip_bytes': gzipped,
+                'brotli': brotli is not None}
@@ -0,0 +1,25 @@
+"""parse_task_id / parse_task_updates (no database needed)"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import parse_task_id, parse_task_updates  # noqa: E402
+
+
+@pytest.mark.parametrize('value, expected', [(7, 7), ('7', 7), ('0012', 12)])
+def test_parse_task_id_accepts_positive_ids(value, expected):
+    assert parse_task_id(value) == expected
+
+
+@pytest.mark.parametrize('value', [0, '0', '00', -3, '-3', '', '1.5', 1.0, True, None, '²'])
+def test_parse_task_id_rejects_non_positive_and_malformed_ids(value):
+    with pytest.raises(ValueError):
+        parse_task_id(value)
+
+
+def test_parse_task_updates_rejects_task_zero_given_as_string():
+    with pytest.raises(ValueError):
+        parse_task_updates({'updates': [{'id': '0', 'status': 'Completed'}]})
@@ -0,0 +1,157 @@
+"""Local full-text index over Plaud transcripts.
+
+Transcripts are indexed into a SQLite FTS5 table as they are written to MySQL, so
+searching years of recordings never scans plaud_transcripts. FTS5 provides BM25
+ranking and snippet extraction; the index file is shared by every worker on the
+host and can be rebuilt from MySQL at any time.
+"""
+import html
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Private-use markers survive html.escape and are then swapped for <mark> tags
+_HIT_START = '\ue000'
+_HIT_END = '\ue001'
+
+
+class TranscriptSearchIndex:
+    """SQLite FTS5 index of transcript title, summary and body
+
+    FTS5 can only look rows up quickly by rowid or MATCH - a filter on an UNINDEXED
+    column scans the whole table - so transcript_rowids maps each transcript id to
+    its FTS rowid for re-indexing.
+    """
+
+    def __init__(self, path, snippet_tokens=24):
+        self.path = path
+        self.snippet_tokens = snippet_tokens
+        self._local = threading.local()
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts USING fts5(
+                transcript_id UNINDEXED,
+                create_time UNINDEXED,
+                title,
+                summary,
+                body,
+                tokenize = 'porter unicode61 remove_diacritics 2'
+            )
+        """)
+        mapped = db.execute("""
+            SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transcript_rowids'
+        """).fetchone()
+        if not mapped:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("""
+                    CREATE TABLE IF NOT EXISTS transcript_rowids (
+                        transcript_id TEXT PRIMARY KEY,
+                        fts_rowid INTEGER NOT NULL
+                    ) WITHOUT ROWID
+                """)
+                # Indexes built before the mapping existed: one scan, once
+                db.execute("""
+                    INSERT OR IGNORE INTO transcript_rowids (transcript_id, fts_rowid)
+                    SELECT transcript_id, MAX(rowid) FROM transcripts_fts GROUP BY transcript_id
+                """)
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
+    def _db(self):
+        # sqlite3 connections are per thread (and must not cross a gunicorn fork)
+        if getattr(self._local, 'pid', None) != os.getpid():
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return self._local.db
+
+    def upsert(self, transcript_id, title, summary, body, create_time=None):
+        """Index (or re-index) one transcript"""
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            previous = db.execute("""
+                SELECT fts_rowid FROM transcript_rowids WHERE transcript_id = ?
+            """, (transcript_id,)).fetchone()
+            if previous:
+                db.execute("DELETE FROM transcripts_fts WHERE rowid = ?", (previous[0],))
+            cursor = db.execute("""
+                INSERT INTO transcripts_fts (transcript_id, create_time, title, summary, body)
+                VALUES (?, ?, ?, ?, ?)
+            """, (transcript_id, str(create_time or ''), title or '', summary or '', body or ''))
+            db.execute("""
+                INSERT OR REPLACE INTO transcript_rowids (transcript_id, fts_rowid) VALUES (?, ?)
+            """, (transcript_id, cursor.lastrowid))
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def clear(self):
+        """Drop every indexed transcript (before a rebuild)"""
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("DELETE FROM transcripts_fts")
+            db.execute("DELETE FROM transcript_rowids")
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def match_query(text):
+        """Quote every word of free text as a prefix term: 'meet bud' -> '"meet"* "bud"*'"""
+        words = re.findall(r'\w+', text or '')
+        if not words:
+            return None
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def search(self, text, limit=20, offset=0):
+        """Ranked hits with highlighted, HTML-escaped snippets
+
+        Returns (total_hits, hits). Title matches weigh most, then summary, then body.
+        """
+        query = self.match_query(text)
+        if not query:
+            return 0, []
+
+        db = self._db()
+        total = db.execute("""
+            SELECT COUNT(*) FROM transcripts_fts WHERE transcripts_fts MATCH ?
+        """, (query,)).fetchone()[0]
+        rows = db.execute("""
+            SELECT transcript_id, create_time, title,
+                   bm25(transcripts_fts, 0, 0, 5.0, 2.0, 1.0) AS score,
+                   snippet(transcripts_fts, -1, ?, ?, '…', ?) AS snippet
+            FROM transcripts_fts
+            WHERE transcripts_fts MATCH ?
+            ORDER BY score
+            LIMIT ? OFFSET ?
+        """, (_HIT_START, _HIT_END, self.snippet_tokens, query, limit, offset)).fetchall()
+
+        hits = []
+        for row in rows:
+            snippet = html.escape(row['snippet'] or '')
+            snippet = snippet.replace(_HIT_START, '<mark>').replace(_HIT_END, '</mark>')
+            hits.append({
+                'transcript_id': row['transcript_id'],
+                'title': row['title'],
+                'create_time': row['create_time'] or None,
+                # bm25() is lower-is-better; flip it so clients can sort descending
+                'score': round(-row['score'], 4),
+                'snippet': snippet
+            })
+        return total, hits
+
+    def count(self):
+        return self._db().execute("SELECT COUNT(*) FROM transcripts_fts").fetchone()[0]
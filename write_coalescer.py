@@ -0,0 +1,103 @@
+"""Micro-batching for webhook writes.
+
+Zapier's loop steps send one record per HTTP call. When several calls for the same
+table arrive close together, the first caller becomes the batch leader, waits up
+to the batch window (or until max_rows are buffered) and then flushes every
+buffered record through one insert call - one multi-row INSERT and one commit.
+Each caller gets its own outcome back.
+"""
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class _Batch:
+    """Records buffered for one flush"""
+
+    def __init__(self):
+        self.entries = []  # [records, result] per caller
+        self.rows = 0
+        self.full = threading.Event()
+        self.done = threading.Event()
+
+
+class WriteCoalescer:
+    """Coalesce concurrent insert calls for one table into a single flush"""
+
+    def __init__(self, name, flush_func, window=0.05, max_rows=100):
+        self.name = name
+        self.flush_func = flush_func
+        self.window = window
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._batch = None
+        self._counters = {'calls': 0, 'flushes': 0, 'rows': 0, 'split_flushes': 0}
+
+    def submit(self, records):
+        """Insert records, possibly together with other callers' records
+
+        Returns flush_func's result for the flush that carried them.
+        """
+        if self.window <= 0:
+            return self.flush_func(records)
+
+        with self._lock:
+            self._counters['calls'] += 1
+            leader = self._batch is None
+            if leader:
+                self._batch = _Batch()
+            batch = self._batch
+            entry = [records, False]
+            batch.entries.append(entry)
+            batch.rows += len(records)
+            if batch.rows >= self.max_rows:
+                self._batch = None
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._batch is batch:
+                    self._batch = None
+            self._flush(batch)
+        else:
+            batch.done.wait()
+        return entry[1]
+
+    def _flush(self, batch):
+        """Write a batch; if it fails, retry each caller separately so one bad
+        record only fails its own request"""
+        try:
+            rows = [record for records, _ in batch.entries for record in records]
+            success = self._call(rows)
+            self._counters['flushes'] += 1
+            self._counters['rows'] += len(rows)
+
+            if success or len(batch.entries) == 1:
+                for entry in batch.entries:
+                    entry[1] = success
+                return
+
+            logger.warning(f"Batched {self.name} write of {len(rows)} rows failed - "
+                           f"retrying {len(batch.entries)} callers individually")
+            self._counters['split_flushes'] += 1
+            for entry in batch.entries:
+                entry[1] = self._call(entry[0])
+        finally:
+            batch.done.set()
+
+    def _call(self, rows):
+        try:
+            return self.flush_func(rows)
+        except Exception as e:
+            logger.error(f"Error flushing {self.name} batch: {e}")
+            return False
+
+    def stats(self):
+        """Batching effectiveness (rows per flush)"""
+        return {
+            'window_ms': int(self.window * 1000),
+            'max_rows': self.max_rows,
+            **self._counters
+        }